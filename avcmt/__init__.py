@@ -17,18 +17,44 @@ This file defines the public API of the 'avcmt' package, making key components
 directly importable for users of the library.
 """
 
-# Expose the primary function for the commit process from its new location.
-# This allows users to do `from avcmt import run_commit_group_all`.
-from .modules.commit_generator import run_commit_group_all
+from importlib import import_module
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .modules.commit_batch import BatchReport, RepoResult, run_commit_batch
+    from .modules.commit_generator import run_commit_group_all
+    from .modules.release_manager import ReleaseFailedError, ReleaseManager
+
+# The public API is imported lazily, on first access, so that entry points such as the
+# prepare-commit-msg hook only pay for the modules they actually use.
+# This still allows `from avcmt import run_commit_batch`, `from avcmt import run_commit_group_all`
+# and `from avcmt import ReleaseManager`.
+_LAZY_EXPORTS = {
+    "BatchReport": ".modules.commit_batch",
+    "RepoResult": ".modules.commit_batch",
+    "run_commit_batch": ".modules.commit_batch",
+    "run_commit_group_all": ".modules.commit_generator",
+    "ReleaseFailedError": ".modules.release_manager",
+    "ReleaseManager": ".modules.release_manager",
+}
+
+
+def __getattr__(name: str):
+    """Imports a public name from its module on first access."""
+    if name not in _LAZY_EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(_LAZY_EXPORTS[name], __name__), name)
+    globals()[name] = value
+    return value
 
-# Expose classes and errors from the release module from its new location.
-# This allows `from avcmt import ReleaseManager`.
-from .modules.release_manager import ReleaseFailedError, ReleaseManager
 
 # Defines what will be imported when a user runs `from avcmt import *`.
 # It's a good practice to explicitly list the public API.
 __all__ = [
+    "BatchReport",
     "ReleaseFailedError",
     "ReleaseManager",
+    "RepoResult",
+    "run_commit_batch",
     "run_commit_group_all",
 ]
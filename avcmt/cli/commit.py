@@ -23,11 +23,36 @@
 # Description: CLI sub-command group for all `commit` related actions.
 # test1
 
+import json
 from typing import Annotated
 
 import typer
 
-from avcmt.modules.commit_generator import run_commit_group_all
+from avcmt.modules.commit_batch import (
+    DEFAULT_REPO_JOBS,
+    resolve_repositories,
+    run_commit_batch,
+)
+from avcmt.modules.commit_cache import CommitMessageCache
+from avcmt.modules.commit_generator import (
+    DEFAULT_MAX_PROMPT_BYTES,
+    CommitError,
+    run_commit_group_all,
+)
+from avcmt.modules.commit_plan import plan_commit_run
+from avcmt.modules.commit_watcher import (
+    DEFAULT_DEBOUNCE,
+    DEFAULT_POLL_INTERVAL,
+    run_commit_watch,
+)
+from avcmt.modules.diff_shaper import DEFAULT_MAX_FILE_BYTES
+from avcmt.modules.git_status import DEFAULT_FETCH_TTL
+from avcmt.modules.git_stream import DEFAULT_MAX_DIFF_BYTES
+from avcmt.modules.grouping import (
+    DEFAULT_GROUPING,
+    DEFAULT_MAX_GROUP_LINES,
+    DEFAULT_MIN_GROUP_LINES,
+)
 from avcmt.utils import (
     clear_dry_run_file,
     get_log_file,
@@ -49,6 +74,14 @@ app = typer.Typer(
 
 @app.command("run")
 def run_commit(
+    pathspecs: Annotated[
+        list[str] | None,
+        typer.Argument(
+            metavar="[PATHSPEC]...",
+            help="Limit the run to these paths (git pathspecs); git does not scan or diff anything outside them.",
+            show_default=False,
+        ),
+    ] = None,
     dry_run: Annotated[
         bool,
         typer.Option(
@@ -74,7 +107,128 @@ def run_commit(
         bool,
         typer.Option(
             "--force-rebuild",
-            help="Ignore recent dry-run cache and force new AI suggestions.",
+            help="Ignore cached commit messages and force new AI suggestions.",
+        ),
+    ] = False,
+    jobs: Annotated[
+        int,
+        typer.Option(
+            "--jobs",
+            "-j",
+            min=1,
+            help="Number of commit messages to request from the AI concurrently.",
+        ),
+    ] = 1,
+    private_index: Annotated[
+        bool,
+        typer.Option(
+            "--private-index",
+            help="Stage and commit through a temporary index; your index is left alone during the run. Commit hooks are skipped.",
+        ),
+    ] = False,
+    max_file_diff_bytes: Annotated[
+        int,
+        typer.Option(
+            "--max-file-diff-bytes",
+            min=0,
+            help="Per-file diff budget in prompts; larger diffs are sampled from head and tail (0 = unlimited).",
+        ),
+    ] = DEFAULT_MAX_FILE_BYTES,
+    max_prompt_bytes: Annotated[
+        int,
+        typer.Option(
+            "--max-prompt-bytes",
+            min=0,
+            help="Prompt size above which a group is summarized in chunks and the summaries merged (0 = never split).",
+        ),
+    ] = DEFAULT_MAX_PROMPT_BYTES,
+    grouping: Annotated[
+        str,
+        typer.Option(
+            "--grouping",
+            help="Grouping strategy: 'directory' (one group per directory) or 'balanced' (merge small sibling groups, split large ones).",
+        ),
+    ] = DEFAULT_GROUPING,
+    min_group_lines: Annotated[
+        int,
+        typer.Option(
+            "--min-group-lines",
+            min=0,
+            help="With --grouping balanced, groups with fewer changed lines are merged into their parent directory.",
+        ),
+    ] = DEFAULT_MIN_GROUP_LINES,
+    max_group_lines: Annotated[
+        int,
+        typer.Option(
+            "--max-group-lines",
+            min=0,
+            help="With --grouping balanced, groups with more changed lines are split into parts (0 = never split).",
+        ),
+    ] = DEFAULT_MAX_GROUP_LINES,
+    offline: Annotated[
+        bool,
+        typer.Option(
+            "--offline",
+            help="Never fetch from the remote; ahead/behind status uses the last fetched refs.",
+        ),
+    ] = False,
+    fetch_ttl: Annotated[
+        int,
+        typer.Option(
+            "--fetch-ttl",
+            min=0,
+            help="Seconds a previous fetch stays fresh before the remote is fetched again (0 = always fetch).",
+        ),
+    ] = DEFAULT_FETCH_TTL,
+    max_diff_bytes: Annotated[
+        int,
+        typer.Option(
+            "--max-diff-bytes",
+            min=0,
+            help="Stop reading the working-tree diff after this many bytes; remaining files are summarized from line counts (0 = unlimited).",
+        ),
+    ] = DEFAULT_MAX_DIFF_BYTES,
+    resume: Annotated[
+        bool,
+        typer.Option(
+            "--resume",
+            help="Continue an interrupted run from its journal, skipping groups that were already committed.",
+        ),
+    ] = False,
+    timings_out: Annotated[
+        str | None,
+        typer.Option(
+            "--timings-out",
+            help="Also write the per-phase timing report of the run to this JSON file.",
+        ),
+    ] = None,
+    repos: Annotated[
+        str | None,
+        typer.Option(
+            "--repos",
+            help="Run in many repositories at once: a file listing one repository per line, or a glob pattern.",
+        ),
+    ] = None,
+    repo_jobs: Annotated[
+        int,
+        typer.Option(
+            "--repo-jobs",
+            min=1,
+            help="Number of repositories processed concurrently with --repos.",
+        ),
+    ] = DEFAULT_REPO_JOBS,
+    heuristic_for_trivial: Annotated[
+        bool,
+        typer.Option(
+            "--heuristic-for-trivial",
+            help="Write rule-based messages for trivial groups (renames, deletions, whitespace, version bumps) without calling the AI.",
+        ),
+    ] = False,
+    heuristic_fallback: Annotated[
+        bool,
+        typer.Option(
+            "--heuristic-fallback",
+            help="Use a rule-based message when the AI request of a group fails instead of skipping the group.",
         ),
     ] = False,
 ) -> None:
@@ -82,13 +236,33 @@ def run_commit(
     Initializes logging, logs the provided options, and executes the commit process with the specified parameters.
 
     Args:
+        pathspecs (list[str] | None): Git pathspecs limiting scanning, diffing, grouping and staging to parts of the tree. Defaults to None (the whole tree).
         dry_run (bool): If True, previews commit messages without applying to git. Defaults to False.
         push (bool): If True, pushes commits to the remote repository after completion. Defaults to False.
         debug (bool): If True, enables debug mode to show prompts and raw AI responses. Defaults to False.
-        force_rebuild (bool): If True, ignores recent dry-run cache and forces new AI suggestions. Defaults to False.
+        force_rebuild (bool): If True, ignores cached commit messages and forces new AI suggestions. Defaults to False.
+        jobs (int): Number of commit messages requested concurrently; commits are still applied in group order. Defaults to 1.
+        private_index (bool): If True, uses a temporary index file and plumbing commands instead of the real index. Defaults to False.
+        max_file_diff_bytes (int): Per-file byte budget of the diff sent to the AI; 0 disables the cap. Defaults to 8192.
+        max_prompt_bytes (int): Prompt size above which a group's diff is summarized with map-reduce; 0 disables it. Defaults to 60000.
+        grouping (str): Name of the grouping strategy, "directory" or "balanced". Defaults to "directory".
+        min_group_lines (int): Changed-line count below which balanced grouping merges a group into its parent. Defaults to 20.
+        max_group_lines (int): Changed-line count above which balanced grouping splits a group; 0 disables splitting. Defaults to 2000.
+        offline (bool): If True, never fetches from the remote. Defaults to False.
+        fetch_ttl (int): Maximum age in seconds of the last fetch before the remote is fetched again. Defaults to 300.
+        max_diff_bytes (int): Read budget for the working-tree diff in bytes; 0 disables it. Defaults to 64 MiB.
+        resume (bool): If True, resumes the interrupted run recorded in "log/commit_journal.jsonl". Defaults to False.
+        timings_out (str | None): Path of a JSON file for the per-phase timing report; ignored with --repos. Defaults to None.
+        repos (str | None): A repository list file or glob pattern; if set, every matching repository is processed in this process. Defaults to None.
+        repo_jobs (int): Number of repositories processed concurrently with `repos`. Defaults to 4.
+        heuristic_for_trivial (bool): If True, trivial groups get a rule-based message without an AI call. Defaults to False.
+        heuristic_fallback (bool): If True, groups whose AI request fails get a rule-based message instead of being skipped. Defaults to False.
 
     Returns:
         None
+
+    Raises:
+        typer.Exit: Exits with code 1 if no repository matches `repos` or any repository of the batch failed.
     """
     log_file = get_log_file()
     logger = setup_logging(log_file)
@@ -96,19 +270,281 @@ def run_commit(
     logger.info("Invoking 'commit run' command with options:")
     logger.info(f"  dry_run: {dry_run}, push: {push}")
     logger.info(f"  debug: {debug}, force_rebuild: {force_rebuild}")
+    logger.info(f"  jobs: {jobs}, private_index: {private_index}")
+    logger.info(
+        f"  max_file_diff_bytes: {max_file_diff_bytes}, max_prompt_bytes: {max_prompt_bytes}"
+    )
+    logger.info(
+        f"  grouping: {grouping}, min_group_lines: {min_group_lines}, max_group_lines: {max_group_lines}"
+    )
+    logger.info(f"  offline: {offline}, fetch_ttl: {fetch_ttl}")
+    logger.info(f"  max_diff_bytes: {max_diff_bytes}, resume: {resume}")
+    logger.info(f"  repos: {repos}, repo_jobs: {repo_jobs}")
+    logger.info(
+        f"  heuristic_for_trivial: {heuristic_for_trivial}, heuristic_fallback: {heuristic_fallback}"
+    )
+    logger.info(f"  pathspecs: {pathspecs or 'whole tree'}")
 
-    run_commit_group_all(
+    options = dict(
+        pathspecs=pathspecs,
         dry_run=dry_run,
         push=push,
         debug=debug,
         force_rebuild=force_rebuild,
         logger=logger,
+        jobs=jobs,
+        private_index=private_index,
+        max_file_diff_bytes=max_file_diff_bytes,
+        max_prompt_bytes=max_prompt_bytes,
+        grouping=grouping,
+        min_group_lines=min_group_lines,
+        max_group_lines=max_group_lines,
+        offline=offline,
+        fetch_ttl=fetch_ttl,
+        max_diff_bytes=max_diff_bytes,
+        resume=resume,
+        heuristic_for_trivial=heuristic_for_trivial,
+        heuristic_fallback=heuristic_fallback,
+    )
+    if repos:
+        try:
+            repositories = resolve_repositories(repos)
+        except CommitError as e:
+            typer.secho(f"❌ {e}", fg=typer.colors.RED, err=True)
+            raise typer.Exit(code=1) from e
+        report = run_commit_batch(repositories, repo_jobs=repo_jobs, **options)
+        if report.failures:
+            raise typer.Exit(code=1)
+        return
+    run_commit_group_all(timings_out=timings_out, **options)
+
+
+@app.command("plan")
+def plan_commit(
+    pathspecs: Annotated[
+        list[str] | None,
+        typer.Argument(
+            metavar="[PATHSPEC]...",
+            help="Plan only changes under these paths, like 'commit run'.",
+            show_default=False,
+        ),
+    ] = None,
+    jobs: Annotated[
+        int,
+        typer.Option(
+            "--jobs",
+            "-j",
+            min=1,
+            help="Number of concurrent AI requests to estimate the wall time for.",
+        ),
+    ] = 1,
+    max_file_diff_bytes: Annotated[
+        int,
+        typer.Option("--max-file-diff-bytes", min=0),
+    ] = DEFAULT_MAX_FILE_BYTES,
+    max_prompt_bytes: Annotated[
+        int,
+        typer.Option("--max-prompt-bytes", min=0),
+    ] = DEFAULT_MAX_PROMPT_BYTES,
+    max_diff_bytes: Annotated[
+        int,
+        typer.Option("--max-diff-bytes", min=0),
+    ] = DEFAULT_MAX_DIFF_BYTES,
+    grouping: Annotated[
+        str,
+        typer.Option("--grouping", help="Grouping strategy to plan with."),
+    ] = DEFAULT_GROUPING,
+    min_group_lines: Annotated[
+        int,
+        typer.Option("--min-group-lines", min=0),
+    ] = DEFAULT_MIN_GROUP_LINES,
+    max_group_lines: Annotated[
+        int,
+        typer.Option("--max-group-lines", min=0),
+    ] = DEFAULT_MAX_GROUP_LINES,
+    heuristic_for_trivial: Annotated[
+        bool,
+        typer.Option(
+            "--heuristic-for-trivial",
+            help="Plan rule-based messages for trivial groups, without AI calls.",
+        ),
+    ] = False,
+    as_json: Annotated[
+        bool,
+        typer.Option("--json", help="Print the plan as JSON."),
+    ] = False,
+) -> None:
+    """Shows what `avcmt commit run` with the same options would do and what it would cost: the groups with their files and numstat, the estimated prompt tokens, which groups are already cached, the predicted number of AI calls and the estimated wall time from the latency of past requests. The index and the network are not touched.
+
+    Args:
+        pathspecs (list[str] | None): Git pathspecs limiting the plan to parts of the tree. Defaults to None (the whole tree).
+        jobs (int): Number of concurrent AI requests assumed for the wall-time estimate. Defaults to 1.
+        max_file_diff_bytes (int): Per-file byte budget of the diff sent to the AI. Defaults to 8192.
+        max_prompt_bytes (int): Prompt size above which a group's diff is summarized with map-reduce. Defaults to 60000.
+        max_diff_bytes (int): Read budget for the working-tree diff in bytes. Defaults to 64 MiB.
+        grouping (str): Name of the grouping strategy. Defaults to "directory".
+        min_group_lines (int): Changed-line count below which balanced grouping merges a group. Defaults to 20.
+        max_group_lines (int): Changed-line count above which balanced grouping splits a group. Defaults to 2000.
+        heuristic_for_trivial (bool): If True, trivial groups are planned with a rule-based message and no AI call. Defaults to False.
+        as_json (bool): If True, prints the plan as JSON instead of text. Defaults to False.
+
+    Returns:
+        None
+
+    Raises:
+        typer.Exit: Exits with code 1 if the plan could not be computed.
+    """
+    try:
+        plan = plan_commit_run(
+            pathspecs=pathspecs,
+            jobs=jobs,
+            max_file_diff_bytes=max_file_diff_bytes,
+            max_prompt_bytes=max_prompt_bytes,
+            max_diff_bytes=max_diff_bytes,
+            grouping=grouping,
+            min_group_lines=min_group_lines,
+            max_group_lines=max_group_lines,
+            heuristic_for_trivial=heuristic_for_trivial,
+        )
+    except CommitError as e:
+        typer.secho(f"❌ {e}", fg=typer.colors.RED, err=True)
+        raise typer.Exit(code=1) from e
+    if as_json:
+        typer.echo(json.dumps(plan.to_dict(), indent=2))
+    elif not plan.groups:
+        typer.secho("[i] No changed files. Nothing to plan.", fg=typer.colors.YELLOW)
+    else:
+        typer.echo(plan.format())
+
+
+@app.command("watch")
+def watch_commit(
+    pathspecs: Annotated[
+        list[str] | None,
+        typer.Argument(
+            metavar="[PATHSPEC]...",
+            help="Pre-generate messages only for changes under these paths; use the same pathspecs as for 'commit run'.",
+            show_default=False,
+        ),
+    ] = None,
+    interval: Annotated[
+        float,
+        typer.Option(
+            "--interval",
+            min=0.1,
+            help="Seconds between two polls of the working tree.",
+        ),
+    ] = DEFAULT_POLL_INTERVAL,
+    debounce: Annotated[
+        float,
+        typer.Option(
+            "--debounce",
+            min=0,
+            help="Seconds the working tree must stay unchanged before messages are regenerated.",
+        ),
+    ] = DEFAULT_DEBOUNCE,
+    debug: Annotated[
+        bool,
+        typer.Option(
+            "--debug",
+            help="Enable debug mode to show prompts and raw AI responses.",
+        ),
+    ] = False,
+    jobs: Annotated[
+        int,
+        typer.Option(
+            "--jobs",
+            "-j",
+            min=1,
+            help="Number of commit messages to request from the AI concurrently.",
+        ),
+    ] = 1,
+    max_file_diff_bytes: Annotated[
+        int,
+        typer.Option(
+            "--max-file-diff-bytes",
+            min=0,
+            help="Per-file diff budget in prompts; use the same value as for 'commit run'.",
+        ),
+    ] = DEFAULT_MAX_FILE_BYTES,
+    max_prompt_bytes: Annotated[
+        int,
+        typer.Option(
+            "--max-prompt-bytes",
+            min=0,
+            help="Prompt size above which a group is summarized in chunks (0 = never split).",
+        ),
+    ] = DEFAULT_MAX_PROMPT_BYTES,
+    grouping: Annotated[
+        str,
+        typer.Option(
+            "--grouping",
+            help="Grouping strategy; use the same value as for 'commit run'.",
+        ),
+    ] = DEFAULT_GROUPING,
+    min_group_lines: Annotated[
+        int,
+        typer.Option("--min-group-lines", min=0),
+    ] = DEFAULT_MIN_GROUP_LINES,
+    max_group_lines: Annotated[
+        int,
+        typer.Option("--max-group-lines", min=0),
+    ] = DEFAULT_MAX_GROUP_LINES,
+    max_diff_bytes: Annotated[
+        int,
+        typer.Option(
+            "--max-diff-bytes",
+            min=0,
+            help="Working-tree diff read budget; use the same value as for 'commit run' (0 = unlimited).",
+        ),
+    ] = DEFAULT_MAX_DIFF_BYTES,
+) -> None:
+    """Watches the working tree and pre-generates commit messages into the commit message cache until interrupted, so that a later `avcmt commit run` with the same options completes without waiting for the AI.
+
+    Args:
+        pathspecs (list[str] | None): Git pathspecs limiting the watched changes, like for 'commit run'. Defaults to None (the whole tree).
+        interval (float): Seconds between two polls. Defaults to 2.0.
+        debounce (float): Seconds a change must settle before messages are regenerated. Defaults to 5.0.
+        debug (bool): If True, enables debug mode to show prompts and raw AI responses. Defaults to False.
+        jobs (int): Number of commit messages requested concurrently. Defaults to 1.
+        max_file_diff_bytes (int): Per-file byte budget of the diff sent to the AI. Defaults to 8192.
+        max_prompt_bytes (int): Prompt size above which a group's diff is summarized with map-reduce. Defaults to 60000.
+        grouping (str): Name of the grouping strategy. Defaults to "directory".
+        min_group_lines (int): Changed-line count below which balanced grouping merges a group. Defaults to 20.
+        max_group_lines (int): Changed-line count above which balanced grouping splits a group. Defaults to 2000.
+        max_diff_bytes (int): Byte budget for reading the working-tree diff; 0 means unlimited. Defaults to 64 MiB.
+
+    Returns:
+        None
+    """
+    log_file = get_log_file()
+    logger = setup_logging(log_file)
+    logger.info(f"Log file for this run: {log_file}")
+    logger.info("Invoking 'commit watch' command with options:")
+    logger.info(f"  interval: {interval}, debounce: {debounce}, jobs: {jobs}")
+    logger.info(f"  grouping: {grouping}, max_file_diff_bytes: {max_file_diff_bytes}")
+    logger.info(f"  max_diff_bytes: {max_diff_bytes}")
+    logger.info(f"  pathspecs: {pathspecs or 'whole tree'}")
+
+    run_commit_watch(
+        interval=interval,
+        debounce=debounce,
+        logger=logger,
+        debug=debug,
+        jobs=jobs,
+        max_file_diff_bytes=max_file_diff_bytes,
+        max_prompt_bytes=max_prompt_bytes,
+        grouping=grouping,
+        min_group_lines=min_group_lines,
+        max_group_lines=max_group_lines,
+        max_diff_bytes=max_diff_bytes,
+        pathspecs=pathspecs,
     )
 
 
 @app.command("clear-cache")
 def clear_cache() -> None:
-    """Deletes the dry-run cache file if it exists, providing user feedback on the operation's success or failure.
+    """Deletes the dry-run cache file and the commit message cache if they exist, providing user feedback on the operation's success or failure.
 
     Args:
         None
@@ -122,6 +558,14 @@ def clear_cache() -> None:
         )
     else:
         typer.secho("[i] No dry-run cache file found to clear.", fg=typer.colors.YELLOW)
+    if CommitMessageCache().clear():
+        typer.secho(
+            "✅ Commit message cache cleared successfully.", fg=typer.colors.GREEN
+        )
+    else:
+        typer.secho(
+            "[i] No commit message cache found to clear.", fg=typer.colors.YELLOW
+        )
 
 
 @app.command("list-cached")
@@ -44,7 +44,7 @@ def run_doc_updater(
         bool,
         typer.Option(
             "--all-files",
-            help="Process all files, ignoring modification times.",
+            help="Process all files, not only those whose content changed since the last run.",
         ),
     ] = False,
     dry_run: Annotated[
@@ -68,15 +68,34 @@ def run_doc_updater(
             "--debug", help="Enable debug mode for prompts and raw AI responses."
         ),
     ] = False,
+    jobs: Annotated[
+        int,
+        typer.Option(
+            "--jobs",
+            "-j",
+            min=1,
+            help="Number of docstrings to request from the AI concurrently, across files.",
+        ),
+    ] = 1,
+    batch_size: Annotated[
+        int,
+        typer.Option(
+            "--batch-size",
+            min=1,
+            help="Document up to N functions and classes of a file per AI request.",
+        ),
+    ] = 1,
 ) -> None:
     """Performs the documentation update process for project files, supporting dry run mode, full file processing, debugging, and error handling.
     Raises a `typer.Exit` exception with code 1 if an error occurs, including specific handling for `DocGeneratorError`.
     Args:
         path (str): The directory of the project to scan for documentation updates. Defaults to "avcmt".
-        all_files (bool): If True, processes all files regardless of modification time. Defaults to False.
+        all_files (bool): If True, processes all files, not only those whose content changed. Defaults to False.
         dry_run (bool): If True, performs a preview of changes without modifying files, outputting suggestions to a log. Defaults to False.
         force_rebuild (bool): If True, ignores cache and forces new AI suggestions for all files. Defaults to False.
         debug (bool): If True, enables debug mode to show prompts and raw AI responses. Defaults to False.
+        jobs (int): Number of concurrent AI requests; each file is still written by a single owner. Defaults to 1.
+        batch_size (int): Maximum number of nodes of one file documented per AI request. Defaults to 1.
     Returns: None.
     """
     mode = "DRY RUN" if dry_run else "LIVE RUN"
@@ -86,7 +105,7 @@ def run_doc_updater(
     )
 
     try:
-        generator = DocGenerator(debug=debug)
+        generator = DocGenerator(debug=debug, jobs=jobs, batch_size=batch_size)
         generator.run(
             path=path, dry_run=dry_run, all_files=all_files, force_rebuild=force_rebuild
         )
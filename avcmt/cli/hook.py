@@ -0,0 +1,185 @@
+# Copyright 2025 Andy Vandaric
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+# File: avcmt/cli/hook.py
+# Description: CLI sub-command group for installing and running the git commit hook.
+
+from typing import Annotated
+
+import typer
+
+from avcmt.modules.commit_generator import DEFAULT_MODEL, DEFAULT_PROVIDER
+from avcmt.modules.commit_hook import (
+    DEFAULT_HOOK_TIMEOUT,
+    HookError,
+    install_hook,
+    run_prepare_commit_msg,
+    uninstall_hook,
+)
+from avcmt.modules.diff_shaper import DEFAULT_MAX_FILE_BYTES
+
+app = typer.Typer(
+    name="hook",
+    help="Install the prepare-commit-msg hook that fills in AI commit messages.",
+    no_args_is_help=True,
+)
+
+
+@app.command("install")
+def install(
+    on_miss: Annotated[
+        str,
+        typer.Option(
+            "--on-miss",
+            help="When no cached message matches the staged diff: 'empty' leaves the message blank, 'query' asks the AI within --timeout.",
+        ),
+    ] = "empty",
+    timeout: Annotated[
+        float,
+        typer.Option(
+            "--timeout",
+            min=0.1,
+            help="Seconds the hook waits for the AI with --on-miss query.",
+        ),
+    ] = DEFAULT_HOOK_TIMEOUT,
+    force: Annotated[
+        bool,
+        typer.Option(
+            "--force",
+            help="Replace an existing prepare-commit-msg hook (it is kept as a backup).",
+        ),
+    ] = False,
+    provider: Annotated[
+        str,
+        typer.Option(
+            "--provider",
+            help="AI provider whose cached messages the hook uses; must match the one of 'commit run' and 'commit watch'.",
+        ),
+    ] = DEFAULT_PROVIDER,
+    model: Annotated[
+        str,
+        typer.Option(
+            "--model",
+            help="Model whose cached messages the hook uses; must match the one of 'commit run' and 'commit watch'.",
+        ),
+    ] = DEFAULT_MODEL,
+    max_file_diff_bytes: Annotated[
+        int,
+        typer.Option(
+            "--max-file-diff-bytes",
+            min=0,
+            help="Per-file diff budget; must match the one of 'commit run' and 'commit watch' (0 = unlimited).",
+        ),
+    ] = DEFAULT_MAX_FILE_BYTES,
+) -> None:
+    """Installs the prepare-commit-msg hook into the current repository, reporting the result to the user.
+
+    Args:
+        on_miss (str): What the hook does when the message is not cached ("empty" or "query"). Defaults to "empty".
+        timeout (float): Seconds the hook waits for the AI when querying. Defaults to 3.0.
+        force (bool): If True, replaces a hook that was not installed by avcmt. Defaults to False.
+        provider (str): The AI provider the hook looks up and generates messages for. Defaults to "pollinations".
+        model (str): The model the hook looks up and generates messages for. Defaults to "gemini".
+        max_file_diff_bytes (int): Per-file byte budget the staged diff is shaped with. Defaults to 8192.
+
+    Returns:
+        None
+
+    Raises:
+        typer.Exit: Exits with code 1 if the hook could not be installed.
+    """
+    try:
+        hook_path = install_hook(
+            on_miss=on_miss,
+            timeout=timeout,
+            force=force,
+            provider=provider,
+            model=model,
+            max_file_diff_bytes=max_file_diff_bytes,
+        )
+    except HookError as e:
+        typer.secho(f"❌ {e}", fg=typer.colors.RED, err=True)
+        raise typer.Exit(code=1) from e
+    typer.secho(f"✅ Hook installed at {hook_path}.", fg=typer.colors.GREEN)
+
+
+@app.command("uninstall")
+def uninstall() -> None:
+    """Removes the prepare-commit-msg hook installed by avcmt, restoring a previous hook if one was backed up.
+
+    Args:
+        None
+
+    Returns:
+        None
+    """
+    try:
+        removed = uninstall_hook()
+    except HookError as e:
+        typer.secho(f"❌ {e}", fg=typer.colors.RED, err=True)
+        raise typer.Exit(code=1) from e
+    if removed:
+        typer.secho("✅ Hook removed.", fg=typer.colors.GREEN)
+    else:
+        typer.secho("[i] No avcmt hook found.", fg=typer.colors.YELLOW)
+
+
+@app.command("run", hidden=True)
+def run_hook(
+    message_file: Annotated[
+        str, typer.Argument(help="The commit message file passed by git.")
+    ],
+    source: Annotated[
+        str | None, typer.Argument(help="The message source passed by git.")
+    ] = None,
+    commit_sha: Annotated[
+        str | None, typer.Argument(help="The commit passed by git for amends.")
+    ] = None,
+    on_miss: Annotated[str, typer.Option("--on-miss")] = "empty",
+    timeout: Annotated[float, typer.Option("--timeout")] = DEFAULT_HOOK_TIMEOUT,
+    provider: Annotated[str, typer.Option("--provider")] = DEFAULT_PROVIDER,
+    model: Annotated[str, typer.Option("--model")] = DEFAULT_MODEL,
+    max_file_diff_bytes: Annotated[
+        int, typer.Option("--max-file-diff-bytes")
+    ] = DEFAULT_MAX_FILE_BYTES,
+) -> None:
+    """Entry point called by the installed hook with git's prepare-commit-msg arguments. It never fails, so a commit is never blocked by avcmt.
+
+    Args:
+        message_file (str): The path of the commit message file.
+        source (str | None): The message source ("message", "template", "merge", "squash", "commit" or None).
+        commit_sha (str | None): The commit being amended, if any; unused.
+        on_miss (str): What to do when the message is not cached. Defaults to "empty".
+        timeout (float): Seconds to wait for the AI when querying. Defaults to 3.0.
+        provider (str): The AI provider of the cache key. Defaults to "pollinations".
+        model (str): The model of the cache key. Defaults to "gemini".
+        max_file_diff_bytes (int): Per-file byte budget the staged diff is shaped with. Defaults to 8192.
+
+    Returns:
+        None
+    """
+    run_prepare_commit_msg(
+        message_file,
+        source=source,
+        on_miss=on_miss,
+        timeout=timeout,
+        provider=provider,
+        model=model,
+        max_file_diff_bytes=max_file_diff_bytes,
+    )
+
+
+# The installed hook runs this module directly, so the other command groups are never imported.
+if __name__ == "__main__":
+    app()
@@ -32,6 +32,7 @@ import typer
 # We now import the app instance from each command module.
 from avcmt.cli.commit import app as commit_app
 from avcmt.cli.docs import app as docs_app  # ADDED: Import the docs Typer app
+from avcmt.cli.hook import app as hook_app
 from avcmt.cli.release import app as release_app
 
 app = typer.Typer(
@@ -103,6 +104,7 @@ def main_callback(
 app.add_typer(commit_app, name="commit")
 app.add_typer(release_app, name="release")
 app.add_typer(docs_app, name="docs")  # ADDED: Register the docs Typer app
+app.add_typer(hook_app, name="hook")
 
 if __name__ == "__main__":
     app()
@@ -0,0 +1,220 @@
+# Copyright 2025 Andy Vandaric
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+# File: avcmt/modules/commit_batch.py
+# Description: Runs `commit run` over many repositories in one process with a bounded pool.
+
+import logging
+import time
+from collections.abc import Iterable
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+from avcmt.modules.commit_cache import CommitMessageCache
+from avcmt.modules.commit_generator import CommitError, CommitGenerator
+
+DEFAULT_REPO_JOBS = 4
+
+
+@dataclass
+class RepoResult:
+    """The outcome of a commit run in one repository.
+
+    Args:
+        path (Path): The repository.
+        committed_groups (list[str]): Groups committed (or recorded in dry-run mode).
+        failed_groups (list[str]): Groups skipped because no message could be generated.
+        error (str | None): The error that aborted the run, if any.
+        seconds (float): Wall time of the run.
+    """
+
+    path: Path
+    committed_groups: list[str] = field(default_factory=list)
+    failed_groups: list[str] = field(default_factory=list)
+    error: str | None = None
+    seconds: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        """Returns True if the run finished without error and without skipped groups."""
+        return self.error is None and not self.failed_groups
+
+
+@dataclass
+class BatchReport:
+    """The per-repository results of a batch run, in the order the repositories were given.
+
+    Args:
+        results (list[RepoResult]): One result per repository.
+        seconds (float): Wall time of the whole batch.
+    """
+
+    results: list[RepoResult]
+    seconds: float = 0.0
+
+    @property
+    def failures(self) -> list[RepoResult]:
+        """Returns the results of repositories that failed or skipped groups."""
+        return [result for result in self.results if not result.ok]
+
+    def format_summary(self) -> str:
+        """Renders one line per repository followed by the aggregate failure report.
+
+        Returns:
+            str: The summary text.
+        """
+        lines = []
+        for result in self.results:
+            state = "OK" if result.ok else "FAILED"
+            lines.append(
+                f"{state:<7}{result.path}  {len(result.committed_groups)} group(s) in {result.seconds:.1f}s"
+            )
+        failures = self.failures
+        lines.append(
+            f"{len(self.results) - len(failures)} of {len(self.results)} repositories succeeded in {self.seconds:.1f}s."
+        )
+        for result in failures:
+            reason = (
+                result.error or f"skipped groups: {', '.join(result.failed_groups)}"
+            )
+            lines.append(f"  - {result.path}: {reason}")
+        return "\n".join(lines)
+
+
+class _RepoLogAdapter(logging.LoggerAdapter):
+    """Prefixes every message with the repository name so interleaved logs of concurrent runs stay readable."""
+
+    def process(self, msg, kwargs):
+        return f"[{self.extra['repo']}] {msg}", kwargs
+
+
+def resolve_repositories(spec: str) -> list[Path]:
+    """Resolves the `--repos` argument into repository paths.
+
+    If `spec` names an existing file, it is read as a list of repository paths, one per line (blank lines and lines starting with "#" are ignored; relative paths are relative to the file). Otherwise `spec` is a glob pattern, and every matching directory that contains a `.git` entry is used.
+
+    Args:
+        spec (str): A repository list file or a glob pattern.
+
+    Returns:
+        list[Path]: The repository paths, without duplicates, in order.
+
+    Raises:
+        CommitError: If no repository was found.
+    """
+    spec_path = Path(spec)
+    if spec_path.is_file():
+        lines = spec_path.read_text(encoding="utf-8").splitlines()
+        paths = [
+            spec_path.parent / line.strip()
+            for line in lines
+            if line.strip() and not line.strip().startswith("#")
+        ]
+    else:
+        root = Path(spec_path.anchor or ".")
+        pattern = str(spec_path.relative_to(root)) if spec_path.anchor else spec
+        paths = [
+            match for match in sorted(root.glob(pattern)) if (match / ".git").exists()
+        ]
+    repositories = list(dict.fromkeys(path.resolve() for path in paths))
+    if not repositories:
+        raise CommitError(f"No repositories found for '{spec}'.")
+    return repositories
+
+
+def _run_repository(
+    path: Path, logger: Any, message_cache: CommitMessageCache, **generator_options
+) -> RepoResult:
+    """Runs the commit process in one repository and captures its outcome instead of raising.
+
+    Args:
+        path (Path): The repository.
+        logger (Any): The logger of the batch; messages are prefixed with the repository name.
+        message_cache (CommitMessageCache): The message cache shared by all repositories.
+        **generator_options: Keyword arguments for `CommitGenerator`.
+
+    Returns:
+        RepoResult: The outcome of the run.
+    """
+    result = RepoResult(path=path)
+    started = time.perf_counter()
+    try:
+        generator = CommitGenerator(
+            repo_path=path,
+            logger=_RepoLogAdapter(logger, {"repo": path.name}),
+            message_cache=message_cache,
+            **generator_options,
+        )
+        generator.run()
+        result.committed_groups = generator.successful_groups
+        result.failed_groups = generator.failed_groups
+    except Exception as e:
+        result.error = str(e) or type(e).__name__
+        logger.error(f"[{path.name}] The commit process failed: {result.error}")
+    result.seconds = time.perf_counter() - started
+    return result
+
+
+def run_commit_batch(
+    repositories: Iterable[str | Path],
+    repo_jobs: int = DEFAULT_REPO_JOBS,
+    logger: Any | None = None,
+    message_cache: CommitMessageCache | None = None,
+    **generator_options,
+) -> BatchReport:
+    """Runs `commit run` in many repositories within one process, so Python startup and imports are paid once and the AI provider's connection pool stays warm across repositories.
+
+    Up to `repo_jobs` repositories are processed concurrently. All of them share one commit message cache (by default the store in "log/commit_cache.jsonl" of the current directory), so an identical change in several repositories, such as the same dependency bump, reuses the message generated for the first of them that finished instead of asking the AI again. A failing repository never stops the others; its error is collected in the report.
+
+    Args:
+        repositories (Iterable[str | Path]): The repositories to process.
+        repo_jobs (int): Number of repositories processed concurrently. Defaults to 4.
+        logger (Any | None): Logger of the batch; defaults to the "avcmt" logger.
+        message_cache (CommitMessageCache | None): The shared message cache; if None, the default store is used.
+        **generator_options: Keyword arguments passed to every `CommitGenerator`, e.g. `dry_run` or `jobs`.
+
+    Returns:
+        BatchReport: The per-repository results.
+    """
+    logger = logger or logging.getLogger("avcmt")
+    if message_cache is None:
+        message_cache = CommitMessageCache()
+    paths = [Path(repository) for repository in repositories]
+    started = time.perf_counter()
+    logger.info(
+        f"Processing {len(paths)} repositories with {max(1, repo_jobs)} parallel job(s)."
+    )
+    with ThreadPoolExecutor(max_workers=max(1, repo_jobs)) as executor:
+        results = list(
+            executor.map(
+                lambda path: _run_repository(
+                    path, logger, message_cache, **generator_options
+                ),
+                paths,
+            )
+        )
+    report = BatchReport(results=results, seconds=time.perf_counter() - started)
+    logger.info("Batch summary:\n" + report.format_summary())
+    return report
+
+
+__all__ = [
+    "DEFAULT_REPO_JOBS",
+    "BatchReport",
+    "RepoResult",
+    "resolve_repositories",
+    "run_commit_batch",
+]
@@ -0,0 +1,184 @@
+# Copyright 2025 Andy Vandaric
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+# File: avcmt/modules/commit_cache.py
+# Description: Commit message cache keyed by a hash of the normalized group diff.
+
+import hashlib
+import json
+import threading
+import time
+from pathlib import Path
+
+from avcmt.modules.jsonl_store import needs_compaction, rewrite_store
+
+DEFAULT_CACHE_FILE = Path("log") / "commit_cache.jsonl"
+
+
+class CommitMessageCache:
+    """Stores generated commit messages keyed by a hash of the normalized diff, the prompt template and the model, so that an unchanged group is never sent to the AI twice and a changed one never reuses a stale message.
+
+    Entries are appended as JSON lines, which keeps writes cheap and safe for concurrent writers (threads of one run, or several avcmt processes). When a key appears more than once, the last entry wins. The store is independent of branch and run time. Once superseded lines dominate the store, or it holds more than `MAX_ENTRIES` messages, it is rewritten with the most recently stored `MAX_ENTRIES` entries. A message another process appends during that rewrite can be lost, and is then generated again.
+
+    Args:
+        path (Path | str): Location of the JSON Lines store (default is "log/commit_cache.jsonl").
+    """
+
+    # Entries kept when the store is compacted; older ones are dropped.
+    MAX_ENTRIES = 10000
+
+    def __init__(self, path: Path | str = DEFAULT_CACHE_FILE):
+        """Initializes the cache for the given store file; entries are loaded lazily on first access.
+
+        Args:
+            path (Path | str): Location of the JSON Lines store.
+        """
+        self.path = Path(path)
+        self._entries: dict[str, dict] | None = None
+        self._lines = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def normalize_diff(diff: str) -> str:
+        """Normalizes a diff so that equivalent changes hash identically: line endings are unified and trailing whitespace is removed.
+
+        The `index` lines are kept: diffs are read with full blob ids, which are the same whichever index the change is staged in, and they tell apart different contents whose shaped diff looks the same (e.g. two lockfile updates summarized to the same line counts).
+
+        Args:
+            diff (str): The diff text of a group.
+
+        Returns:
+            str: The normalized diff text.
+        """
+        lines = [line.rstrip() for line in diff.replace("\r\n", "\n").split("\n")]
+        return "\n".join(lines).strip()
+
+    @classmethod
+    def make_key(cls, diff: str, template_source: str, model: str) -> str:
+        """Builds the cache key for a group diff rendered with a given template and model.
+
+        Args:
+            diff (str): The diff text of the group.
+            template_source (str): The source of the prompt template used to render the diff.
+            model (str): The model (optionally qualified with its provider) generating the message.
+
+        Returns:
+            str: A hexadecimal SHA-256 digest identifying the request.
+        """
+        digest = hashlib.sha256()
+        for part in (model, template_source, cls.normalize_diff(diff)):
+            digest.update(part.encode("utf-8"))
+            digest.update(b"\0")
+        return digest.hexdigest()
+
+    def _load(self) -> dict[str, dict]:
+        """Reads the store into memory on first use, skipping malformed lines.
+
+        Returns:
+            dict[str, dict]: The cache entries keyed by their cache key, least recently stored first.
+        """
+        if self._entries is not None:
+            return self._entries
+        entries: dict[str, dict] = {}
+        lines = 0
+        if self.path.exists():
+            with self.path.open(encoding="utf-8") as f:
+                for line in f:
+                    lines += 1
+                    try:
+                        entry = json.loads(line)
+                        entries.pop(entry["key"], None)
+                        entries[entry["key"]] = entry
+                    except (json.JSONDecodeError, KeyError, TypeError):
+                        continue
+        self._entries = entries
+        self._lines = lines
+        return entries
+
+    def get(self, key: str) -> str | None:
+        """Returns the cached message for a key, or None when the key is unknown.
+
+        Args:
+            key (str): A key produced by `make_key`.
+
+        Returns:
+            str | None: The cached commit message, if any.
+        """
+        with self._lock:
+            entry = self._load().get(key)
+        return entry["message"] if entry else None
+
+    def put(self, key: str, message: str, group_name: str = ""):
+        """Stores a message for a key and appends it to the store immediately, compacting the store when superseded lines dominate it.
+
+        Args:
+            key (str): A key produced by `make_key`.
+            message (str): The commit message to cache.
+            group_name (str): The group the message was generated for, kept for reference only.
+
+        Returns:
+            None
+        """
+        entry = {
+            "key": key,
+            "group": group_name,
+            "message": message,
+            "created": time.time(),
+        }
+        with self._lock:
+            entries = self._load()
+            entries.pop(key, None)
+            entries[key] = entry
+            if needs_compaction(self._lines + 1, min(len(entries), self.MAX_ENTRIES)):
+                self._rewrite(entries)
+                return
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with self.path.open("a", encoding="utf-8") as f:
+                f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+            self._lines += 1
+
+    def _rewrite(self, entries: dict[str, dict]):
+        """Drops the oldest entries beyond `MAX_ENTRIES` and replaces the store with one line per remaining entry, atomically."""
+        for key in list(entries)[: max(len(entries) - self.MAX_ENTRIES, 0)]:
+            del entries[key]
+        rewrite_store(
+            self.path,
+            (
+                json.dumps(entry, ensure_ascii=False) + "\n"
+                for entry in entries.values()
+            ),
+        )
+        self._lines = len(entries)
+
+    def __len__(self) -> int:
+        """Returns the number of distinct cached messages."""
+        with self._lock:
+            return len(self._load())
+
+    def clear(self) -> bool:
+        """Deletes the store file.
+
+        Returns:
+            bool: True if the file was found and deleted, False otherwise.
+        """
+        with self._lock:
+            self._entries = {}
+            self._lines = 0
+            if self.path.exists():
+                self.path.unlink()
+                return True
+        return False
+
+
+__all__ = ["DEFAULT_CACHE_FILE", "CommitMessageCache"]
@@ -16,18 +16,59 @@
 # FINAL REVISION: Smartly handles push even with no new file changes.
 
 import logging
+import os
+import posixpath
+import re
+import shutil
 import subprocess
-from collections import defaultdict
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
 from pathlib import Path
 from typing import Any
 
 from avcmt.ai import generate_with_ai
+from avcmt.modules.commit_cache import DEFAULT_CACHE_FILE, CommitMessageCache
+from avcmt.modules.diff_shaper import (
+    DEFAULT_MAX_FILE_BYTES,
+    parse_check_attr,
+    parse_numstat,
+    shape_file_diff,
+    summarize_section,
+)
+from avcmt.modules.diff_utils import DIFF_OUTPUT_OPTIONS, EMPTY_TREE_HASH, chunk_diff
+from avcmt.modules.git_status import (
+    DEFAULT_FETCH_TTL,
+    STATUS_COMMAND,
+    StatusSnapshot,
+    parse_status_v2,
+)
+from avcmt.modules.git_stream import (
+    DEFAULT_MAX_DIFF_BYTES,
+    GitOutputStream,
+    GitStreamError,
+    iter_file_sections,
+)
+from avcmt.modules.grouping import (
+    DEFAULT_GROUPING,
+    DEFAULT_MAX_GROUP_LINES,
+    DEFAULT_MIN_GROUP_LINES,
+    get_grouping_strategy,
+    group_by_directory,
+    group_directory,
+)
+from avcmt.modules.heuristic_message import HeuristicMessageGenerator
+from avcmt.modules.latency_history import DEFAULT_LATENCY_FILE, LatencyHistory
+from avcmt.modules.run_journal import DEFAULT_JOURNAL_FILE, RunJournal
+from avcmt.modules.run_timer import PhaseTimer
+from avcmt.modules.scheduling import (
+    estimate_group_cost,
+    longest_first,
+    predict_makespan,
+)
 from avcmt.utils import (
     clean_ai_response,
-    extract_commit_messages_from_md,
     get_jinja_env,
-    is_recent_dry_run,
     setup_logging,
 )
 
@@ -45,6 +86,14 @@ class CommitError(Exception):
     """
 
 
+DEFAULT_PROVIDER = "pollinations"
+DEFAULT_MODEL = "gemini"
+DEFAULT_MAX_PROMPT_BYTES = 60000
+
+# Magic signature of a pathspec: the long form ":(top,glob)" or the short form ":/", ":!", ":^".
+_PATHSPEC_MAGIC = re.compile(r"(:\([^)]*\)|:[/!^]*:?)?(.*)", re.DOTALL)
+
+
 class CommitGenerator:
     """Manages the AI-powered commit generation process by identifying changed files, generating commit messages, staging, committing, and optionally pushing changes. Supports dry runs, caching, and configuration options for provider, model, and debugging.
 
@@ -56,21 +105,62 @@ class CommitGenerator:
         provider (str): Name of the AI provider to use (default is "pollinations").
         model (str): Name of the AI model to use (default is "gemini").
         logger (Any or None): Logger instance for logging; defaults to internal setup if None.
+        jobs (int): Number of commit messages requested concurrently. 1 keeps the sequential flow (default is 1).
+        private_index (bool): If True, works against a private index via `GIT_INDEX_FILE` and commits with plumbing commands, leaving the user's index untouched until the run has finished (default is False).
+        message_cache (CommitMessageCache or None): Cache of generated messages keyed by diff hash; defaults to the store in "log/commit_cache.jsonl".
+        max_file_diff_bytes (int): Byte budget per file in the prompt; larger file diffs are sampled from their head and tail. 0 disables the cap (default is 8192).
+        max_prompt_bytes (int): Byte budget for a single commit prompt; larger groups are summarized chunk by chunk and the summaries merged into one message. 0 disables the map-reduce path (default is 60000).
+        grouping (str): Name of the grouping strategy: "directory" groups by parent directory, "balanced" additionally merges small sibling groups and splits large ones by changed-line count (default is "directory").
+        min_group_lines (int): With "balanced" grouping, groups with fewer changed lines are merged into their parent directory (default is 20).
+        max_group_lines (int): With "balanced" grouping, groups with more changed lines are split into parts; 0 disables splitting (default is 2000).
+        offline (bool): If True, never contacts the remote to refresh ahead/behind information (default is False).
+        fetch_ttl (int): Seconds a previous fetch stays fresh before the remote is fetched again; 0 fetches on every run (default is 300).
+        max_diff_bytes (int): Maximum number of bytes read from the working-tree diff; git is stopped once it is exceeded and the remaining files are summarized from their line counts. 0 reads everything (default is 64 MiB).
+        resume (bool): If True, continues an interrupted run from its journal: committed groups are skipped and recorded messages are reused while the group's diff is unchanged (default is False).
+        journal (RunJournal or None): Journal recording the progress of the run; defaults to the journal in "log/commit_journal.jsonl".
+        timings_out (str or Path or None): If set, the per-phase timing report is also written to this JSON file (default is None).
+        repo_path (str or Path or None): A directory inside the repository to work on. git runs from the top level of that repository, and the cache, journal and dry-run files live in its "log" directory. None uses the current directory (default is None).
+        pathspecs (list[str] or None): Git pathspecs limiting the run to parts of the working tree, relative to `repo_path`. They are passed to `git status` and `git diff` themselves, so git never walks or diffs anything outside them (default is None, the whole tree).
+        latency_history (LatencyHistory or None): Store in which the duration of every AI request is recorded for `commit plan` estimates; defaults to the store in "log/ai_latency.jsonl".
+        heuristic_for_trivial (bool): If True, trivial groups (pure renames, deleted files, whitespace-only edits, version bumps) get a rule-based message instead of an AI call (default is False).
+        heuristic_fallback (bool): If True, a group whose AI request fails or returns nothing gets a rule-based message instead of being skipped (default is False).
         **kwargs: Additional keyword arguments passed to the AI generation function.
 
     Returns:
         None
     """
 
+    # Upper bound of concurrent chunk summaries when a group is map-reduced.
+    MAP_JOBS = 4
+
     def __init__(
         self,
         dry_run: bool = False,
         push: bool = False,
         debug: bool = False,
         force_rebuild: bool = False,
-        provider: str = "pollinations",
-        model: str = "gemini",
+        provider: str = DEFAULT_PROVIDER,
+        model: str = DEFAULT_MODEL,
         logger: Any | None = None,
+        jobs: int = 1,
+        private_index: bool = False,
+        message_cache: CommitMessageCache | None = None,
+        max_file_diff_bytes: int = DEFAULT_MAX_FILE_BYTES,
+        max_prompt_bytes: int = DEFAULT_MAX_PROMPT_BYTES,
+        grouping: str = DEFAULT_GROUPING,
+        min_group_lines: int = DEFAULT_MIN_GROUP_LINES,
+        max_group_lines: int = DEFAULT_MAX_GROUP_LINES,
+        offline: bool = False,
+        fetch_ttl: int = DEFAULT_FETCH_TTL,
+        max_diff_bytes: int = DEFAULT_MAX_DIFF_BYTES,
+        resume: bool = False,
+        journal: RunJournal | None = None,
+        timings_out: str | Path | None = None,
+        repo_path: str | Path | None = None,
+        pathspecs: list[str] | None = None,
+        latency_history: LatencyHistory | None = None,
+        heuristic_for_trivial: bool = False,
+        heuristic_fallback: bool = False,
         **kwargs,
     ):
         """Initializes a class instance with configuration options for operation modes, provider, model, logging, and additional parameters.
@@ -83,11 +173,37 @@ class CommitGenerator:
             provider (str): Specifies the provider to use; defaults to "pollinations".
             model (str): Specifies the model to utilize; defaults to "gemini".
             logger (Any | None): Logger object for recording logs; if None, a default logger is set up.
+            jobs (int): Number of concurrent AI requests; values above 1 enable the pipelined mode.
+            private_index (bool): If True, stages and commits through a temporary index file instead of the user's index.
+            message_cache (CommitMessageCache | None): Message cache to use; if None, the default on-disk store is used.
+            max_file_diff_bytes (int): Maximum number of diff bytes kept per file in a prompt; 0 means unlimited.
+            max_prompt_bytes (int): Maximum size of a single commit prompt before map-reduce summarization kicks in; 0 means unlimited.
+            grouping (str): Name of the strategy used to group changed files into commits.
+            min_group_lines (int): Lower changed-line bound per group for the "balanced" strategy.
+            max_group_lines (int): Upper changed-line bound per group for the "balanced" strategy.
+            offline (bool): If True, skips fetching from the remote.
+            fetch_ttl (int): Maximum age in seconds of the last fetch before the remote is fetched again.
+            max_diff_bytes (int): Read budget for the working-tree diff in bytes; 0 means unlimited.
+            resume (bool): If True, resumes the run recorded in the journal.
+            journal (RunJournal | None): Run journal to use; if None, the default on-disk journal is used.
+            timings_out (str | Path | None): Path of the JSON timing report, if one should be written.
+            repo_path (str | Path | None): A directory inside the repository to work on; None uses the current directory.
+            pathspecs (list[str] | None): Git pathspecs the run is limited to, relative to `repo_path`; None covers the whole tree.
+            latency_history (LatencyHistory | None): Store of AI request durations; if None, the default on-disk store is used.
+            heuristic_for_trivial (bool): If True, trivial groups get a rule-based message without an AI call.
+            heuristic_fallback (bool): If True, failed AI requests fall back to a rule-based message.
             **kwargs: Additional keyword arguments for extended configuration.
 
         Returns:
             None
+
+        Raises:
+            CommitError: If the grouping strategy is unknown or `repo_path` is not inside a git working tree.
         """
+        try:
+            self.group_files = get_grouping_strategy(grouping)
+        except ValueError as e:
+            raise CommitError(str(e)) from e
         self.dry_run = dry_run
         self.push = push
         self.debug = debug
@@ -95,17 +211,117 @@ class CommitGenerator:
         self.provider = provider
         self.model = model
         self.logger = logger or setup_logging("log/commit.log")
+        self.jobs = max(1, jobs)
+        self.private_index = private_index
+        self.max_file_diff_bytes = max_file_diff_bytes
+        self.max_prompt_bytes = max_prompt_bytes
+        self.grouping = grouping
+        self.min_group_lines = min_group_lines
+        self.max_group_lines = max_group_lines
+        self.offline = offline
+        self.fetch_ttl = fetch_ttl
+        self.max_diff_bytes = max_diff_bytes
+        self.sampled_files: set[str] = set()
+        # `git status` reports paths relative to the top level while other commands read them relative to their working directory, so every command runs from the top level.
+        self.repo_path, prefix = self._locate_repository(Path(repo_path or "."))
+        self.pathspecs = [
+            self._rebase_pathspec(spec, prefix) for spec in pathspecs or []
+        ]
+        self.latency_history = latency_history or LatencyHistory(
+            self.repo_path / DEFAULT_LATENCY_FILE
+        )
+        self.heuristic_for_trivial = heuristic_for_trivial
+        self.heuristic_fallback = heuristic_fallback
+        self.heuristic = HeuristicMessageGenerator(self.repo_path)
+        self.resume = resume
+        self.journal = journal or RunJournal(self.repo_path / DEFAULT_JOURNAL_FILE)
+        self.resumed_messages: dict[str, tuple[str, str]] = {}
+        self.timings_out = timings_out
+        self.timer = PhaseTimer()
+        self.status: StatusSnapshot | None = None
         self.kwargs = kwargs
-        self.dry_run_file = Path("log") / "commit_messages_dry_run.md"
+        self.dry_run_file = self.repo_path / "log" / "commit_messages_dry_run.md"
+        self.untracked_files: set[str] = set()
+        self.nested_repo_heads: dict[str, str] = {}
+        self.file_stats: dict[str, tuple[int | None, int | None]] = {}
+        # Without commits to make, git must not take optional locks: `git status` would otherwise write its stat refresh into the user's index.
+        self.git_env: dict[str, str] = {"GIT_OPTIONAL_LOCKS": "0"} if dry_run else {}
+        self.committed_files: list[str] = []
+        self.successful_groups: list[str] = []
+        self.failed_groups: list[str] = []
         self.commit_template_env = get_jinja_env("commit")
+        # An empty cache is falsy (it has a length), so test for None explicitly.
+        self.message_cache = (
+            message_cache
+            if message_cache is not None
+            else CommitMessageCache(self.repo_path / DEFAULT_CACHE_FILE)
+        )
+        self.template_source = self.commit_template_env.loader.get_source(
+            self.commit_template_env, "commit_message.j2"
+        )[0]
+
+    @staticmethod
+    def _locate_repository(path: Path) -> tuple[Path, str]:
+        """Finds the top level of the repository containing `path`.
+
+        Args:
+            path (Path): A directory inside the repository.
+
+        Returns:
+            tuple[Path, str]: The top-level directory and the path of `path` relative to it, with a trailing slash ("" at the top level).
+
+        Raises:
+            CommitError: If `path` is not inside a git working tree.
+        """
+        result = subprocess.run(
+            ["git", "rev-parse", "--show-toplevel", "--show-prefix"],
+            capture_output=True,
+            text=True,
+            encoding="utf-8",
+            check=False,
+            cwd=path,
+        )
+        if result.returncode != 0:
+            raise CommitError(f"'{path}' is not inside a git working tree.")
+        top_level, prefix = [*result.stdout.split("\n"), ""][:2]
+        return Path(top_level), prefix
+
+    @staticmethod
+    def _rebase_pathspec(spec: str, prefix: str) -> str:
+        """Rewrites a pathspec given relative to a subdirectory so it selects the same paths from the top level. Pathspecs anchored at the top level (":/" or ":(top)") are kept as they are.
+
+        Args:
+            spec (str): The pathspec, possibly with magic.
+            prefix (str): The subdirectory it is relative to, with a trailing slash ("" for the top level).
+
+        Returns:
+            str: The pathspec relative to the top level.
+        """
+        magic, path = _PATHSPEC_MAGIC.fullmatch(spec).groups()
+        magic = magic or ""
+        if magic.startswith(":("):
+            anchored = "top" in magic[2:-1].split(",")
+        else:
+            anchored = "/" in magic
+        if not prefix or anchored:
+            return spec
+        return magic + posixpath.normpath(prefix + path)
 
     # ... (Metode helper lain dari _run_git_command hingga _get_commit_message tetap sama) ...
-    def _run_git_command(self, command: list[str], ignore_errors: bool = False) -> str:
+    def _run_git_command(
+        self,
+        command: list[str],
+        ignore_errors: bool = False,
+        input_text: str | None = None,
+    ) -> str:
         """Executes a git command and returns its standard output as a string; raises a CommitError if the command fails.
 
+        The variables in `self.git_env` (e.g. `GIT_INDEX_FILE` in private-index mode) are added to the environment of the command.
+
         Args:
             command (list[str]): The git command and its arguments to execute.
             ignore_errors (bool, optional): If True, suppresses exceptions on command failure. Defaults to False.
+            input_text (str | None, optional): Text passed to the command on stdin. Defaults to None.
 
         Returns:
             str: The stripped standard output of the git command.
@@ -113,14 +329,18 @@ class CommitGenerator:
         Raises:
             CommitError: If the git command fails and ignore_errors is False.
         """
+        self.timer.count("git_subprocesses")
         try:
             result = subprocess.run(
                 command,
+                input=input_text,
                 capture_output=True,
                 text=True,
                 encoding="utf-8",
                 errors="replace",
                 check=not ignore_errors,
+                env={**os.environ, **self.git_env} if self.git_env else None,
+                cwd=self.repo_path,
             )
             return result.stdout.strip()
         except subprocess.CalledProcessError as e:
@@ -131,7 +351,9 @@ class CommitGenerator:
             raise CommitError(error_message) from e
 
     def _get_changed_files(self) -> list[str]:
-        """Returns a list of file paths that have been deleted, modified, or are untracked in the current Git repository. The method executes a Git command to retrieve the list of such files and processes the output to return a clean list of file paths with whitespace trimmed.
+        """Returns a list of file paths that have been added, deleted, modified, or are untracked in the current Git repository. The method takes a single NUL-delimited `git status --porcelain=v2 --branch -z` snapshot, keeps it in `self.status` for the branch checks in `_is_local_ahead`, remembers which of the files are untracked in `self.untracked_files`, and returns a de-duplicated list of file paths.
+
+        Untracked nested repositories are listed as "dir/". Their checked-out commit is remembered in `self.nested_repo_heads`, so they can be diffed and committed as a gitlink; a nested repository without a commit cannot be recorded by git and is left out with a warning.
 
         Args:
             None
@@ -139,17 +361,26 @@ class CommitGenerator:
         Returns:
             list[str]: A list of strings, each representing the path to a changed, deleted, or untracked file.
         """
-        output = self._run_git_command(
-            [
-                "git",
-                "ls-files",
-                "--deleted",
-                "--modified",
-                "--others",
-                "--exclude-standard",
-            ]
+        self.status = parse_status_v2(
+            self._run_git_command(self._scoped(STATUS_COMMAND))
         )
-        return [line.strip() for line in output.split("\n") if line.strip()]
+        self.untracked_files = self.status.untracked_files
+        self.nested_repo_heads = {}
+        files = []
+        for path in self.status.changed_files:
+            if path.endswith("/") and path in self.untracked_files:
+                head = self._run_git_command(
+                    ["git", "-C", path, "rev-parse", "--verify", "-q", "HEAD"],
+                    ignore_errors=True,
+                )
+                if not head:
+                    self.logger.warning(
+                        f"Skipping nested repository '{path}': it has no commit to record."
+                    )
+                    continue
+                self.nested_repo_heads[path] = head
+            files.append(path)
+        return files
 
     @staticmethod
     def _group_files_by_directory(files: list[str]) -> dict[str, list[str]]:
@@ -163,27 +394,254 @@ class CommitGenerator:
         Returns:
             dict of str to list of str: A dictionary mapping directory names to lists of file paths.
         """
-        grouped = defaultdict(list)
-        for file_path in files:
-            parent_dir = str(Path(file_path).parent)
-            if parent_dir == ".":
-                parent_dir = "root"
-            grouped[parent_dir].append(file_path)
-        return grouped
+        return group_by_directory(files)
 
-    def _get_diff_for_files(self, files: list[str]) -> str:
-        """Generate a diff for the specified files staged in Git. This method runs a Git command to retrieve the differences between the staged version of the given files and their last committed state, returning the diff output as a string.
+    def _group_changed_files(self, files: list[str]) -> dict[str, list[str]]:
+        """Groups the changed files with the configured grouping strategy. Must be called after the diff has been computed, since size-aware strategies weigh files by their numstat counts.
 
         Args:
-            files (list[str]): A list of file paths for which the diff should be generated.
+            files (list[str]): The changed file paths.
 
         Returns:
-            str: The diff output as a string.
+            dict[str, list[str]]: A dictionary mapping group names to lists of file paths.
+        """
+        grouped_files = self.group_files(
+            files,
+            file_stats=self.file_stats,
+            min_weight=self.min_group_lines,
+            max_weight=self.max_group_lines,
+        )
+        self.logger.info(
+            f"Grouped {len(files)} file(s) into {len(grouped_files)} group(s) using '{self.grouping}' grouping."
+        )
+        return grouped_files
+
+    def _scoped(self, command: list[str]) -> list[str]:
+        """Appends the pathspecs of a scoped run to a git command, so git itself limits its work to them.
+
+        Args:
+            command (list[str]): A git command that accepts trailing pathspecs.
+
+        Returns:
+            list[str]: The command, followed by `--` and the pathspecs if the run is scoped.
+        """
+        return [*command, "--", *self.pathspecs] if self.pathspecs else command
+
+    def _check_staged_outside_scope(self, files: list[str]):
+        """Makes sure a scoped run cannot commit changes outside its pathspecs: every commit records the whole index, so files staged beforehand outside the scope would be swept into the first group.
+
+        Args:
+            files (list[str]): The changed files inside the scope.
+
+        Returns:
+            None
+
+        Raises:
+            CommitError: If files outside the scope are staged.
+        """
+        staged = self._run_git_command(
+            ["git", "diff", "--cached", "--name-only", "-z", "--no-renames"]
+        )
+        outside = sorted(set(filter(None, staged.split("\0"))) - set(files))
+        if outside:
+            raise CommitError(
+                f"{len(outside)} staged file(s) lie outside the pathspec (e.g. '{outside[0]}'). Commit or unstage them first."
+            )
+
+    def _run_git_with_pathspecs(self, command: list[str], files: list[str]) -> str:
+        """Runs a git command that operates on a list of files, streaming the paths NUL-delimited through stdin instead of the command line.
+
+        This avoids `ARG_MAX` limits for very large change sets and supports paths containing newlines. Paths are taken literally, so glob characters in file names are not expanded.
+
+        Args:
+            command (list[str]): The git command without any pathspec arguments, e.g. `["git", "add"]`.
+            files (list[str]): The file paths to pass as pathspecs.
+
+        Returns:
+            str: The stripped standard output of the git command.
         """
         return self._run_git_command(
-            ["git", "--no-pager", "diff", "--staged", "--", *files]
+            [
+                "git",
+                "--literal-pathspecs",
+                *command[1:],
+                "--pathspec-from-file=-",
+                "--pathspec-file-nul",
+            ],
+            input_text="\0".join(files),
         )
 
+    def _get_diff_base(self) -> str:
+        """Returns the revision the working tree is diffed against: `HEAD`, or the empty tree when the repository has no commits yet."""
+        head = self._run_git_command(
+            ["git", "rev-parse", "--verify", "-q", "HEAD"], ignore_errors=True
+        )
+        return head or EMPTY_TREE_HASH
+
+    def _get_diff_for_files(self, files: list[str]) -> dict[str, str]:
+        """Generates the working-tree diff for the specified files without touching the user's index.
+
+        All changes are read with a single `git diff <base>` invocation that is streamed and split into per-file sections as it arrives; sections larger than `max_file_diff_bytes` are sampled while reading (and recorded in `self.sampled_files`), so memory stays bounded however large the change is. The per-file line counts from `git diff --numstat` are kept in `self.file_stats`. Once `max_diff_bytes` have been read, git is stopped and the remaining files are summarized from their line counts. Untracked files are first registered in a scratch copy of the index with `update-index --info-only` (one linear pass over stdin, no objects written), and untracked nested repositories as gitlinks to their checked-out commit, so that they show up in that same diff. `git diff` writes its stat refresh into the index it reads even when optional locks are off, so modes that do not commit always diff such a scratch copy.
+
+        Args:
+            files (list[str]): A list of file paths for which the diff should be generated.
+
+        Returns:
+            dict[str, str]: A dictionary mapping each file path with changes to its diff section.
+        """
+        # Nested repositories are listed as "dir/" and diffed as the gitlink "dir" that `git add` would record.
+        nested = {f.rstrip("/"): f for f in files if f in self.nested_repo_heads}
+        untracked = [
+            f
+            for f in files
+            if f in self.untracked_files and f not in self.nested_repo_heads
+        ]
+        previous_env = dict(self.git_env)
+        read_only = self.git_env.get("GIT_OPTIONAL_LOCKS") == "0"
+        scratch_index = (
+            self._copy_index("avcmt-diff-index")
+            if untracked or nested or read_only
+            else None
+        )
+        try:
+            if scratch_index:
+                self.git_env = {**previous_env, "GIT_INDEX_FILE": str(scratch_index)}
+            if untracked:
+                self._run_git_command(
+                    ["git", "update-index", "--add", "--info-only", "-z", "--stdin"],
+                    input_text="\0".join(untracked) + "\0",
+                )
+            if nested:
+                self._run_git_command(
+                    ["git", "update-index", "--add", "-z", "--index-info"],
+                    input_text="".join(
+                        f"160000 {self.nested_repo_heads[listed]}\t{gitlink}\0"
+                        for gitlink, listed in nested.items()
+                    ),
+                )
+            diff_base = self._get_diff_base()
+            self.file_stats = parse_numstat(
+                self._run_git_command(
+                    self._scoped(
+                        ["git", "diff", "--numstat", "-z", "--no-renames", diff_base]
+                    )
+                )
+            )
+            file_diffs = self._read_diff_sections(diff_base, set(files) | set(nested))
+            for gitlink, listed in nested.items():
+                if gitlink in file_diffs:
+                    file_diffs[listed] = file_diffs.pop(gitlink)
+                if gitlink in self.file_stats:
+                    self.file_stats[listed] = self.file_stats.pop(gitlink)
+            return file_diffs
+        finally:
+            if scratch_index:
+                self.git_env = previous_env
+                self._remove_index_file(scratch_index)
+
+    def _read_diff_sections(self, diff_base: str, wanted: set[str]) -> dict[str, str]:
+        """Streams `git diff <base>` and collects the sections of the wanted files, stopping git once `max_diff_bytes` have been read.
+
+        Args:
+            diff_base (str): The commit or tree to diff the working tree against.
+            wanted (set[str]): The file paths whose sections should be kept.
+
+        Returns:
+            dict[str, str]: A dictionary mapping each wanted file path with changes to its diff section.
+
+        Raises:
+            CommitError: If git fails.
+        """
+        stream = GitOutputStream(
+            self._scoped(
+                [
+                    "git",
+                    "-c",
+                    "core.quotePath=false",
+                    "--no-pager",
+                    "diff",
+                    "--no-color",
+                    "--no-renames",
+                    *DIFF_OUTPUT_OPTIONS,
+                    diff_base,
+                ]
+            ),
+            env=self.git_env,
+            max_bytes=self.max_diff_bytes,
+            cwd=self.repo_path,
+        )
+        sections: dict[str, str] = {}
+        self.sampled_files = set()
+        last_path = None
+        try:
+            for path, section, sampled in iter_file_sections(
+                stream, self.max_file_diff_bytes
+            ):
+                last_path = path
+                if path in wanted:
+                    sections[path] = section
+                    if sampled:
+                        self.sampled_files.add(path)
+        except GitStreamError as e:
+            raise CommitError(str(e)) from e
+        finally:
+            self.timer.count("git_subprocesses")
+            self.timer.count("diff_bytes_read", stream.bytes_read)
+        if stream.truncated:
+            unread = [p for p in self.file_stats if p in wanted and p not in sections]
+            # The last section was cut off mid-way; summarize it as well.
+            if last_path in sections and last_path in self.file_stats:
+                unread.append(last_path)
+            self.logger.warning(
+                f"Diff exceeds {self.max_diff_bytes} bytes; stopped reading and summarized {len(unread)} file(s) from their line counts."
+            )
+            for path in unread:
+                header = f"diff --git a/{path} b/{path}\n"
+                sections[path] = summarize_section(
+                    header, path, "diff read budget exceeded", self.file_stats[path]
+                )
+                self.sampled_files.discard(path)
+        return sections
+
+    def _shape_file_diffs(self, file_diffs: dict[str, str]) -> dict[str, str]:
+        """Shapes per-file diff sections before they are rendered into prompts.
+
+        Binary files, lockfiles and generated files (by name, or marked `linguist-generated` / `-diff` in `.gitattributes`) are replaced by a one-line summary, and every other section is capped to `max_file_diff_bytes` with head/tail sampling.
+
+        Args:
+            file_diffs (dict[str, str]): A dictionary mapping file paths to their raw diff sections.
+
+        Returns:
+            dict[str, str]: A dictionary mapping file paths to their shaped diff sections.
+        """
+        if not file_diffs:
+            return {}
+        attributes = parse_check_attr(
+            self._run_git_command(
+                ["git", "check-attr", "-z", "--stdin", "linguist-generated", "diff"],
+                input_text="\0".join(file_diffs) + "\0",
+            )
+        )
+        # Sections sampled while streaming are already within budget.
+        shaped = {
+            path: shape_file_diff(
+                path,
+                section,
+                self.file_stats.get(path),
+                attributes.get(path),
+                0 if path in self.sampled_files else self.max_file_diff_bytes,
+            )
+            for path, section in file_diffs.items()
+        }
+        raw_size = sum(len(section) for section in file_diffs.values())
+        shaped_size = sum(len(section) for section in shaped.values())
+        self.timer.count("diff_bytes_shaped", shaped_size)
+        if shaped_size < raw_size:
+            self.logger.info(
+                f"Shaped diffs for prompts: {raw_size} -> {shaped_size} characters."
+            )
+        return shaped
+
     def _write_dry_run_header(self):
         """Writes the header information to the dry run file, including metadata and a timestamp. This method creates necessary directories and initializes the file with appropriate headers and timestamp information. It does not take any parameters and does not return a value, but may raise exceptions if directory creation or file writing encounters an error."""
         self.dry_run_file.parent.mkdir(parents=True, exist_ok=True)
@@ -219,8 +677,29 @@ class CommitGenerator:
         """
         if not files:
             return
-        self.logger.info(f"Staging files for group: {files}")
-        self._run_git_command(["git", "add", *files])
+        self.logger.info(f"Staging {len(files)} file(s) for group.")
+        self._update_index(files)
+
+    def _update_index(self, files: list[str]):
+        """Records the working-tree state of the given files in the index currently in use, like `git add` would, including deletions.
+
+        Paths are streamed NUL-delimited to `git update-index -z --stdin`, which scales linearly with the number of files, whereas `git add` with tens of thousands of pathspecs does not. Nested repositories (listed as `dir/`) are passed to `git add` instead, since `update-index` only accepts files.
+
+        Args:
+            files (list[str]): The file paths to record in the index.
+
+        Returns:
+            None
+        """
+        plain_files = [f for f in files if not f.endswith("/")]
+        nested_repos = [f for f in files if f.endswith("/")]
+        if plain_files:
+            self._run_git_command(
+                ["git", "update-index", "--add", "--remove", "-z", "--stdin"],
+                input_text="\0".join(plain_files) + "\0",
+            )
+        if nested_repos:
+            self._run_git_with_pathspecs(["git", "add"], nested_repos)
 
     def _commit_changes(self, message: str):
         """Commits staged changes to the git repository with a specified commit message.
@@ -234,46 +713,316 @@ class CommitGenerator:
             None
         """
         self.logger.info(f"Committing with message:\n{message}")
-        self._run_git_command(["git", "commit", "-m", message])
+        if "GIT_INDEX_FILE" in self.git_env:
+            self._commit_with_plumbing(message)
+        else:
+            self._run_git_command(["git", "commit", "-m", message])
+
+    def _commit_with_plumbing(self, message: str):
+        """Creates a commit from the private index with `write-tree`, `commit-tree` and `update-ref`, without going through `git commit`.
+
+        The branch is advanced with a compare-and-swap against the previous HEAD, so a concurrent commit made by another tool makes this step fail instead of being overwritten. Commit hooks are not run in this mode.
+
+        Args:
+            message (str): The commit message to associate with the changes.
+
+        Returns:
+            None
+        """
+        tree = self._run_git_command(["git", "write-tree"])
+        parent = self._run_git_command(
+            ["git", "rev-parse", "--verify", "-q", "HEAD"], ignore_errors=True
+        )
+        parent_args = ["-p", parent] if parent else []
+        commit = self._run_git_command(
+            ["git", "commit-tree", tree, *parent_args, "-F", "-"],
+            input_text=message.strip() + "\n",
+        )
+        subject = message.strip().split("\n", 1)[0]
+        self._run_git_command(
+            ["git", "update-ref", "-m", f"commit: {subject}", "HEAD", commit, parent]
+        )
+
+    def _copy_index(self, name: str) -> Path:
+        """Copies the index currently in use (the private one if set, otherwise the user's) to a per-process file in the git directory.
+
+        Copying the index (rather than reading HEAD into an empty one) keeps its stat cache, so git does not have to rehash unchanged files.
+
+        Args:
+            name (str): The base file name of the copy; the process id is appended to it.
+
+        Returns:
+            Path: The absolute path of the new index file.
+        """
+        source = self.git_env.get("GIT_INDEX_FILE") or self._run_git_command(
+            ["git", "rev-parse", "--git-path", "index"]
+        )
+        source_path = self.repo_path / source
+        target_path = source_path.with_name(f"{name}-{os.getpid()}").resolve()
+        if source_path.exists():
+            # Keep the modification time: git compares it with the entries' to detect racily clean files.
+            shutil.copy2(source_path, target_path)
+        return target_path
+
+    @staticmethod
+    def _remove_index_file(index_path: Path):
+        """Deletes a temporary index file together with any lock file git may have left behind.
+
+        Args:
+            index_path (Path): The path of the temporary index file.
+
+        Returns:
+            None
+        """
+        index_path.unlink(missing_ok=True)
+        index_path.with_name(index_path.name + ".lock").unlink(missing_ok=True)
+
+    def _setup_private_index(self):
+        """Creates a private copy of the user's index in the git directory and points `GIT_INDEX_FILE` at it for all following git commands.
+
+        Returns:
+            None
+        """
+        private_index = self._copy_index("avcmt-index")
+        self.git_env = {**self.git_env, "GIT_INDEX_FILE": str(private_index)}
+        self.logger.info(f"Using private index: {private_index}")
+
+    def _teardown_private_index(self):
+        """Removes the private index file so that following git commands use the user's index again.
+
+        Returns:
+            None
+        """
+        self._remove_index_file(Path(self.git_env.pop("GIT_INDEX_FILE")))
+
+    def _sync_user_index(self):
+        """Records all files committed through the private index in the user's index as well, so that `git status` reflects the new commits.
+
+        Returns:
+            None
+        """
+        if self.committed_files:
+            self._update_index(self.committed_files)
 
     def _push_changes(self):
         """Pushes all local commits to the currently active remote branch. This method logs the start of the push process, executes the `git push` command to update the remote repository with local changes, and logs a success message upon completion. It may raise a subprocess.CalledProcessError if the push command fails or an AttributeError if the required attributes are not properly initialized."""
         self.logger.info("Pushing all commits to the active remote branch...")
-        self._run_git_command(["git", "push"])
+        with self.timer.phase("push"):
+            self._run_git_command(["git", "push"])
         self.logger.info("✔️ All changes pushed successfully.")
 
-    def _get_commit_message(
-        self, group_name: str, diff: str, cached_messages: dict
-    ) -> str:
-        """Gets or generates a commit message for the specified group, utilizing caching and AI assistance. If caching is enabled and a message exists in cached_messages for the given group_name, the cached message is returned. Otherwise, a new message is generated by rendering a template with the provided diff and group name, then processed through an AI provider to produce a formatted commit message.
+    def _get_commit_message(self, group_name: str, diff: str) -> str:
+        """Gets or generates a commit message for the specified group, utilizing caching and AI assistance. The message cache is looked up by a hash of the normalized diff, the prompt template and the model, so a message is reused only when the group's changes are exactly the same. Otherwise, a new message is generated by rendering a template with the provided diff and group name, then processed through an AI provider to produce a formatted commit message, which is stored in the cache.
 
         Args:
             group_name (str): The name of the group for which the commit message is generated.
             diff (str): The diff text to be included in the commit message.
-            cached_messages (dict): A dictionary containing cached commit messages, keyed by group name.
 
         Returns:
             str: The generated or cached commit message.
         """
-        if not self.force_rebuild and group_name in cached_messages:
+        cache_key = self._cache_key(diff)
+        resumed = self.resumed_messages.get(group_name)
+        if resumed and resumed[0] == cache_key:
+            self.logger.info(f"[RESUMED] Using journaled message for {group_name}.")
+            return resumed[1]
+        cached_message = self.message_cache.get(cache_key)
+        if cached_message and not self.force_rebuild:
             self.logger.info(f"[CACHED] Using cached message for {group_name}.")
-            return cached_messages[group_name]
-        if self.force_rebuild and group_name in cached_messages:
+            return cached_message
+        if cached_message:
             self.logger.info(f"[FORCED] Ignoring cache for {group_name}.")
+        if self.heuristic_for_trivial:
+            trivial_message = self.heuristic.trivial_message(group_name, diff)
+            if trivial_message:
+                self.logger.info(
+                    f"[HEURISTIC] Trivial change in {group_name}; no AI call needed."
+                )
+                return trivial_message
+        with self.timer.phase("render", group_name):
+            prompt = self._render_commit_prompt(group_name, diff)
+        prompt_size = len(prompt.encode("utf-8"))
+        self.timer.count("prompt_bytes", prompt_size)
+        try:
+            with self.timer.phase("generate", group_name):
+                raw_message = self._generate_raw_message(group_name, diff, prompt)
+        except Exception as e:
+            if not self.heuristic_fallback:
+                raise
+            self.logger.warning(
+                f"[HEURISTIC] AI request for {group_name} failed ({e}); using a rule-based message."
+            )
+            return self.heuristic.generate(group_name, diff)
+        commit_message = clean_ai_response(raw_message)
+        if commit_message:
+            self.message_cache.put(cache_key, commit_message, group_name)
+        elif self.heuristic_fallback:
+            self.logger.warning(
+                f"[HEURISTIC] Empty AI response for {group_name}; using a rule-based message."
+            )
+            return self.heuristic.generate(group_name, diff)
+        return commit_message
+
+    def _generate_raw_message(self, group_name: str, diff: str, prompt: str) -> str:
+        """Requests the raw commit message of a group: with the rendered prompt if it fits `max_prompt_bytes`, otherwise through map-reduce summarization.
+
+        Args:
+            group_name (str): The name of the group.
+            diff (str): The diff text of the group.
+            prompt (str): The rendered single-request prompt.
+
+        Returns:
+            str: The raw response of the provider.
+        """
+        if (
+            self.max_prompt_bytes
+            and len(prompt.encode("utf-8")) > self.max_prompt_bytes
+        ):
+            return self._generate_with_map_reduce(group_name, diff)
+        return self._request_ai(prompt)
+
+    def _render_commit_prompt(self, group_name: str, diff: str) -> str:
+        """Renders the single-request commit prompt of a group.
+
+        Args:
+            group_name (str): The name of the group.
+            diff (str): The diff text of the group.
+
+        Returns:
+            str: The rendered prompt.
+        """
         template = self.commit_template_env.get_template("commit_message.j2")
-        prompt = template.render(group_name=group_name, diff_text=diff)
-        raw_message = generate_with_ai(
+        return template.render(group_name=group_directory(group_name), diff_text=diff)
+
+    @property
+    def model_id(self) -> str:
+        """The provider-qualified model name, e.g. "pollinations/gemini"."""
+        return f"{self.provider}/{self.model}"
+
+    def _cache_key(self, diff: str) -> str:
+        """Builds the message cache key of a group diff for the configured template, provider and model.
+
+        Args:
+            diff (str): The shaped diff text of the group.
+
+        Returns:
+            str: The cache key.
+        """
+        return CommitMessageCache.make_key(diff, self.template_source, self.model_id)
+
+    def _request_ai(self, prompt: str) -> str:
+        """Sends a single prompt to the configured AI provider and model.
+
+        Args:
+            prompt (str): The rendered prompt.
+
+        Returns:
+            str: The raw response of the provider.
+        """
+        self.timer.count("ai_requests")
+        started = time.perf_counter()
+        response = generate_with_ai(
             prompt,
             provider=self.provider,
             model=self.model,
             debug=self.debug,
             **self.kwargs,
         )
-        return clean_ai_response(raw_message)
+        self.latency_history.record(
+            self.model_id, len(prompt.encode("utf-8")), time.perf_counter() - started
+        )
+        return response
+
+    def _generate_with_map_reduce(self, group_name: str, diff: str) -> str:
+        """Generates a commit message for a group whose diff does not fit into one prompt. The diff is split into chunks along file and hunk boundaries, each chunk is summarized concurrently (map), and the summaries are merged into one commit message with a final request (reduce).
+
+        Args:
+            group_name (str): The name of the group for which the commit message is generated.
+            diff (str): The complete diff text of the group.
+
+        Returns:
+            str: The raw response of the merge request.
+        """
+        prompts = self._render_chunk_prompts(group_name, diff)
+        self.logger.info(
+            f"[MAP-REDUCE] Diff for {group_name} exceeds {self.max_prompt_bytes} bytes; summarizing {len(prompts)} chunk(s)."
+        )
+        with ThreadPoolExecutor(
+            max_workers=min(len(prompts), max(self.jobs, self.MAP_JOBS))
+        ) as executor:
+            summaries = list(executor.map(self._request_ai, prompts))
+
+        merge_template = self.commit_template_env.get_template("merge_summaries.j2")
+        prompt = merge_template.render(
+            group_name=group_directory(group_name),
+            summaries=[summary.strip() for summary in summaries if summary],
+        )
+        return self._request_ai(prompt)
+
+    def _render_chunk_prompts(self, group_name: str, diff: str) -> list[str]:
+        """Splits a group diff into chunks that fit `max_prompt_bytes` together with the summary prompt, and renders one summary prompt per chunk.
+
+        Args:
+            group_name (str): The name of the group.
+            diff (str): The complete diff text of the group.
+
+        Returns:
+            list[str]: The rendered chunk prompts, in diff order.
+        """
+        chunk_template = self.commit_template_env.get_template("summarize_chunk.j2")
+        group_name = group_directory(group_name)
+        overhead = len(
+            chunk_template.render(
+                group_name=group_name, part=0, total=0, diff_text=""
+            ).encode("utf-8")
+        )
+        chunks = chunk_diff(diff, max(self.max_prompt_bytes - overhead, 1024))
+        return [
+            chunk_template.render(
+                group_name=group_name, part=i, total=len(chunks), diff_text=chunk
+            )
+            for i, chunk in enumerate(chunks, start=1)
+        ]
 
     # --- FUNGSI HELPER BARU ---
+    def _fetch_is_stale(self) -> bool:
+        """Checks whether the remote-tracking refs are older than `fetch_ttl`, using the modification time of `FETCH_HEAD`, which git rewrites on every fetch.
+
+        Returns:
+            bool: True if the repository was never fetched or the last fetch is older than the TTL.
+        """
+        fetch_head = self.repo_path / self._run_git_command(
+            ["git", "rev-parse", "--git-path", "FETCH_HEAD"]
+        )
+        try:
+            age = datetime.now().timestamp() - fetch_head.stat().st_mtime
+        except OSError:
+            return True
+        return age >= self.fetch_ttl
+
+    def _refresh_remote(self) -> bool:
+        """Fetches the upstream remote when its tracking refs are stale. Nothing is fetched in offline or dry-run mode, when the branch has no upstream, or when the last fetch is younger than `fetch_ttl`.
+
+        Returns:
+            bool: True if a fetch was performed successfully, False otherwise.
+        """
+        if self.offline or self.dry_run or not self.status.upstream:
+            return False
+        if not self._fetch_is_stale():
+            self.logger.debug(
+                f"Remote refs are younger than {self.fetch_ttl}s; skipping fetch."
+            )
+            return False
+        try:
+            with self.timer.phase("fetch"):
+                self._run_git_command(["git", "fetch", "--quiet"])
+        except CommitError as e:
+            self.logger.warning(f"Could not fetch from remote, using cached refs: {e}")
+            return False
+        return True
+
     def _is_local_ahead(self) -> bool:
-        """Checks whether the local Git branch is ahead of its remote counterpart by one or more commits. This method fetches updates from the remote repository, compares commit counts between local and remote branches, and determines if there are local commits not present on the remote. If the branch has not been pushed before, it considers it ahead if there are local commits despite the absence of upstream tracking.
+        """Checks whether the local Git branch is ahead of its remote counterpart by one or more commits. The ahead/behind counts come from the `git status` snapshot taken by `_get_changed_files`; the remote is only fetched when the cached remote-tracking refs are older than `fetch_ttl`, and never in offline or dry-run mode. If the branch has no upstream (or its upstream is gone), it is considered ahead if there are local commits.
 
         Args:
             None
@@ -281,33 +1030,49 @@ class CommitGenerator:
         Returns:
             bool: True if the local branch has commits that are not present on the remote, False otherwise.
         """
-        try:
-            # Pastikan remote-tracking branch ada
-            self._run_git_command(["git", "fetch", "origin"])
-            # Hitung jumlah commit yang ada di lokal tapi tidak di remote
+        if self.status is None:
+            self._get_changed_files()
+        status = self.status
+        if not status.upstream or status.ahead is None:
+            self.logger.warning(
+                "Could not check remote status (branch may be new or its upstream is gone)."
+            )
+            return status.oid is not None
+        ahead, behind = status.ahead, status.behind
+        if self._refresh_remote():
             output = self._run_git_command(
-                ["git", "rev-list", "--count", "@{u}..HEAD"], ignore_errors=True
+                ["git", "rev-list", "--left-right", "--count", "HEAD...@{u}"],
+                ignore_errors=True,
             )
-            if output and int(output) > 0:
-                self.logger.info(
-                    f"Local branch is ahead of remote by {output} commit(s)."
-                )
-                return True
-        except CommitError as e:
-            # Ini bisa terjadi jika branch belum pernah di-push (tidak ada upstream)
+            if output:
+                ahead, behind = (int(count) for count in output.split())
+        if behind:
             self.logger.warning(
-                f"Could not check remote status (branch may be new): {e}"
-            )
-            # Anggap saja 'ahead' jika ada commit lokal tapi upstream belum ada
-            return bool(
-                self._run_git_command(["git", "rev-parse", "HEAD"], ignore_errors=True)
+                f"Local branch is behind {status.upstream} by {behind} commit(s)."
             )
+        if ahead > 0:
+            self.logger.info(f"Local branch is ahead of remote by {ahead} commit(s).")
+            return True
         return False
 
     def run(self):
-        """Performs the main execution logic, including checking for file changes and branch status, and manages commit and push operations accordingly. Returns nothing. Raises exceptions related to underlying operations if any occur during file retrieval, grouping, caching, processing, or finalization."""
-        initial_files = self._get_changed_files()
-        local_is_ahead = self._is_local_ahead()
+        """Performs the main execution logic, including checking for file changes and branch status, and manages commit and push operations accordingly. A per-phase timing report is logged at the end, even if the run fails. Returns nothing. Raises exceptions related to underlying operations if any occur during file retrieval, grouping, caching, processing, or finalization."""
+        try:
+            self._run_steps()
+        finally:
+            self._report_timings()
+
+    def _run_steps(self):
+        """Performs the steps of a run: scanning, remote check, diffing, grouping, message generation, committing and pushing."""
+        journal_state = None if self.dry_run else self._recover_interrupted_run()
+        with self.timer.phase("scan"):
+            initial_files = self._get_changed_files()
+        if self.pathspecs:
+            self.logger.info(f"Scoped to pathspec: {' '.join(self.pathspecs)}")
+            if initial_files and not self.dry_run:
+                self._check_staged_outside_scope(initial_files)
+        with self.timer.phase("remote"):
+            local_is_ahead = self._is_local_ahead()
 
         # --- LOGIKA BARU: Keluar hanya jika tidak ada perubahan DAN tidak ada commit untuk di-push ---
         if not initial_files and not local_is_ahead:
@@ -318,47 +1083,148 @@ class CommitGenerator:
 
         # Proses commit hanya jika ada perubahan file
         if initial_files:
-            grouped_files = self._group_files_by_directory(initial_files)
-            cached_messages = self._prepare_cache()
-            _, failed_groups = self._process_groups(grouped_files, cached_messages)
+            with self.timer.phase("diff"):
+                file_diffs = self._collect_file_diffs(initial_files)
+            if self.resume:
+                grouped_files = self._plan_resumed_groups(initial_files, journal_state)
+            else:
+                grouped_files = self._group_changed_files(initial_files)
+            if self.dry_run:
+                self._write_dry_run_header()
+            if self.private_index:
+                self._setup_private_index()
+            try:
+                self.successful_groups, self.failed_groups = self._process_groups(
+                    grouped_files, file_diffs
+                )
+            finally:
+                if "GIT_INDEX_FILE" in self.git_env:
+                    self._teardown_private_index()
+                    self._sync_user_index()
         else:
             # Jika tidak ada file baru, tapi lokal lebih maju, lewati proses commit
             self.logger.info(
                 "No new file changes to commit, but local branch is ahead. Proceeding to push."
             )
-            failed_groups = []
 
-        self._finalize_run(failed_groups)
+        if not self.dry_run:
+            self.journal.finish()
+        self._finalize_run(self.failed_groups)
 
-    # ... (Metode _prepare_cache, _process_groups, _process_single_group tidak berubah dari patch sebelumnya) ...
-    def _prepare_cache(self) -> dict[str, str]:
-        """Returns a dictionary that maps strings to strings containing cached data. If dry_run mode is enabled, it writes a dry run header and returns an empty dictionary. If a recent dry run cache exists and force_rebuild is False, it logs an informational message indicating that the cache is being loaded from the dry run file and returns the extracted commit messages from the dry run file. Otherwise, it returns an empty dictionary."""
-        if self.dry_run:
-            self._write_dry_run_header()
-            return {}
-        if not self.force_rebuild and is_recent_dry_run(self.dry_run_file):
-            self.logger.info(f"Recent cache found. Loading from {self.dry_run_file}")
-            return extract_commit_messages_from_md(self.dry_run_file)
-        return {}
+    def _report_timings(self):
+        """Logs the per-phase timing table of the run and writes it to `timings_out` if requested.
+
+        Returns:
+            None
+        """
+        self.timer.stop()
+        self.logger.info("Timing report:\n" + self.timer.format_table())
+        if self.timings_out:
+            self.timer.write_json(self.timings_out)
+            self.logger.info(f"Timing report written to {self.timings_out}.")
+
+    def _recover_interrupted_run(self) -> dict | None:
+        """Inspects the journal of the previous run. If it was interrupted between staging a group and committing it, the group's files are unstaged again so they cannot leak into the next commit.
+
+        Returns:
+            dict | None: The replayed journal state of an interrupted run, or None if the previous run finished or no journal exists.
+        """
+        state = self.journal.load()
+        if not state or state["finished"]:
+            if self.resume:
+                self.logger.info("[RESUME] No interrupted run found; starting afresh.")
+            return None
+        self.logger.warning(
+            f"Previous commit run was interrupted after {len(state['committed'])} of {len(state['groups'])} group(s)."
+        )
+        for group_name, staged in state["staged"].items():
+            if staged.get("private"):
+                continue
+            self.logger.info(f"Unstaging files left over from group '{group_name}'.")
+            self._run_git_with_pathspecs(["git", "reset", "-q"], staged["files"])
+        if not self.resume:
+            self.logger.info("Use 'avcmt commit run --resume' to continue it.")
+        return state
+
+    def _plan_resumed_groups(
+        self, files: list[str], state: dict | None
+    ) -> dict[str, list[str]]:
+        """Rebuilds the group plan of an interrupted run: groups that were committed are dropped, the remaining groups keep their files that are still changed, and files changed since then are grouped with the configured strategy. Messages recorded for the remaining groups are reused when their diff is unchanged.
+
+        Args:
+            files (list[str]): The currently changed file paths.
+            state (dict | None): The replayed journal state, as returned by `_recover_interrupted_run`.
+
+        Returns:
+            dict[str, list[str]]: A dictionary mapping group names to lists of file paths, in commit order.
+        """
+        if not state:
+            return self._group_changed_files(files)
+        changed = set(files)
+        grouped_files: dict[str, list[str]] = {}
+        for group_name, members in state["groups"].items():
+            if group_name in state["committed"]:
+                continue
+            remaining = [f for f in members if f in changed]
+            if remaining:
+                grouped_files[group_name] = remaining
+        planned = {f for members in grouped_files.values() for f in members}
+        new_files = [f for f in files if f not in planned]
+        if new_files:
+            for group_name, members in self._group_changed_files(new_files).items():
+                grouped_files.setdefault(group_name, []).extend(members)
+        self.resumed_messages = state["messages"]
+        self.logger.info(
+            f"[RESUME] Skipping {len(state['committed'])} committed group(s); {len(grouped_files)} group(s) left."
+        )
+        return grouped_files
 
     def _process_groups(
-        self, grouped_files: dict, cached_messages: dict
+        self, grouped_files: dict, file_diffs: dict[str, str]
     ) -> tuple[list, list]:
         """Performs processing of grouped files and categorizes groups into successful or failed based on the processing outcome.
 
-        This method iterates through each group in the `grouped_files` dictionary, processes each group via the `_process_single_group` method, and segregates the groups into successful or failed lists accordingly.
+        The diffs of all groups are assembled from the per-file diffs computed up front in a single pass. When `jobs` is greater than 1 the commit messages are then requested concurrently; otherwise they are requested one group at a time. Either way, each group is committed via `_process_single_group` in the original group order.
 
         Args:
             grouped_files (dict): A dictionary where keys are group names (strings) and values are lists of filenames associated with each group.
-            cached_messages (dict): A dictionary containing cached message data used during processing.
+            file_diffs (dict[str, str]): The shaped diff section of each file, as returned by `_collect_file_diffs`.
 
         Returns:
             tuple of (list, list): A tuple where the first list contains names of groups that were successfully processed, and the second list contains names of groups that failed processing.
         """
+        group_diffs = self._build_group_diffs(grouped_files, file_diffs)
+        diff_hashes = {
+            name: self._cache_key(diff) for name, diff in group_diffs.items()
+        }
+        if not self.dry_run:
+            self.journal.start(
+                grouped_files, diff_hashes, self.status.oid if self.status else None
+            )
+        generated_messages = (
+            self._generate_messages_concurrently(group_diffs, grouped_files)
+            if self.jobs > 1
+            else {}
+        )
         successful_groups, failed_groups = [], []
         for group_name, files in grouped_files.items():
+            diff = group_diffs[group_name]
+            if not diff.strip():
+                # The group's files were reported as changed, so an empty diff means git did not show them.
+                self.logger.error(
+                    f"Skipping group '{group_name}': git produced no diff for its {len(files)} changed file(s)."
+                )
+                failed_groups.append(group_name)
+                continue
+            commit_message = generated_messages.get(group_name)
+            if commit_message is None:
+                commit_message = self._get_commit_message(group_name, diff)
+            if commit_message and not self.dry_run:
+                self.journal.record_message(
+                    group_name, diff_hashes[group_name], commit_message
+                )
             was_successful = self._process_single_group(
-                group_name, files, cached_messages
+                group_name, files, commit_message
             )
             if was_successful:
                 successful_groups.append(group_name)
@@ -366,34 +1232,196 @@ class CommitGenerator:
                 failed_groups.append(group_name)
         return successful_groups, failed_groups
 
+    def _collect_file_diffs(self, files: list[str]) -> dict[str, str]:
+        """Computes the diff of every changed file from a single working-tree diff and shapes it for the prompt. As a side effect, `self.file_stats` holds the numstat counts used by size-aware grouping.
+
+        The index is not touched; files are only staged later when a group is actually committed.
+
+        Args:
+            files (list[str]): The changed file paths.
+
+        Returns:
+            dict[str, str]: A dictionary mapping each file path to its shaped diff section.
+        """
+        return self._shape_file_diffs(self._get_diff_for_files(files))
+
+    @staticmethod
+    def _build_group_diffs(
+        grouped_files: dict, file_diffs: dict[str, str]
+    ) -> dict[str, str]:
+        """Joins the per-file diff sections of each group into the group's diff text, in path order.
+
+        The order must not depend on how the files were listed (`git status` puts untracked files last), because the text is hashed into the message cache key and the prepare-commit-msg hook builds the same text from the staged diff.
+
+        Args:
+            grouped_files (dict): A dictionary mapping group names to the list of files in each group.
+            file_diffs (dict[str, str]): The shaped diff section of each file.
+
+        Returns:
+            dict[str, str]: A dictionary mapping each group name to its diff text (possibly empty).
+        """
+        return {
+            group_name: "".join(file_diffs.get(f, "") for f in sorted(files))
+            for group_name, files in grouped_files.items()
+        }
+
+    def prefetch_messages(self) -> int:
+        """Generates and caches commit messages for the current working-tree changes without staging or committing anything. Groups whose diff already has a cached message are skipped, so calling this repeatedly only pays for groups that actually changed. A later `run` with the same options then finds every message in the cache.
+
+        Returns:
+            int: The number of groups for which a new message was requested.
+        """
+        files = self._get_changed_files()
+        if not files:
+            return 0
+        file_diffs = self._collect_file_diffs(files)
+        grouped_files = self._group_changed_files(files)
+        group_diffs = self._build_group_diffs(grouped_files, file_diffs)
+        pending = {
+            group_name: diff
+            for group_name, diff in group_diffs.items()
+            if diff.strip() and self.message_cache.get(self._cache_key(diff)) is None
+        }
+        if pending:
+            self._generate_messages_concurrently(pending, grouped_files)
+        return len(pending)
+
+    def _estimate_generation_costs(
+        self, pending: dict[str, str], grouped_files: dict | None = None
+    ) -> dict[str, int]:
+        """Estimates the cost of generating each pending group's message from its numstat line counts and prompt size. Groups whose message is already cached cost nothing.
+
+        Args:
+            pending (dict[str, str]): A dictionary mapping group names to their non-empty diff text.
+            grouped_files (dict | None): The files of each group; without it, costs are based on the prompt size only.
+
+        Returns:
+            dict[str, int]: The estimated cost of each group, in prompt-byte equivalents.
+        """
+        grouped_files = grouped_files or {}
+        costs = {}
+        for group_name, diff in pending.items():
+            if not self.force_rebuild and self.message_cache.get(self._cache_key(diff)):
+                costs[group_name] = 0
+                continue
+            costs[group_name] = estimate_group_cost(
+                grouped_files.get(group_name, []),
+                self.file_stats,
+                len(diff.encode("utf-8")),
+            )
+        return costs
+
+    def _generate_messages_concurrently(
+        self, group_diffs: dict[str, str], grouped_files: dict | None = None
+    ) -> dict[str, str]:
+        """Requests commit messages for all groups with a non-empty diff using a thread pool of `self.jobs` workers.
+
+        Groups are dispatched longest-processing-time first: each group's cost is estimated from its `git diff --numstat` line counts and prompt size, and the most expensive groups are submitted first so that a large diff never starts last and dominates the run. This only changes the order of the AI requests; groups are still committed in their original order. The predicted makespan (scaled by the observed seconds per cost unit) is logged next to the actual one, together with the prediction for the original order. A failure for one group is logged and recorded as an empty message so that the remaining groups are still generated.
+
+        Args:
+            group_diffs (dict[str, str]): A dictionary mapping group names to their diff text.
+            grouped_files (dict | None): The files of each group, used for the numstat part of the cost estimate.
+
+        Returns:
+            dict[str, str]: A dictionary mapping group names to their generated (or cached) commit message.
+        """
+        messages = {}
+        pending = {name: diff for name, diff in group_diffs.items() if diff.strip()}
+        costs = self._estimate_generation_costs(pending, grouped_files)
+        order = longest_first(costs)
+        self.logger.info(
+            f"Requesting {len(pending)} commit message(s) with {self.jobs} parallel job(s), largest first."
+        )
+        durations: dict[str, float] = {}
+
+        def generate(group_name: str) -> str:
+            started = time.perf_counter()
+            try:
+                return self._get_commit_message(group_name, pending[group_name])
+            finally:
+                durations[group_name] = time.perf_counter() - started
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=self.jobs) as executor:
+            futures = {
+                executor.submit(generate, group_name): group_name
+                for group_name in order
+            }
+            for future in as_completed(futures):
+                group_name = futures[future]
+                try:
+                    messages[group_name] = future.result()
+                except Exception as e:
+                    self.logger.error(
+                        f"Failed to generate commit message for '{group_name}': {e}"
+                    )
+                    messages[group_name] = ""
+        self._report_schedule(costs, order, durations, time.perf_counter() - started)
+        return messages
+
+    def _report_schedule(
+        self,
+        costs: dict[str, int],
+        order: list[str],
+        durations: dict[str, float],
+        actual_makespan: float,
+    ):
+        """Logs the predicted and actual makespan of a concurrent generation so the scheduler can be checked.
+
+        The cost estimates are converted to seconds with the rate observed in this run (total request time divided by total estimated cost), so the prediction checks the relative costs and the dispatch order rather than absolute latency.
+
+        Args:
+            costs (dict[str, int]): The estimated cost of each group.
+            order (list[str]): The dispatch order that was used.
+            durations (dict[str, float]): The measured generation time of each group, in seconds.
+            actual_makespan (float): The measured wall time of the whole generation, in seconds.
+
+        Returns:
+            None
+        """
+        total_cost = sum(costs.values())
+        if not total_cost:
+            return
+        seconds_per_cost = sum(durations.values()) / total_cost
+        predicted = predict_makespan((costs[n] for n in order), self.jobs)
+        unordered = predict_makespan(costs.values(), self.jobs)
+        self.logger.info(
+            f"[SCHEDULE] Makespan predicted {predicted * seconds_per_cost:.2f}s "
+            f"(original order: {unordered * seconds_per_cost:.2f}s), "
+            f"actual {actual_makespan:.2f}s."
+        )
+
     def _process_single_group(
-        self, group_name: str, files: list, cached_messages: dict
+        self, group_name: str, files: list, commit_message: str
     ) -> bool:
-        """Performs processing on a single group of files, handling diff detection, commit message creation, and staging or resetting changes as needed.
+        """Performs the final step for a single group of files: records the message in dry-run mode, or stages the group's files and commits them.
 
         Args:
         - group_name (str): The name of the group being processed.
         - files (list): A list of file paths to be processed.
-        - cached_messages (dict): A dictionary of cached messages used for commit message generation.
+        - commit_message (str): The commit message generated for the group.
 
         Returns:
-        - bool: True if the processing was successful and the changes were staged or reset; False if the commit message was empty and the group was skipped.
+        - bool: True if the group was committed (or recorded in dry-run mode); False if the commit message was empty and the group was skipped.
         """
-        self._stage_changes(files)
-        diff = self._get_diff_for_files(files)
-        if not diff.strip():
-            self.logger.info(f"[SKIP] No diff for group {group_name}. Unstaging.")
-            self._run_git_command(["git", "reset", "HEAD", "--", *files])
-            return True
-        commit_message = self._get_commit_message(group_name, diff, cached_messages)
         if not commit_message:
             self.logger.error(f"Skipping group '{group_name}' due to empty message.")
             return False
         if self.dry_run:
             self._write_dry_run_entry(group_name, commit_message)
-            self._run_git_command(["git", "reset", "HEAD", "--", *files])
         else:
-            self._commit_changes(commit_message)
+            self.journal.record_staged(
+                group_name, files, private="GIT_INDEX_FILE" in self.git_env
+            )
+            with self.timer.phase("stage", group_name):
+                self._stage_changes(files)
+            with self.timer.phase("commit", group_name):
+                self._commit_changes(commit_message)
+            self.committed_files.extend(files)
+            self.journal.record_committed(
+                group_name,
+                self._run_git_command(["git", "rev-parse", "HEAD"], ignore_errors=True),
+            )
         return True
 
     def _finalize_run(self, failed_groups: list):
@@ -449,4 +1477,9 @@ def run_commit_group_all(**kwargs):
         logger.error(f"FATAL: The commit process failed: {e}", exc_info=True)
 
 
-__all__ = ["run_commit_group_all"]
+__all__ = [
+    "DEFAULT_MAX_PROMPT_BYTES",
+    "DEFAULT_MODEL",
+    "DEFAULT_PROVIDER",
+    "run_commit_group_all",
+]
@@ -0,0 +1,345 @@
+# Copyright 2025 Andy Vandaric
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+# File: avcmt/modules/commit_hook.py
+# Description: prepare-commit-msg hook that fills the message from the commit message cache.
+
+import logging
+import shlex
+import subprocess
+import sys
+import threading
+from pathlib import Path
+
+from avcmt.modules.commit_generator import (
+    DEFAULT_MODEL,
+    DEFAULT_PROVIDER,
+    CommitError,
+    CommitGenerator,
+)
+from avcmt.modules.diff_shaper import DEFAULT_MAX_FILE_BYTES, parse_numstat
+from avcmt.modules.diff_utils import DIFF_OUTPUT_OPTIONS, split_diff_by_file
+from avcmt.modules.grouping import ROOT_GROUP, group_by_directory
+
+HOOK_NAME = "prepare-commit-msg"
+HOOK_MARKER = "# Installed by avcmt: prepare-commit-msg"
+BACKUP_SUFFIX = ".avcmt-backup"
+DEFAULT_HOOK_TIMEOUT = 3.0
+ON_MISS_CHOICES = ("empty", "query")
+
+# Message sources (second hook argument) for which git already has a message that must be kept.
+_KEEP_MESSAGE_SOURCES = frozenset({"message", "template", "merge", "squash", "commit"})
+
+
+class HookError(Exception):
+    """Custom exception indicating that the hook could not be installed or removed.
+
+    Args:
+        message (str): A descriptive message explaining the reason for the exception.
+    """
+
+
+def _hooks_dir() -> Path:
+    """Returns the directory git runs hooks from, honouring `core.hooksPath`.
+
+    Returns:
+        Path: The hooks directory of the current repository.
+
+    Raises:
+        HookError: If the current directory is not inside a git repository.
+    """
+    result = subprocess.run(
+        ["git", "rev-parse", "--git-path", "hooks"],
+        capture_output=True,
+        text=True,
+        encoding="utf-8",
+        check=False,
+    )
+    if result.returncode != 0:
+        raise HookError("Not inside a git repository.")
+    return Path(result.stdout.strip())
+
+
+def _hook_script(
+    on_miss: str,
+    timeout: float,
+    provider: str,
+    model: str,
+    max_file_diff_bytes: int,
+) -> str:
+    """Renders the shell script of the hook. The script calls the current Python interpreter so the hook works without `avcmt` on PATH, and never fails the commit. It runs the hook command group directly, so the other command groups are never imported.
+
+    Args:
+        on_miss (str): What to do when the message is not cached ("empty" or "query").
+        timeout (float): Seconds to wait for the AI when `on_miss` is "query".
+        provider (str): The AI provider of the cache key.
+        model (str): The model of the cache key.
+        max_file_diff_bytes (int): The per-file diff budget the staged diff is shaped with.
+
+    Returns:
+        str: The hook script.
+    """
+    command = shlex.join(
+        [
+            sys.executable,
+            "-m",
+            "avcmt.cli.hook",
+            "run",
+            "--on-miss",
+            on_miss,
+            "--timeout",
+            str(timeout),
+            "--provider",
+            provider,
+            "--model",
+            model,
+            "--max-file-diff-bytes",
+            str(max_file_diff_bytes),
+        ]
+    )
+    return f'#!/bin/sh\n{HOOK_MARKER}\n{command} "$@" || true\n'
+
+
+def install_hook(
+    on_miss: str = "empty",
+    timeout: float = DEFAULT_HOOK_TIMEOUT,
+    force: bool = False,
+    provider: str = DEFAULT_PROVIDER,
+    model: str = DEFAULT_MODEL,
+    max_file_diff_bytes: int = DEFAULT_MAX_FILE_BYTES,
+) -> Path:
+    """Installs the prepare-commit-msg hook into the current repository. An existing hook that was not installed by avcmt is only replaced when `force` is set, and is then kept next to it with a ".avcmt-backup" suffix.
+
+    The provider, model and per-file diff budget are recorded in the hook; they must match those of `commit run` and `commit watch` for the hook to find their cached messages.
+
+    Args:
+        on_miss (str): What to do when the message is not cached ("empty" or "query").
+        timeout (float): Seconds to wait for the AI when `on_miss` is "query".
+        force (bool): If True, replaces a foreign hook after backing it up.
+        provider (str): The AI provider the messages are cached and generated for.
+        model (str): The model the messages are cached and generated for.
+        max_file_diff_bytes (int): Per-file byte budget the staged diff is shaped with.
+
+    Returns:
+        Path: The path of the installed hook.
+
+    Raises:
+        HookError: If `on_miss` is invalid, the repository cannot be found, or a foreign hook exists and `force` is False.
+    """
+    if on_miss not in ON_MISS_CHOICES:
+        raise HookError(
+            f"Invalid --on-miss value '{on_miss}'. Choose from: {', '.join(ON_MISS_CHOICES)}."
+        )
+    hook_path = _hooks_dir() / HOOK_NAME
+    if hook_path.exists() and HOOK_MARKER not in hook_path.read_text(
+        encoding="utf-8", errors="replace"
+    ):
+        if not force:
+            raise HookError(
+                f"A {HOOK_NAME} hook already exists at {hook_path}. Use --force to replace it."
+            )
+        hook_path.replace(hook_path.with_name(HOOK_NAME + BACKUP_SUFFIX))
+    hook_path.parent.mkdir(parents=True, exist_ok=True)
+    hook_path.write_text(
+        _hook_script(on_miss, timeout, provider, model, max_file_diff_bytes),
+        encoding="utf-8",
+    )
+    hook_path.chmod(0o755)
+    return hook_path
+
+
+def uninstall_hook() -> bool:
+    """Removes the prepare-commit-msg hook if it was installed by avcmt, restoring a backed-up hook if there is one.
+
+    Returns:
+        bool: True if the hook was removed, False if no avcmt hook was found.
+    """
+    hook_path = _hooks_dir() / HOOK_NAME
+    if not hook_path.exists() or HOOK_MARKER not in hook_path.read_text(
+        encoding="utf-8", errors="replace"
+    ):
+        return False
+    hook_path.unlink()
+    backup_path = hook_path.with_name(HOOK_NAME + BACKUP_SUFFIX)
+    if backup_path.exists():
+        backup_path.replace(hook_path)
+    return True
+
+
+class PrepareCommitMessage:
+    """Produces a commit message for the staged changes of a plain `git commit`.
+
+    The staged diff is shaped exactly like a group diff in `avcmt commit run`, so its hash matches the commit message cache whenever the staged changes equal a group that `commit run --dry-run` or `commit watch` has already seen. On a cache miss the AI is either queried with a strict timeout or skipped.
+
+    Args:
+        on_miss (str): What to do when the message is not cached ("empty" or "query").
+        timeout (float): Seconds to wait for the AI when `on_miss` is "query".
+        **generator_options: Options passed to the `CommitGenerator` used for diff shaping, caching and prompting.
+    """
+
+    def __init__(
+        self,
+        on_miss: str = "empty",
+        timeout: float = DEFAULT_HOOK_TIMEOUT,
+        **generator_options,
+    ):
+        """Initializes the hook with its miss policy and a quiet generator.
+
+        Args:
+            on_miss (str): What to do when the message is not cached.
+            timeout (float): Seconds to wait for the AI on a miss.
+            **generator_options: Keyword arguments for `CommitGenerator`.
+
+        Returns:
+            None
+        """
+        self.on_miss = on_miss
+        self.timeout = timeout
+        logger = logging.getLogger("avcmt.hook")
+        if not logger.handlers:
+            logger.addHandler(logging.NullHandler())
+        self.generator = CommitGenerator(logger=logger, **generator_options)
+
+    def _staged_files_and_diff(self) -> tuple[list[str], str]:
+        """Returns the staged files and their shaped diff against HEAD.
+
+        Returns:
+            tuple[list[str], str]: The staged file paths and the shaped diff text.
+        """
+        git = self.generator._run_git_command
+        self.generator.file_stats = parse_numstat(
+            git(["git", "diff", "--cached", "--numstat", "-z", "--no-renames"])
+        )
+        diff_text = git(
+            [
+                "git",
+                "-c",
+                "core.quotePath=false",
+                "--no-pager",
+                "diff",
+                "--cached",
+                "--no-color",
+                "--no-renames",
+                *DIFF_OUTPUT_OPTIONS,
+            ]
+        )
+        files = sorted(self.generator.file_stats)
+        file_diffs = self.generator._shape_file_diffs(split_diff_by_file(diff_text))
+        # Same path order as `CommitGenerator._build_group_diffs`, so the cache keys match.
+        return files, "".join(file_diffs.get(f, "") for f in files)
+
+    @staticmethod
+    def _group_name(files: list[str]) -> str:
+        """Names the staged changes like `commit run` would name their group, falling back to "root" when they span several directories."""
+        groups = group_by_directory(files)
+        return next(iter(groups)) if len(groups) == 1 else ROOT_GROUP
+
+    def _query_with_timeout(self, group_name: str, diff: str) -> str:
+        """Generates a message in a daemon thread and gives up after `timeout` seconds; an abandoned request cannot delay the commit because the thread dies with the hook process.
+
+        Args:
+            group_name (str): The group name used in the prompt.
+            diff (str): The shaped staged diff.
+
+        Returns:
+            str: The generated message, or an empty string on timeout or error.
+        """
+        result: dict[str, str] = {}
+
+        def worker():
+            try:
+                result["message"] = self.generator._get_commit_message(group_name, diff)
+            except Exception as e:
+                result["error"] = str(e)
+
+        thread = threading.Thread(target=worker, daemon=True)
+        thread.start()
+        thread.join(self.timeout)
+        return result.get("message", "")
+
+    def generate(self) -> str:
+        """Returns the message for the staged changes: from the cache if possible, otherwise according to `on_miss`.
+
+        Returns:
+            str: The commit message, or an empty string if none is available.
+        """
+        files, diff = self._staged_files_and_diff()
+        if not diff.strip():
+            return ""
+        cached_message = self.generator.message_cache.get(
+            self.generator._cache_key(diff)
+        )
+        if cached_message:
+            return cached_message
+        if self.on_miss != "query":
+            return ""
+        return self._query_with_timeout(self._group_name(files), diff)
+
+    def run(self, message_file: str | Path, source: str | None = None) -> bool:
+        """Performs the hook: prepends the generated message to the message file unless git already provides a message (e.g. `-m`, merges, amends).
+
+        Args:
+            message_file (str | Path): The path of the commit message file passed by git.
+            source (str | None): The message source passed by git, if any.
+
+        Returns:
+            bool: True if a message was written, False otherwise.
+        """
+        if source in _KEEP_MESSAGE_SOURCES:
+            return False
+        message = self.generate()
+        if not message:
+            return False
+        path = Path(message_file)
+        existing = path.read_text(encoding="utf-8") if path.exists() else ""
+        path.write_text(f"{message}\n{existing}", encoding="utf-8")
+        return True
+
+
+def run_prepare_commit_msg(
+    message_file: str,
+    source: str | None = None,
+    on_miss: str = "empty",
+    timeout: float = DEFAULT_HOOK_TIMEOUT,
+    **kwargs,
+) -> bool:
+    """Runs the prepare-commit-msg hook; any failure leaves the message untouched so the commit is never blocked.
+
+    Args:
+        message_file (str): The path of the commit message file passed by git.
+        source (str | None): The message source passed by git, if any.
+        on_miss (str): What to do when the message is not cached ("empty" or "query").
+        timeout (float): Seconds to wait for the AI when `on_miss` is "query".
+        **kwargs: Additional keyword arguments passed to the CommitGenerator.
+
+    Returns:
+        bool: True if a message was written, False otherwise.
+    """
+    try:
+        return PrepareCommitMessage(on_miss=on_miss, timeout=timeout, **kwargs).run(
+            message_file, source
+        )
+    except (CommitError, OSError) as e:
+        logging.getLogger("avcmt.hook").warning(f"avcmt hook skipped: {e}")
+        return False
+
+
+__all__ = [
+    "DEFAULT_HOOK_TIMEOUT",
+    "HookError",
+    "PrepareCommitMessage",
+    "install_hook",
+    "run_prepare_commit_msg",
+    "uninstall_hook",
+]
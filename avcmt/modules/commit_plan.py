@@ -0,0 +1,278 @@
+# Copyright 2025 Andy Vandaric
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+# File: avcmt/modules/commit_plan.py
+# Description: Plans a commit run (groups, prompt sizes, AI calls, wall time) without touching the index or the network.
+
+import logging
+from dataclasses import dataclass, field
+
+from avcmt.modules.commit_generator import CommitGenerator
+from avcmt.modules.scheduling import longest_first, predict_makespan
+
+# Rough number of prompt bytes per token for the estimate shown to the user.
+BYTES_PER_TOKEN = 4
+# Assumed size of one chunk summary when estimating the merge request of a map-reduce group.
+ESTIMATED_SUMMARY_BYTES = 400
+
+
+@dataclass
+class PlannedGroup:
+    """The plan for one commit group.
+
+    Args:
+        name (str): The group name.
+        files (dict[str, tuple]): The numstat (added, deleted) counts of each file; None counts mark binary files.
+        prompt_bytes (int): The total size of all prompts the group needs.
+        cached (bool): True if a message for the exact diff is already cached.
+        heuristic (bool): True if the change is trivial and gets a rule-based message without an AI call.
+        ai_calls (int): The number of AI requests the group needs (0 when cached or heuristic).
+        seconds (float): The estimated AI time of the group.
+    """
+
+    name: str
+    files: dict[str, tuple[int | None, int | None]] = field(default_factory=dict)
+    prompt_bytes: int = 0
+    cached: bool = False
+    heuristic: bool = False
+    ai_calls: int = 0
+    seconds: float = 0.0
+
+    @property
+    def tokens(self) -> int:
+        """The estimated prompt tokens of the group."""
+        return self.prompt_bytes // BYTES_PER_TOKEN
+
+
+@dataclass
+class CommitPlan:
+    """The plan of a commit run and its estimated cost.
+
+    Args:
+        groups (list[PlannedGroup]): The planned groups in commit order.
+        jobs (int): The number of concurrent AI requests the estimate assumes.
+        latency_samples (int): The number of historical requests the latency estimate is based on.
+        wall_seconds (float): The estimated AI wall time of the run with `jobs` workers.
+    """
+
+    groups: list[PlannedGroup]
+    jobs: int = 1
+    latency_samples: int = 0
+    wall_seconds: float = 0.0
+
+    @property
+    def ai_calls(self) -> int:
+        """The predicted number of AI requests of the run."""
+        return sum(group.ai_calls for group in self.groups)
+
+    @property
+    def tokens(self) -> int:
+        """The estimated prompt tokens of all groups sent to the AI."""
+        return sum(group.tokens for group in self.groups if group.ai_calls)
+
+    def to_dict(self) -> dict:
+        """Returns the plan as a JSON-serializable dictionary."""
+        return {
+            "groups": [
+                {
+                    "name": group.name,
+                    "files": {
+                        path: {"added": added, "deleted": deleted}
+                        for path, (added, deleted) in group.files.items()
+                    },
+                    "prompt_bytes": group.prompt_bytes,
+                    "tokens": group.tokens,
+                    "cached": group.cached,
+                    "heuristic": group.heuristic,
+                    "ai_calls": group.ai_calls,
+                    "seconds": round(group.seconds, 2),
+                }
+                for group in self.groups
+            ],
+            "jobs": self.jobs,
+            "ai_calls": self.ai_calls,
+            "tokens": self.tokens,
+            "latency_samples": self.latency_samples,
+            "wall_seconds": round(self.wall_seconds, 2),
+        }
+
+    def format(self) -> str:
+        """Renders the plan as plain text: one block per group followed by the totals.
+
+        Returns:
+            str: The plan text.
+        """
+        lines = []
+        for group in self.groups:
+            if group.cached:
+                state = "cached"
+            elif group.heuristic:
+                state = "heuristic"
+            else:
+                state = f"{group.ai_calls} AI call(s)"
+            lines.append(
+                f"{group.name}  [{len(group.files)} file(s), ~{group.tokens} tokens, {state}, ~{group.seconds:.1f}s]"
+            )
+            for path, (added, deleted) in group.files.items():
+                counts = "binary" if added is None else f"+{added} -{deleted}"
+                lines.append(f"    {counts:>14}  {path}")
+        cached = sum(group.cached for group in self.groups)
+        heuristic = sum(group.heuristic for group in self.groups)
+        basis = (
+            f"{self.latency_samples} past request(s)"
+            if self.latency_samples
+            else "no history, default latency"
+        )
+        lines.extend(
+            [
+                "",
+                f"{len(self.groups)} group(s), {cached} cached, {heuristic} heuristic, {self.ai_calls} AI call(s), ~{self.tokens} prompt tokens.",
+                f"Estimated AI wall time with {self.jobs} job(s): ~{self.wall_seconds:.1f}s (based on {basis}).",
+            ]
+        )
+        return "\n".join(lines)
+
+
+class CommitPlanner:
+    """Computes the plan of a `commit run` with the same options, without running it.
+
+    The working tree is scanned and diffed exactly as a run would do, but git is told not to take optional locks (`GIT_OPTIONAL_LOCKS=0`), so not even the stat refresh of `git status` writes the user's index, and the remote is never contacted. Prompts are rendered to measure their size and looked up in the message cache; the AI time is estimated from the latency history of the configured model and the longest-first schedule of the concurrent run.
+
+    Args:
+        **generator_options: The options of the run to plan, as accepted by `CommitGenerator`.
+    """
+
+    def __init__(self, **generator_options):
+        """Initializes the planner with a quiet, offline dry-run generator.
+
+        Args:
+            **generator_options: Keyword arguments for `CommitGenerator`.
+
+        Returns:
+            None
+        """
+        if generator_options.get("logger") is None:
+            logger = logging.getLogger("avcmt.plan")
+            if not logger.handlers:
+                logger.addHandler(logging.NullHandler())
+            # The plan is the output; keep the run's progress messages out of it.
+            logger.propagate = False
+            generator_options["logger"] = logger
+        generator_options.update(dry_run=True, offline=True)
+        self.generator = CommitGenerator(**generator_options)
+
+    def _estimate(self, prompt_bytes: int) -> float:
+        """Returns the estimated duration of one request of the given size."""
+        return self.generator.latency_history.estimate(
+            self.generator.model_id, prompt_bytes
+        )
+
+    def _plan_group(self, group_name: str, files: list[str], diff: str) -> PlannedGroup:
+        """Plans one group: its prompt sizes, cache state, AI calls and AI time. Like a run, a group that is not cached but is a trivial change gets a heuristic message when `heuristic_for_trivial` is set, and needs no AI call.
+
+        Args:
+            group_name (str): The group name.
+            files (list[str]): The files of the group.
+            diff (str): The shaped diff of the group.
+
+        Returns:
+            PlannedGroup: The plan of the group.
+        """
+        generator = self.generator
+        group = PlannedGroup(
+            name=group_name,
+            files={f: generator.file_stats.get(f, (None, None)) for f in files},
+        )
+        if not diff.strip():
+            return group
+        group.cached = (
+            not generator.force_rebuild
+            and generator.message_cache.get(generator._cache_key(diff)) is not None
+        )
+        group.heuristic = (
+            not group.cached
+            and generator.heuristic_for_trivial
+            and generator.heuristic.trivial_message(group_name, diff) is not None
+        )
+        if group.heuristic:
+            return group
+        prompt_bytes = len(
+            generator._render_commit_prompt(group_name, diff).encode("utf-8")
+        )
+        if not generator.max_prompt_bytes or prompt_bytes <= generator.max_prompt_bytes:
+            group.prompt_bytes = prompt_bytes
+            group.ai_calls = 0 if group.cached else 1
+            group.seconds = 0.0 if group.cached else self._estimate(prompt_bytes)
+            return group
+        chunk_sizes = [
+            len(prompt.encode("utf-8"))
+            for prompt in generator._render_chunk_prompts(group_name, diff)
+        ]
+        merge_bytes = ESTIMATED_SUMMARY_BYTES * len(chunk_sizes)
+        group.prompt_bytes = sum(chunk_sizes) + merge_bytes
+        if not group.cached:
+            group.ai_calls = len(chunk_sizes) + 1
+            workers = min(len(chunk_sizes), max(generator.jobs, generator.MAP_JOBS))
+            group.seconds = predict_makespan(
+                (self._estimate(size) for size in chunk_sizes), workers
+            ) + self._estimate(merge_bytes)
+        return group
+
+    def plan(self) -> CommitPlan:
+        """Scans, diffs and groups the changes like a run and estimates its cost.
+
+        Returns:
+            CommitPlan: The plan; it has no groups when there is nothing to commit.
+        """
+        generator = self.generator
+        files = generator._get_changed_files()
+        plan = CommitPlan(
+            groups=[],
+            jobs=generator.jobs,
+            latency_samples=generator.latency_history.sample_count(generator.model_id),
+        )
+        if not files:
+            return plan
+        file_diffs = generator._collect_file_diffs(files)
+        grouped_files = generator._group_changed_files(files)
+        group_diffs = generator._build_group_diffs(grouped_files, file_diffs)
+        plan.groups = [
+            self._plan_group(name, group_files, group_diffs[name])
+            for name, group_files in grouped_files.items()
+        ]
+        seconds = {group.name: group.seconds for group in plan.groups}
+        plan.wall_seconds = predict_makespan(
+            (seconds[name] for name in longest_first(seconds)), generator.jobs
+        )
+        return plan
+
+
+def plan_commit_run(**generator_options) -> CommitPlan:
+    """Plans a commit run with the given options without touching the index or the network.
+
+    Args:
+        **generator_options: The options of the run to plan, as accepted by `CommitGenerator`.
+
+    Returns:
+        CommitPlan: The planned groups and the estimated cost of the run.
+    """
+    return CommitPlanner(**generator_options).plan()
+
+
+__all__ = [
+    "CommitPlan",
+    "CommitPlanner",
+    "PlannedGroup",
+    "plan_commit_run",
+]
@@ -0,0 +1,241 @@
+# Copyright 2025 Andy Vandaric
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+# File: avcmt/modules/commit_watcher.py
+# Description: Polls the working tree and pre-generates commit messages into the commit cache.
+
+import logging
+import os
+import subprocess
+import time
+from pathlib import Path
+from typing import Any
+
+from avcmt.modules.commit_generator import CommitError, CommitGenerator
+from avcmt.utils import setup_logging
+
+DEFAULT_POLL_INTERVAL = 2.0
+DEFAULT_DEBOUNCE = 5.0
+
+# Directories that never contribute to a commit diff and are expensive to scan.
+SCAN_SKIP_DIRS = frozenset(
+    {".git", "log", "__pycache__", "node_modules", ".venv", "venv", ".mypy_cache"}
+)
+
+
+class CommitWatcher:
+    """Watches the working tree and keeps the commit message cache warm, so that a later `avcmt commit run` finds every message already generated.
+
+    Polling is deliberately cheap: each tick stats the index and HEAD and walks the working tree comparing modification times, without running git. Once a change has settled for `debounce` seconds, the watcher asks a `CommitGenerator` to prefetch messages; only groups whose diff hash is not cached yet are sent to the AI.
+
+    Args:
+        interval (float): Seconds between two polls (default is 2.0).
+        debounce (float): Seconds the tree must stay unchanged before messages are regenerated (default is 5.0).
+        logger (Any or None): Logger instance; defaults to the commit log if None.
+        **generator_options: Options passed to `CommitGenerator`; they must match those of the later `commit run` for the cache keys to line up.
+    """
+
+    def __init__(
+        self,
+        interval: float = DEFAULT_POLL_INTERVAL,
+        debounce: float = DEFAULT_DEBOUNCE,
+        logger: Any | None = None,
+        **generator_options,
+    ):
+        """Initializes the watcher and the generator used to prefetch messages.
+
+        Args:
+            interval (float): Seconds between two polls.
+            debounce (float): Seconds a change must settle before regeneration.
+            logger (Any | None): Logger object for recording logs; if None, a default logger is set up.
+            **generator_options: Keyword arguments for `CommitGenerator`.
+
+        Returns:
+            None
+        """
+        self.interval = interval
+        self.debounce = debounce
+        self.logger = logger or setup_logging("log/commit.log")
+        self.generator = CommitGenerator(logger=self.logger, **generator_options)
+        # Prefetching never commits, so it must not write the user's index either.
+        self.generator.git_env["GIT_OPTIONAL_LOCKS"] = "0"
+        self.root = self.generator.repo_path
+        self.index_path = self.root / self._git_output(
+            ["git", "rev-parse", "--git-path", "index"]
+        )
+        self.head_path = self.root / self._git_output(
+            ["git", "rev-parse", "--git-path", "HEAD"]
+        )
+
+    def _git_output(self, command: list[str]) -> str:
+        """Runs a git command at the top level of the repository and returns its stripped output, or an empty string on failure."""
+        result = subprocess.run(
+            command,
+            capture_output=True,
+            text=True,
+            encoding="utf-8",
+            check=False,
+            cwd=self.root,
+        )
+        return result.stdout.strip() if result.returncode == 0 else ""
+
+    @staticmethod
+    def _stat_signature(path: Path) -> tuple[int, int]:
+        """Returns the (mtime_ns, size) of a file, or (0, 0) when it does not exist."""
+        try:
+            stat = path.stat()
+        except OSError:
+            return (0, 0)
+        return (stat.st_mtime_ns, stat.st_size)
+
+    @staticmethod
+    def _scan_directory(path: str, stack: list[str]) -> list[int]:
+        """Stats the entries of one directory, pushing its subdirectories (except `SCAN_SKIP_DIRS`) onto `stack`.
+
+        Args:
+            path (str): The directory to scan.
+            stack (list[str]): The directories still to be scanned.
+
+        Returns:
+            list[int]: The mtime_ns of every entry in the directory.
+        """
+        try:
+            with os.scandir(path) as scanner:
+                entries = [
+                    entry
+                    for entry in scanner
+                    if not (
+                        entry.name in SCAN_SKIP_DIRS
+                        and entry.is_dir(follow_symlinks=False)
+                    )
+                ]
+            stack.extend(e.path for e in entries if e.is_dir(follow_symlinks=False))
+            return [e.stat(follow_symlinks=False).st_mtime_ns for e in entries]
+        except OSError:
+            # Entries vanishing mid-scan are picked up on the next poll.
+            return []
+
+    def _scan_tree(self) -> tuple[int, int, int]:
+        """Walks the working tree and summarizes it by entry count, newest modification time and total modification time. Directory entries are included, so deletions and renames are noticed as well.
+
+        Returns:
+            tuple[int, int, int]: The (entry count, newest mtime_ns, sum of mtime_ns) of the tree.
+        """
+        count, newest, total = 0, 0, 0
+        stack = [str(self.root)]
+        while stack:
+            mtimes = self._scan_directory(stack.pop(), stack)
+            if mtimes:
+                count += len(mtimes)
+                newest = max(newest, *mtimes)
+                total += sum(mtimes)
+        return (count, newest, total)
+
+    def fingerprint(self) -> tuple:
+        """Summarizes the state of the index, HEAD and working tree in a comparable value.
+
+        Returns:
+            tuple: A value that changes whenever staged or unstaged content may have changed.
+        """
+        return (
+            self._stat_signature(self.index_path),
+            self._stat_signature(self.head_path),
+            self._scan_tree(),
+        )
+
+    def refresh(self) -> int:
+        """Regenerates messages for all groups whose diff is not cached yet.
+
+        Returns:
+            int: The number of groups for which a new message was requested.
+        """
+        try:
+            requested = self.generator.prefetch_messages()
+        except CommitError as e:
+            self.logger.error(f"Could not prefetch commit messages: {e}")
+            return 0
+        if requested:
+            self.logger.info(f"[WATCH] Cached new message(s) for {requested} group(s).")
+        else:
+            self.logger.info("[WATCH] All commit messages are up to date.")
+        return requested
+
+    def _poll(self, state: dict):
+        """Performs one poll: records a change, or regenerates messages once the last change has settled for `debounce` seconds.
+
+        Args:
+            state (dict): The polling state with the last seen fingerprint ("seen") and the monotonic time of the last unhandled change ("changed_at").
+
+        Returns:
+            None
+        """
+        current = self.fingerprint()
+        if current != state["seen"]:
+            state["seen"], state["changed_at"] = current, time.monotonic()
+            self.logger.debug("[WATCH] Change detected; waiting to settle.")
+            return
+        changed_at = state["changed_at"]
+        if changed_at is not None and time.monotonic() - changed_at >= self.debounce:
+            state["changed_at"] = None
+            self.refresh()
+            state["seen"] = self.fingerprint()
+
+    def watch(self, max_cycles: int | None = None):
+        """Polls until interrupted, regenerating messages after each settled change. The cache is also warmed once on start.
+
+        Args:
+            max_cycles (int | None): Stops after this many polls; None polls forever.
+
+        Returns:
+            None
+        """
+        self.logger.info(
+            f"[WATCH] Watching {self.root} every {self.interval}s (debounce {self.debounce}s). Press Ctrl+C to stop."
+        )
+        self.refresh()
+        # git may rewrite the index while reading it, so take the baseline after refreshing.
+        state = {"seen": self.fingerprint(), "changed_at": None}
+        cycles = 0
+        try:
+            while max_cycles is None or cycles < max_cycles:
+                cycles += 1
+                time.sleep(self.interval)
+                self._poll(state)
+        except KeyboardInterrupt:
+            self.logger.info("[WATCH] Stopped.")
+
+
+def run_commit_watch(
+    interval: float = DEFAULT_POLL_INTERVAL,
+    debounce: float = DEFAULT_DEBOUNCE,
+    **kwargs,
+):
+    """Creates a CommitWatcher and runs it until interrupted; handles exceptions during setup.
+
+    Args:
+        interval (float): Seconds between two polls.
+        debounce (float): Seconds a change must settle before regeneration.
+        **kwargs: Additional keyword arguments passed to the CommitWatcher (and on to the CommitGenerator).
+
+    Returns:
+        None
+    """
+    logger = logging.getLogger("avcmt")
+    try:
+        CommitWatcher(interval=interval, debounce=debounce, **kwargs).watch()
+    except (CommitError, Exception) as e:
+        logger.error(f"FATAL: The commit watcher failed: {e}", exc_info=True)
+
+
+__all__ = ["CommitWatcher", "run_commit_watch"]
@@ -0,0 +1,214 @@
+# Copyright 2025 Andy Vandaric
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+# File: avcmt/modules/diff_shaper.py
+# Description: Shrinks per-file diff sections before they are rendered into AI prompts.
+
+from pathlib import PurePosixPath
+
+LOCKFILE_NAMES = frozenset(
+    {
+        "Cargo.lock",
+        "Gemfile.lock",
+        "Pipfile.lock",
+        "composer.lock",
+        "go.sum",
+        "package-lock.json",
+        "pnpm-lock.yaml",
+        "poetry.lock",
+        "uv.lock",
+        "yarn.lock",
+    }
+)
+GENERATED_SUFFIXES = (".min.js", ".min.css", ".js.map", ".css.map")
+DEFAULT_MAX_FILE_BYTES = 8192
+
+# Lines of a section header that are kept when the content is replaced by a summary. The `index` line
+# keeps the blob ids, so summaries of different contents never look the same.
+_HEADER_PREFIXES = (
+    "diff --git ",
+    "index ",
+    "new file mode",
+    "deleted file mode",
+    "old mode",
+    "new mode",
+)
+
+
+def parse_numstat(output: str) -> dict[str, tuple[int | None, int | None]]:
+    """Parses the output of `git diff --numstat -z --no-renames`.
+
+    Args:
+        output (str): The NUL-delimited numstat output.
+
+    Returns:
+        dict[str, tuple[int | None, int | None]]: A dictionary mapping each path to its (added, deleted) line counts; both are None for binary files.
+    """
+    stats = {}
+    for entry in output.split("\0"):
+        added, _, rest = entry.partition("\t")
+        deleted, separator, path = rest.partition("\t")
+        if not separator:
+            continue
+        if added == "-":
+            stats[path] = (None, None)
+        else:
+            stats[path] = (int(added), int(deleted))
+    return stats
+
+
+def parse_check_attr(output: str) -> dict[str, dict[str, str]]:
+    """Parses the output of `git check-attr -z`.
+
+    Args:
+        output (str): The NUL-delimited `<path> <attribute> <value>` triples.
+
+    Returns:
+        dict[str, dict[str, str]]: A dictionary mapping each path to its attribute values ("set", "unset", "unspecified" or a string value).
+    """
+    fields = output.split("\0")
+    attributes: dict[str, dict[str, str]] = {}
+    for i in range(0, len(fields) - 2, 3):
+        path, name, value = fields[i : i + 3]
+        attributes.setdefault(path, {})[name] = value
+    return attributes
+
+
+def classify_file(
+    path: str,
+    stats: tuple[int | None, int | None] | None,
+    attributes: dict[str, str] | None,
+) -> str | None:
+    """Decides whether a file's diff is noise that should be summarized instead of sent verbatim.
+
+    Args:
+        path (str): The path of the file.
+        stats (tuple | None): The (added, deleted) numstat counts of the file, if known.
+        attributes (dict[str, str] | None): The file's `linguist-generated` and `diff` attributes, if known.
+
+    Returns:
+        str | None: A short reason ("binary", "lockfile", "generated") or None if the diff should be kept.
+    """
+    attributes = attributes or {}
+    name = PurePosixPath(path).name
+    if (stats and stats[0] is None) or attributes.get("diff") == "unset":
+        return "binary"
+    if name in LOCKFILE_NAMES:
+        return "lockfile"
+    if attributes.get("linguist-generated") in {"set", "true"} or name.endswith(
+        GENERATED_SUFFIXES
+    ):
+        return "generated"
+    return None
+
+
+def summarize_section(
+    section: str, path: str, reason: str, stats: tuple[int | None, int | None] | None
+) -> str:
+    """Replaces the content of a diff section with a one-line summary, keeping its header lines so the section can still be attributed to its file.
+
+    Args:
+        section (str): The complete diff section of the file.
+        path (str): The path of the file.
+        reason (str): Why the content is omitted, as returned by `classify_file`.
+        stats (tuple | None): The (added, deleted) numstat counts of the file, if known.
+
+    Returns:
+        str: The shortened diff section.
+    """
+    header = [
+        line for line in section.splitlines() if line.startswith(_HEADER_PREFIXES)
+    ]
+    if stats and stats[0] is not None:
+        change = f"+{stats[0]} -{stats[1]} lines"
+    else:
+        change = "content changed"
+    header.append(f"[{path}: {reason}, {change}, diff omitted]")
+    return "\n".join(header) + "\n"
+
+
+def sample_section(section: str, max_bytes: int) -> str:
+    """Caps the size of a diff section by keeping its header, the first and the last lines of its hunks, and a marker for what was cut in between.
+
+    Args:
+        section (str): The complete diff section of the file.
+        max_bytes (int): The byte budget for the hunk content; 0 disables the cap.
+
+    Returns:
+        str: The section itself if it fits, otherwise the sampled section.
+    """
+    if max_bytes <= 0 or len(section.encode("utf-8")) <= max_bytes:
+        return section
+    lines = section.splitlines(keepends=True)
+    hunk_start = next(
+        (i for i, line in enumerate(lines) if line.startswith("@@")), len(lines)
+    )
+    header, body = lines[:hunk_start], lines[hunk_start:]
+    half_budget = max_bytes // 2
+
+    head, used = [], 0
+    for line in body:
+        used += len(line.encode("utf-8"))
+        if used > half_budget:
+            break
+        head.append(line)
+    tail, used = [], 0
+    for line in reversed(body[len(head) :]):
+        used += len(line.encode("utf-8"))
+        if used > half_budget:
+            break
+        tail.append(line)
+    tail.reverse()
+
+    omitted = len(body) - len(head) - len(tail)
+    marker = f"... [{omitted} diff lines omitted] ...\n"
+    return "".join(header + head + [marker] + tail)
+
+
+def shape_file_diff(
+    path: str,
+    section: str,
+    stats: tuple[int | None, int | None] | None = None,
+    attributes: dict[str, str] | None = None,
+    max_bytes: int = DEFAULT_MAX_FILE_BYTES,
+) -> str:
+    """Shapes the diff section of one file for use in a prompt: noise files are summarized, and everything else is capped to `max_bytes`.
+
+    Args:
+        path (str): The path of the file.
+        section (str): The complete diff section of the file.
+        stats (tuple | None): The (added, deleted) numstat counts of the file, if known.
+        attributes (dict[str, str] | None): The file's git attributes, if known.
+        max_bytes (int): The byte budget per file; 0 disables the cap.
+
+    Returns:
+        str: The shaped diff section.
+    """
+    reason = classify_file(path, stats, attributes)
+    if reason:
+        return summarize_section(section, path, reason, stats)
+    return sample_section(section, max_bytes)
+
+
+__all__ = [
+    "DEFAULT_MAX_FILE_BYTES",
+    "GENERATED_SUFFIXES",
+    "LOCKFILE_NAMES",
+    "classify_file",
+    "parse_check_attr",
+    "parse_numstat",
+    "sample_section",
+    "shape_file_diff",
+    "summarize_section",
+]
@@ -0,0 +1,199 @@
+# Copyright 2025 Andy Vandaric
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+# File: avcmt/modules/diff_utils.py
+# Description: Helpers for splitting a multi-file git diff into per-file sections and size-bounded chunks.
+
+import re
+
+DIFF_HEADER_PREFIX = "diff --git "
+
+# Options that make `git diff` print the standard `a/` and `b/` headers parsed here, whatever the user's
+# configuration says (external diff drivers, `diff.noprefix`, `diff.mnemonicPrefix`), and full blob ids
+# on the `index` lines, so the same change is printed identically by every diff that reads it.
+DIFF_OUTPUT_OPTIONS = [
+    "--no-ext-diff",
+    "--src-prefix=a/",
+    "--dst-prefix=b/",
+    "--full-index",
+]
+
+# The well-known hash of the empty tree, used as the diff base in repositories without commits.
+EMPTY_TREE_HASH = "4b825dc642cb6eb9a060e54bf8d69288fbee4904"
+
+_C_ESCAPES = {
+    "a": 7,
+    "b": 8,
+    "t": 9,
+    "n": 10,
+    "v": 11,
+    "f": 12,
+    "r": 13,
+    '"': 34,
+    "\\": 92,
+}
+_OCTAL_ESCAPE = re.compile(r"[0-7]{3}")
+
+
+def unquote_git_path(path: str) -> str:
+    """Decodes a path that git wrapped in double quotes and C-style escapes (e.g. paths containing tabs, newlines or non-ASCII bytes).
+
+    Args:
+        path (str): The path as printed by git, quoted or not.
+
+    Returns:
+        str: The decoded path; unquoted input is returned unchanged.
+    """
+    if len(path) <= 1 or not (path.startswith('"') and path.endswith('"')):
+        return path
+    body = path[1:-1]
+    decoded = bytearray()
+    i = 0
+    while i < len(body):
+        char = body[i]
+        if char == "\\" and i + 1 < len(body):
+            escaped = body[i + 1]
+            if escaped in _C_ESCAPES:
+                decoded.append(_C_ESCAPES[escaped])
+                i += 2
+                continue
+            octal = _OCTAL_ESCAPE.match(body, i + 1)
+            if octal:
+                decoded.append(int(octal.group(), 8))
+                i += 4
+                continue
+        decoded.extend(char.encode("utf-8"))
+        i += 1
+    return decoded.decode("utf-8", errors="replace")
+
+
+def parse_diff_header_path(header: str) -> str:
+    """Extracts the file path from a `diff --git a/<path> b/<path>` header line.
+
+    The diff is expected to be produced with `--no-renames`, so both sides name the same path. Quoted paths are decoded with `unquote_git_path`.
+
+    Args:
+        header (str): The header line, including the `diff --git ` prefix.
+
+    Returns:
+        str: The path of the file the section belongs to.
+    """
+    rest = header[len(DIFF_HEADER_PREFIX) :].rstrip("\n")
+    if rest.startswith('"'):
+        # Find the closing quote of the first (a/...) token, honouring escapes.
+        i = 1
+        while i < len(rest) and rest[i] != '"':
+            i += 2 if rest[i] == "\\" else 1
+        a_path = unquote_git_path(rest[: i + 1])
+        return a_path[2:]
+    # Both sides are identical: "a/<path> b/<path>".
+    half = (len(rest) - 1) // 2
+    return rest[2:half]
+
+
+def split_diff_by_file(diff_text: str) -> dict[str, str]:
+    """Splits a multi-file unified diff into per-file sections keyed by path.
+
+    Args:
+        diff_text (str): The raw output of a `git diff --no-renames` invocation.
+
+    Returns:
+        dict[str, str]: A dictionary mapping each file path to its complete diff section, in diff order.
+    """
+    sections: dict[str, str] = {}
+    current_path = None
+    current_lines: list[str] = []
+    for line in diff_text.splitlines(keepends=True):
+        if line.startswith(DIFF_HEADER_PREFIX):
+            if current_path is not None:
+                sections[current_path] = "".join(current_lines)
+            current_path = parse_diff_header_path(line)
+            current_lines = []
+        if current_path is not None:
+            current_lines.append(line)
+    if current_path is not None:
+        last_section = "".join(current_lines)
+        # Keep the last section newline-terminated even when the output was stripped.
+        sections[current_path] = (
+            last_section if last_section.endswith("\n") else last_section + "\n"
+        )
+    return sections
+
+
+def _split_section_by_size(section: str, max_bytes: int) -> list[str]:
+    """Splits one file's diff section into pieces of at most `max_bytes`, cutting between hunks where possible and between lines otherwise. Every piece repeats the section header so it stays attributable to its file.
+
+    Args:
+        section (str): The complete diff section of one file.
+        max_bytes (int): The maximum size of a piece in bytes.
+
+    Returns:
+        list[str]: The pieces of the section.
+    """
+    if len(section.encode("utf-8")) <= max_bytes:
+        return [section]
+    lines = section.splitlines(keepends=True)
+    hunk_start = next(
+        (i for i, line in enumerate(lines) if line.startswith("@@")), len(lines)
+    )
+    header = "".join(lines[:hunk_start])
+    budget = max(max_bytes - len(header.encode("utf-8")), 1)
+
+    pieces, current, current_size = [], [], 0
+    for line in lines[hunk_start:]:
+        line_size = len(line.encode("utf-8"))
+        # Prefer to cut at hunk boundaries once the piece is half full.
+        at_hunk = line.startswith("@@") and current_size > budget // 2
+        if current and (current_size + line_size > budget or at_hunk):
+            pieces.append(header + "".join(current))
+            current, current_size = [], 0
+        current.append(line)
+        current_size += line_size
+    if current or not pieces:
+        pieces.append(header + "".join(current))
+    return pieces
+
+
+def chunk_diff(diff_text: str, max_bytes: int) -> list[str]:
+    """Packs a multi-file diff into chunks of at most roughly `max_bytes`, keeping whole files together where they fit and splitting larger files by hunk.
+
+    Args:
+        diff_text (str): The diff to split.
+        max_bytes (int): The target maximum size of a chunk in bytes.
+
+    Returns:
+        list[str]: The chunks, in diff order.
+    """
+    chunks, current, current_size = [], [], 0
+    for section in split_diff_by_file(diff_text).values():
+        for piece in _split_section_by_size(section, max_bytes):
+            piece_size = len(piece.encode("utf-8"))
+            if current and current_size + piece_size > max_bytes:
+                chunks.append("".join(current))
+                current, current_size = [], 0
+            current.append(piece)
+            current_size += piece_size
+    if current:
+        chunks.append("".join(current))
+    return chunks
+
+
+__all__ = [
+    "DIFF_OUTPUT_OPTIONS",
+    "EMPTY_TREE_HASH",
+    "chunk_diff",
+    "parse_diff_header_path",
+    "split_diff_by_file",
+    "unquote_git_path",
+]
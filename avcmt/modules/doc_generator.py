@@ -8,8 +8,14 @@ FINAL REVISION: Fixes linter error PLR6301 by converting method to static.
 """
 
 import ast
+import functools
 import json
+import queue
 import shutil
+import threading
+from collections.abc import Callable
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
 from datetime import datetime
 from pathlib import Path
 from typing import TextIO
@@ -23,6 +29,13 @@ from rich.progress import (
 )
 
 from avcmt.ai import generate_with_ai
+from avcmt.modules.docs_state import (
+    DEFAULT_DOCS_STATE_FILE,
+    LEGACY_DOCS_STATE_FILE,
+    DocsStateIndex,
+)
+from avcmt.modules.docstring_cache import DocstringCache
+from avcmt.modules.edit_plan import LineEdit, apply_python_edits
 from avcmt.utils import (
     clean_docstring_response,
     extract_docstrings_from_md,
@@ -32,6 +45,9 @@ from avcmt.utils import (
     setup_logging,
 )
 
+# Source budget of one batched docstring request, so a batch of large classes stays a reasonable prompt.
+MAX_BATCH_SOURCE_BYTES = 24000
+
 
 class DocGeneratorError(Exception):
     """Custom exception indicating a failure during documentation generation.
@@ -40,6 +56,44 @@ class DocGeneratorError(Exception):
     """
 
 
+@dataclass
+class _NodeTask:
+    """The docstring work for one function or class node.
+
+    Args:
+        node (ast.AST): The function or class node.
+        identifier (str): The dotted identifier of the node.
+        source (str): The source code of the node, sent to the AI if no docstring is known.
+        key (str): The docstring cache key of the node.
+        docstring (str): The cached or generated docstring; empty until known.
+    """
+
+    node: ast.AST
+    identifier: str
+    source: str
+    key: str
+    docstring: str = ""
+
+
+@dataclass
+class _FilePlan:
+    """The parsed state of one file and the docstring work for its nodes, in reverse line order.
+
+    Args:
+        path (Path): The Python file.
+        content (str): The original content of the file.
+        lines (list[str]): The content split into lines with their line endings.
+        tasks (list[_NodeTask]): One task per node that gets a docstring.
+        pending (int): The number of AI requests of the file that have not finished yet.
+    """
+
+    path: Path
+    content: str
+    lines: list[str]
+    tasks: list[_NodeTask] = field(default_factory=list)
+    pending: int = 0
+
+
 class DocGenerator:
     """Performs analysis and updates of Python files by generating or reformatting docstrings using AI, with change tracking, backup creation, and support for dry run and live modes.
 
@@ -49,16 +103,26 @@ class DocGenerator:
         provider (str): The AI service provider to use (default is "pollinations").
         model (str): The specific AI model to utilize (default is "gemini").
         debug (bool): Enables debug logging for detailed tracebacks (default is False).
+        jobs (int): Number of docstrings requested from the AI concurrently, across files (default is 1).
+        batch_size (int): Maximum number of functions and classes of one file documented per AI request; 1 sends one request per node (default is 1).
+        docstring_cache (DocstringCache or None): Per-node docstring cache shared by live and dry-run modes; defaults to the store in "log/docstring_cache.jsonl".
 
     Returns:
         None
     """
 
     BACKUP_ROOT = "backup"
-    STATE_FILE = "log/docs_state.json"
+    STATE_FILE = DEFAULT_DOCS_STATE_FILE
+    LEGACY_STATE_FILE = LEGACY_DOCS_STATE_FILE
 
     def __init__(
-        self, provider: str = "pollinations", model: str = "gemini", debug: bool = False
+        self,
+        provider: str = "pollinations",
+        model: str = "gemini",
+        debug: bool = False,
+        jobs: int = 1,
+        batch_size: int = 1,
+        docstring_cache: DocstringCache | None = None,
     ):
         """Initializes the class with specified provider, model, and debug settings, and sets up logging, Jinja2 environment for documentation, a dry run file, and progress display columns for use during documentation generation.
 
@@ -66,6 +130,9 @@ class DocGenerator:
             provider (str, optional): The name of the service provider to use. Defaults to "pollinations".
             model (str, optional): The model to be utilized for documentation purposes. Defaults to "gemini".
             debug (bool, optional): Flag indicating whether to enable debug mode. Defaults to False.
+            jobs (int, optional): Number of concurrent AI requests; with 1, files and nodes are processed one at a time. Defaults to 1.
+            batch_size (int, optional): Maximum number of nodes per AI request, answered as one JSON object. Defaults to 1.
+            docstring_cache (DocstringCache | None, optional): Per-node docstring cache; if None, the default on-disk store is used.
 
         Returns:
             None
@@ -73,8 +140,18 @@ class DocGenerator:
         self.provider = provider
         self.model = model
         self.debug = debug
+        self.jobs = max(1, jobs)
+        self.batch_size = max(1, batch_size)
+        self.state_index = DocsStateIndex(self.STATE_FILE)
         self.logger = setup_logging("log/docs.log")
         self.doc_template_env = get_jinja_env("docs")
+        self.template_source = self.doc_template_env.loader.get_source(
+            self.doc_template_env, "docstring.j2"
+        )[0]
+        # An empty cache is falsy, so test for None explicitly.
+        self.docstring_cache = (
+            docstring_cache if docstring_cache is not None else DocstringCache()
+        )
         self.dry_run_file = get_docs_dry_run_file()
         self.progress_columns = [
             SpinnerColumn(),
@@ -85,36 +162,8 @@ class DocGenerator:
             TimeRemainingColumn(),
         ]
 
-    # ... (Metode-metode lain seperti _load_state, _save_state, _get_changed_files, dll, tidak berubah) ...
-    def _load_state(self) -> dict[str, float]:
-        """Loads the saved state data from a JSON file specified by `self.STATE_FILE`. If the file does not exist or contains invalid JSON, returns an empty dictionary. The returned dictionary has string keys and float values representing the loaded state."""
-        state_path = Path(self.STATE_FILE)
-        if not state_path.exists():
-            return {}
-        try:
-            with state_path.open("r", encoding="utf-8") as f:
-                return json.load(f)
-        except json.JSONDecodeError:
-            return {}
-
-    def _save_state(self, state: dict[str, float]):
-        """Saves the provided state dictionary to a JSON file, creating necessary directories if they do not exist.
-
-        This method serializes the `state` dictionary, which contains string keys and float values, and writes it to the file specified by `self.STATE_FILE` in JSON format with indentation for readability.
-
-        Args:
-            state (dict[str, float]): A dictionary representing the current state, with string keys and float values.
-
-        Returns:
-            None
-        """
-        state_path = Path(self.STATE_FILE)
-        state_path.parent.mkdir(parents=True, exist_ok=True)
-        with state_path.open("w", encoding="utf-8") as f:
-            json.dump(state, f, indent=2)
-
     def _get_changed_files(self, all_files: list[Path]) -> list[Path]:
-        """Performs detection of recently modified files from the provided list and returns the list of files that have changed.
+        """Performs detection of files whose content changed since they were last documented, using the content-hash index with its mtime+size fast path.
 
         Args:
             all_files (list of Path): A list of Path objects representing the files to check for modifications.
@@ -122,17 +171,19 @@ class DocGenerator:
         Returns:
             list of Path: A list containing the Path objects of files that have been changed since the last recorded state.
         """
-        self.logger.info("Checking for recently modified files...")
-        last_state = self._load_state()
+        self.logger.info("Checking for changed files...")
+        imported = self.state_index.migrate_legacy(self.LEGACY_STATE_FILE)
+        if imported:
+            self.logger.info(
+                f"Imported {imported} unchanged files from {self.LEGACY_STATE_FILE}."
+            )
         changed_files = []
         for file in all_files:
-            file_key = str(file.resolve())
-            current_mtime = file.stat().st_mtime
-            if last_state.get(file_key) is None or current_mtime > last_state.get(
-                file_key, 0
-            ):
+            if self.state_index.is_changed(file):
                 changed_files.append(file)
                 self.logger.info(f"  -> Detected change in: {file}")
+        # Persist refreshed stats of files that were only touched.
+        self.state_index.save()
         if not changed_files and all_files:
             self.logger.info("No file changes detected since last run.")
         return changed_files
@@ -230,15 +281,20 @@ class DocGenerator:
             )
             return ""
 
-    # --- BUG FIX: LINTER ERROR PLR6301 ---
     @staticmethod
-    def _update_docstring(
-        file_content: list[str], node: ast.stmt, new_docstring: str
-    ) -> list[str]:
-        """Updates the docstring of a specified function node within source code by inserting or replacing the existing docstring with a new one, properly formatted and indented."""
+    def _docstring_edit(node: ast.stmt, new_docstring: str) -> LineEdit | None:
+        """Builds the edit that inserts or replaces the docstring of a function or class node, properly formatted and indented.
+
+        Args:
+            node (ast.stmt): The function or class node.
+            new_docstring (str): The docstring content, without quotes.
+
+        Returns:
+            LineEdit or None: The edit in line numbers of the original file, or None if the node has no body to hold a docstring.
+        """
         if not node.body:
             # Cannot insert a docstring into an empty body (e.g., protocol stubs)
-            return file_content
+            return None
 
         # Determine indentation from the first statement of the function's body
         first_body_stmt = node.body[0]
@@ -254,20 +310,226 @@ class DocGenerator:
 
         # Check if a docstring already exists
         has_existing_doc = isinstance(first_body_stmt, ast.Expr) and isinstance(
-            first_body_stmt.value, (ast.Constant, ast.Str)
+            first_body_stmt.value, ast.Constant
         )
 
+        start_line_idx = first_body_stmt.lineno - 1
         if has_existing_doc:
             # Replace the old docstring lines with the new one
-            start_line_idx = first_body_stmt.lineno - 1
-            end_line_idx = first_body_stmt.end_lineno
-            file_content[start_line_idx:end_line_idx] = [formatted_docstring]
-        else:
-            # Insert the new docstring before the first body statement
-            insertion_point_idx = first_body_stmt.lineno - 1
-            file_content.insert(insertion_point_idx, formatted_docstring)
+            return LineEdit(
+                start_line_idx, first_body_stmt.end_lineno, formatted_docstring
+            )
+        # Insert the new docstring before the first body statement
+        return LineEdit(start_line_idx, start_line_idx, formatted_docstring)
+
+    def _plan_file(
+        self,
+        file_path: Path,
+        dry_run: bool,
+        force_rebuild: bool,
+        cached_docstrings: dict,
+    ) -> _FilePlan:
+        """Parses a Python file and decides, for each function and class, whether its docstring comes from a cache or must be requested from the AI.
+
+        In dry-run mode, nodes already present in the dry-run file are skipped entirely. Otherwise a node whose normalized source is in the per-node docstring cache reuses that docstring, and in live mode a docstring of the dry-run file is used next; both are ignored when `force_rebuild` is set.
+
+        Args:
+            file_path (Path): The path to the Python source file.
+            dry_run (bool): Whether the docstrings are only written to the dry-run file.
+            force_rebuild (bool): Whether to regenerate docstrings even if cached values are available.
+            cached_docstrings (dict): Dictionary mapping node identifiers to their cached docstring content.
+
+        Returns:
+            _FilePlan: The parsed file with one task per node; tasks without a docstring need an AI request.
+        """
+        content_str = file_path.read_text(encoding="utf-8")
+        plan = _FilePlan(
+            path=file_path,
+            content=content_str,
+            lines=content_str.splitlines(keepends=True),
+        )
+        nodes_to_process = [
+            n
+            for n in ast.walk(ast.parse(content_str))
+            if isinstance(n, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef))
+        ]
+        for node in sorted(nodes_to_process, key=lambda n: n.lineno, reverse=True):
+            identifier = self._get_node_identifier(file_path, node)
+            if dry_run and identifier in cached_docstrings:
+                continue
+            task = _NodeTask(
+                node=node,
+                identifier=identifier,
+                source=self._get_source_code(node, plan.lines),
+                key=DocstringCache.make_node_key(
+                    node, self.template_source, f"{self.provider}/{self.model}"
+                ),
+            )
+            if not force_rebuild:
+                task.docstring = self.docstring_cache.get(task.key) or ""
+                if not task.docstring and cached_docstrings.get(identifier):
+                    task.docstring = cached_docstrings[identifier]
+                    self.docstring_cache.put(task.key, task.docstring, identifier)
+            plan.tasks.append(task)
+        return plan
+
+    def _generate_task_docstring(self, task: _NodeTask) -> str:
+        """Requests the docstring of a node from the AI and stores it in the per-node docstring cache.
+
+        Args:
+            task (_NodeTask): The node without a known docstring.
+
+        Returns:
+            str: The generated docstring, or an empty string if generation failed.
+        """
+        docstring = self._generate_docstring_via_ai(task.identifier, task.source)
+        if docstring:
+            self.docstring_cache.put(task.key, docstring, task.identifier)
+        return docstring
+
+    def _batch_tasks(self, tasks: list[_NodeTask]) -> list[list[_NodeTask]]:
+        """Splits the tasks of a file that still need a docstring into request batches of at most `batch_size` nodes and about `MAX_BATCH_SOURCE_BYTES` of source each; a node larger than that budget gets a batch of its own.
+
+        Args:
+            tasks (list[_NodeTask]): The tasks of the planned file.
+
+        Returns:
+            list[list[_NodeTask]]: The batches, each sent as one AI request.
+        """
+        batches: list[list[_NodeTask]] = []
+        batch_bytes = 0
+        for task in tasks:
+            if task.docstring:
+                continue
+            size = len(task.source.encode("utf-8"))
+            if (
+                not batches
+                or len(batches[-1]) >= self.batch_size
+                or batch_bytes + size > MAX_BATCH_SOURCE_BYTES
+            ):
+                batches.append([])
+                batch_bytes = 0
+            batches[-1].append(task)
+            batch_bytes += size
+        return batches
+
+    @staticmethod
+    def _parse_batch_response(raw_response: str) -> dict:
+        """Extracts the JSON object of a batch response, tolerating a surrounding markdown code block or text.
 
-        return file_content
+        Args:
+            raw_response (str): The raw response of the provider.
+
+        Returns:
+            dict: The decoded object, or an empty dictionary if the response holds no JSON object.
+        """
+        start, end = raw_response.find("{"), raw_response.rfind("}")
+        if start < 0 or end < start:
+            return {}
+        try:
+            answers = json.loads(raw_response[start : end + 1])
+        except json.JSONDecodeError:
+            return {}
+        return answers if isinstance(answers, dict) else {}
+
+    def _generate_batch(self, tasks: list[_NodeTask]):
+        """Generates the docstrings of a batch of nodes of one file in a single AI request and stores them on the tasks.
+
+        Every node is tagged with its identifier (made unique within the batch) and the model answers with a JSON object mapping tag to docstring. Each answer is cleaned and validated on its own; a node whose answer is missing, not a string, or empty after cleaning is retried with a single-node request, so one bad item never discards the rest of the batch.
+
+        Args:
+            tasks (list[_NodeTask]): The nodes of the batch.
+
+        Returns:
+            None
+        """
+        if len(tasks) == 1:
+            tasks[0].docstring = self._generate_task_docstring(tasks[0])
+            return
+        tags: list[str] = []
+        for task in tasks:
+            tag, count = task.identifier, 1
+            while tag in tags:
+                count += 1
+                tag = f"{task.identifier}#{count}"
+            tags.append(tag)
+        self.logger.info(f"Querying AI for {len(tasks)} docstrings in one request.")
+        prompt = self.doc_template_env.get_template("docstring_batch.j2").render(
+            items=[
+                {"tag": tag, "source": task.source}
+                for tag, task in zip(tags, tasks, strict=True)
+            ]
+        )
+        if self.debug:
+            self.logger.info(f"--- BATCH PROMPT for {', '.join(tags)} ---\n{prompt}")
+        try:
+            raw_response = generate_with_ai(
+                prompt, provider=self.provider, model=self.model
+            )
+        except Exception as e:
+            self.logger.error(
+                f"Batch request for {len(tasks)} docstrings failed: {e}",
+                exc_info=self.debug,
+            )
+            raw_response = ""
+        if self.debug:
+            self.logger.info(f"--- RAW BATCH RESPONSE ---\n{raw_response}")
+        answers = self._parse_batch_response(raw_response or "")
+        for tag, task in zip(tags, tasks, strict=True):
+            docstring = clean_docstring_response(answers.get(tag))
+            if docstring:
+                task.docstring = docstring
+                self.docstring_cache.put(task.key, docstring, task.identifier)
+                continue
+            self.logger.warning(
+                f"No valid docstring for {task.identifier} in the batch response; retrying it alone."
+            )
+            task.docstring = self._generate_task_docstring(task)
+
+    def _finish_file(
+        self, plan: _FilePlan, dry_run_writer: TextIO | None, backup_dir: Path | None
+    ):
+        """Applies the docstrings of a planned file: appends them to the dry-run file, or collects one edit per node, applies them together and rewrites the source file after backing it up. Only one thread ever finishes a given file, so its content is written exactly once.
+
+        Args:
+            plan (_FilePlan): The file with the docstrings of its tasks filled in.
+            dry_run_writer (TextIO or None): If provided, writes the proposed docstring changes to this writer instead of modifying the file.
+            backup_dir (Path or None): Directory where backups will be saved if modifications are made.
+
+        Returns:
+            None
+
+        Raises:
+            EditPlanError: If the edits overlap or the edited source does not parse; the file is left untouched.
+        """
+        edits = []
+        for task in plan.tasks:
+            # --- ADDED SAFETY CHECK ---
+            # After cleaning, if the docstring is empty, skip to the next node.
+            if not task.docstring:
+                self.logger.warning(
+                    f"Skipping {task.identifier} due to empty docstring after generation/cleaning."
+                )
+                continue
+            # --- END OF SAFETY CHECK ---
+
+            if dry_run_writer:
+                dry_run_writer.write(
+                    f'### `{task.identifier}`\n\n```python\n"""\n{task.docstring}\n"""\n```\n\n---\n\n'
+                )
+                dry_run_writer.flush()
+            else:
+                edit = DocGenerator._docstring_edit(task.node, task.docstring)
+                if edit:
+                    edits.append(edit)
+
+        if edits and backup_dir:
+            # One linear pass over the file, verified by a single parse before anything is written.
+            final_content = apply_python_edits(plan.lines, edits)
+            if final_content != plan.content:
+                self._create_backup(plan.path, backup_dir)
+                plan.path.write_text(final_content, encoding="utf-8")
+                self.logger.info(f"Successfully wrote changes to {plan.path}")
 
     def _process_single_file(
         self,
@@ -293,58 +555,162 @@ class DocGenerator:
             Exceptions may be raised during file reading, parsing, or writing operations, but are caught and logged within the method.
         """
         try:
-            content_str = file_path.read_text(encoding="utf-8")
-            content_lines = content_str.splitlines(keepends=True)
-            tree = ast.parse(content_str)
-            file_was_modified = False
-            nodes_to_process = [
-                n
-                for n in ast.walk(tree)
-                if isinstance(n, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef))
-            ]
+            plan = self._plan_file(
+                file_path, dry_run_writer is not None, force_rebuild, cached_docstrings
+            )
+            for batch in self._batch_tasks(plan.tasks):
+                self._generate_batch(batch)
+            self._finish_file(plan, dry_run_writer, backup_dir)
+        except Exception as e:
+            self.logger.error(
+                f"Failed to process {file_path}: {e}", exc_info=self.debug
+            )
 
-            for node in sorted(nodes_to_process, key=lambda n: n.lineno, reverse=True):
-                identifier = self._get_node_identifier(file_path, node)
-                if dry_run_writer and identifier in cached_docstrings:
-                    continue
+    def _process_files(
+        self,
+        files_to_process: list[Path],
+        dry_run_writer: TextIO | None,
+        backup_dir: Path | None,
+        force_rebuild: bool,
+        cached_docstrings: dict,
+        on_file_done: Callable[[Path], None],
+    ):
+        """Processes files one at a time, or with `jobs` > 1 concurrently.
 
-                new_docstring = cached_docstrings.get(identifier)
-                if not new_docstring or (force_rebuild and not dry_run_writer):
-                    source_code = self._get_source_code(node, content_lines)
-                    new_docstring = self._generate_docstring_via_ai(
-                        identifier, source_code
-                    )
+        In concurrent mode every file is parsed up front and the AI requests of all its nodes (or node batches) are submitted to a pool of `jobs` workers, so requests of different files overlap. When the last request of a file finishes, the file is put on a queue; the calling thread is the only consumer of that queue and the only writer, so each source file is rewritten by exactly one owner and the entries of the dry-run file are written one complete file at a time.
 
-                # --- ADDED SAFETY CHECK ---
-                # After cleaning, if the docstring is empty, skip to the next node.
-                if not new_docstring:
-                    self.logger.warning(
-                        f"Skipping {identifier} due to empty docstring after generation/cleaning."
-                    )
-                    continue
-                # --- END OF SAFETY CHECK ---
+        Args:
+            files_to_process (list[Path]): The files to process.
+            dry_run_writer (TextIO or None): If provided, docstrings are written here instead of into the files.
+            backup_dir (Path or None): Directory where backups will be saved if modifications are made.
+            force_rebuild (bool): Whether to regenerate docstrings even if cached values are available.
+            cached_docstrings (dict): Dictionary mapping node identifiers to their cached docstring content.
+            on_file_done (Callable[[Path], None]): Called on the calling thread after each file, e.g. to advance a progress bar.
 
-                if dry_run_writer:
-                    dry_run_writer.write(
-                        f'### `{identifier}`\n\n```python\n"""\n{new_docstring}\n"""\n```\n\n---\n\n'
+        Returns:
+            None
+        """
+        if self.jobs == 1:
+            for file_path in files_to_process:
+                self._process_single_file(
+                    file_path,
+                    dry_run_writer,
+                    backup_dir,
+                    force_rebuild,
+                    cached_docstrings,
+                )
+                on_file_done(file_path)
+            return
+
+        finished: queue.Queue[_FilePlan] = queue.Queue()
+        in_flight: dict[str, Future] = {}
+        expected = 0
+        with ThreadPoolExecutor(max_workers=self.jobs) as executor:
+            for file_path in files_to_process:
+                try:
+                    plan = self._plan_file(
+                        file_path,
+                        dry_run_writer is not None,
+                        force_rebuild,
+                        cached_docstrings,
                     )
-                    dry_run_writer.flush()
-                else:
-                    content_lines = DocGenerator._update_docstring(
-                        content_lines, node, new_docstring
+                except Exception as e:
+                    self.logger.error(
+                        f"Failed to process {file_path}: {e}", exc_info=self.debug
                     )
-                    file_was_modified = True
-
-            if file_was_modified and backup_dir:
-                final_content = "".join(content_lines)
-                if final_content != content_str:
-                    self._create_backup(file_path, backup_dir)
-                    file_path.write_text(final_content, encoding="utf-8")
-                    self.logger.info(f"Successfully wrote changes to {file_path}")
-        except Exception as e:
-            self.logger.error(
-                f"Failed to process {file_path}: {e}", exc_info=self.debug
-            )
+                    on_file_done(file_path)
+                    continue
+                expected += 1
+                self._submit_file(executor, plan, finished, in_flight)
+            for _ in range(expected):
+                plan = finished.get()
+                try:
+                    self._finish_file(plan, dry_run_writer, backup_dir)
+                except Exception as e:
+                    self.logger.error(
+                        f"Failed to process {plan.path}: {e}", exc_info=self.debug
+                    )
+                on_file_done(plan.path)
+
+    @staticmethod
+    def _claim_tasks(
+        plan: _FilePlan, in_flight: dict[str, Future]
+    ) -> tuple[list[_NodeTask], list[_NodeTask]]:
+        """Splits the tasks of a file that still need a docstring into those to request, whose cache keys are claimed in `in_flight`, and duplicates of keys already claimed.
+
+        Args:
+            plan (_FilePlan): The planned file.
+            in_flight (dict[str, Future]): The docstring future of every cache key requested so far in the run.
+
+        Returns:
+            tuple[list[_NodeTask], list[_NodeTask]]: The tasks to request and the duplicate tasks.
+        """
+        requested, duplicates = [], []
+        for task in plan.tasks:
+            if task.docstring:
+                continue
+            if task.key in in_flight:
+                duplicates.append(task)
+            else:
+                in_flight[task.key] = Future()
+                requested.append(task)
+        return requested, duplicates
+
+    def _submit_file(
+        self,
+        executor: ThreadPoolExecutor,
+        plan: _FilePlan,
+        finished: queue.Queue,
+        in_flight: dict[str, Future],
+    ):
+        """Submits the AI requests (single or batched) of one file and puts the file on `finished` once all of them are done (immediately if none is needed).
+
+        A node whose cache key is already being requested for another node (an identical function in this or an earlier file) is not sent again; it waits for the docstring of that request instead.
+
+        Args:
+            executor (ThreadPoolExecutor): The pool running the AI requests.
+            plan (_FilePlan): The planned file.
+            finished (queue.Queue): The queue of files ready to be written.
+            in_flight (dict[str, Future]): The docstring future of every cache key requested so far in the run, shared by all files.
+
+        Returns:
+            None
+        """
+        requested, duplicates = self._claim_tasks(plan, in_flight)
+        batches = self._batch_tasks(requested)
+        plan.pending = len(batches) + len(duplicates)
+        if not plan.pending:
+            finished.put(plan)
+            return
+        lock = threading.Lock()
+
+        def done(future: Future):
+            if future.exception():
+                self.logger.error(
+                    f"Docstring request for {plan.path} failed: {future.exception()}"
+                )
+            with lock:
+                plan.pending -= 1
+                if plan.pending:
+                    return
+            finished.put(plan)
+
+        def generate(batch: list[_NodeTask]):
+            try:
+                self._generate_batch(batch)
+            finally:
+                # Resolve the keys even if the request failed, so waiting nodes never hang.
+                for task in batch:
+                    in_flight[task.key].set_result(task.docstring)
+
+        def reuse(task: _NodeTask, future: Future):
+            task.docstring = future.result()
+            done(future)
+
+        for task in duplicates:
+            in_flight[task.key].add_done_callback(functools.partial(reuse, task))
+        for batch in batches:
+            executor.submit(generate, batch).add_done_callback(done)
 
     # ... (Metode run, _run_dry_mode, _run_live_mode tetap sama) ...
     def run(self, path: str, dry_run: bool, all_files: bool, force_rebuild: bool):
@@ -411,15 +777,16 @@ class DocGenerator:
             # --- END: BUG FIX SECTION ---
 
         if not dry_run and files_to_process:
-            self.logger.info("Updating file modification state...")
-            current_state = self._load_state()
+            self.logger.info("Updating file content state...")
             for fp in files_to_process:
-                current_state[str(fp.resolve())] = fp.stat().st_mtime
-            self._save_state(current_state)
+                self.state_index.record(fp)
+            self.state_index.save()
 
     def _run_dry_mode(self, files_to_process: list[Path], force_rebuild: bool):
         """Performs a dry run to process a list of files, generating and caching docstring suggestions without making permanent changes. This method manages the dry run cache file by clearing it if `force_rebuild` is enabled, appends generated suggestions and timestamps, and provides real-time progress updates using a progress indicator. It leverages existing cache data if available and calls an internal method to process each individual file during the dry run."""
-        self.logger.info(f"DRY RUN active. Caching to {self.dry_run_file}")
+        self.logger.info(
+            f"DRY RUN active. Caching to {self.dry_run_file} ({self.jobs} job(s))"
+        )
         if force_rebuild:
             self.logger.info("--force-rebuild active. Clearing existing cache.")
             self.dry_run_file.write_text("")
@@ -434,16 +801,18 @@ class DocGenerator:
                     f.write(
                         f"# AI-Generated Docstrings (Dry Run)\n_Last generated: {ts}_\n\n"
                     )
-                for file_path in files_to_process:
+
+                def file_done(file_path: Path):
                     progress.update(
                         task,
-                        description=f"[cyan]Scanning [bold]{file_path.name}[/bold]",
-                    )
-                    self._process_single_file(
-                        file_path, f, None, force_rebuild, existing_cache
+                        description=f"[cyan]Scanned [bold]{file_path.name}[/bold]",
                     )
                     progress.advance(task)
 
+                self._process_files(
+                    files_to_process, f, None, force_rebuild, existing_cache, file_done
+                )
+
     def _run_live_mode(
         self, files_to_process: list[Path], force_rebuild: bool, cached_docstrings: dict
     ):
@@ -458,16 +827,25 @@ class DocGenerator:
         backup_dir = (
             Path(self.BACKUP_ROOT) / f"docs_{start_time.strftime('%Y%m%d_%H%M%S')}"
         )
-        self.logger.info(f"LIVE RUN active. Backups will be saved to: {backup_dir}")
+        self.logger.info(
+            f"LIVE RUN active. Backups will be saved to: {backup_dir} ({self.jobs} job(s))"
+        )
         with Progress(*self.progress_columns, transient=False) as progress:
             task = progress.add_task(
                 "[green]Updating files...", total=len(files_to_process)
             )
-            for file_path in files_to_process:
+
+            def file_done(file_path: Path):
                 progress.update(
-                    task, description=f"[green]Updating [bold]{file_path.name}[/bold]"
-                )
-                self._process_single_file(
-                    file_path, None, backup_dir, force_rebuild, cached_docstrings
+                    task, description=f"[green]Updated [bold]{file_path.name}[/bold]"
                 )
                 progress.advance(task)
+
+            self._process_files(
+                files_to_process,
+                None,
+                backup_dir,
+                force_rebuild,
+                cached_docstrings,
+                file_done,
+            )
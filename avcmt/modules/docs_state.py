@@ -0,0 +1,225 @@
+# Copyright 2025 Andy Vandaric
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+# File: avcmt/modules/docs_state.py
+# Description: Content-hash index of documented files, used by `docs run` to find files that actually changed.
+
+import hashlib
+import json
+import threading
+from pathlib import Path
+
+from avcmt.modules.jsonl_store import needs_compaction, rewrite_store
+
+DEFAULT_DOCS_STATE_FILE = Path("log") / "docs_state.jsonl"
+# Modification-time state written by earlier versions; imported once by `DocsStateIndex.migrate_legacy`.
+LEGACY_DOCS_STATE_FILE = Path("log") / "docs_state.json"
+
+
+def hash_file(path: Path) -> str:
+    """Returns the hexadecimal SHA-256 digest of a file's content.
+
+    Args:
+        path (Path): The file to hash.
+
+    Returns:
+        str: The digest of the file content.
+    """
+    return hashlib.sha256(path.read_bytes()).hexdigest()
+
+
+class DocsStateIndex:
+    """Remembers the content hash of every file processed by `docs run`, so that only files whose content changed are documented again.
+
+    A file is unchanged when its modification time and size still match the recorded entry (the fast path, no read), or when its content hash does. A `git checkout`, a formatter that rewrites identical bytes or a fresh CI clone only changes modification times, so those files are rehashed once, found unchanged and get their new stat recorded for the fast path of the next run. Keys are paths relative to `root`, so the index stays valid when the project is cloned to another directory.
+
+    Entries are appended as compact JSON lines, and only the entries that changed are written by `save`; the last line of a path wins. The store is compacted once superseded lines dominate it.
+
+    Args:
+        path (Path | str): Location of the JSON Lines store (default is "log/docs_state.jsonl").
+        root (Path | str | None): Directory the keys are relative to; defaults to the current directory.
+    """
+
+    def __init__(
+        self, path: Path | str = DEFAULT_DOCS_STATE_FILE, root: Path | str | None = None
+    ):
+        """Initializes the index for the given store file; entries are loaded lazily on first access.
+
+        Args:
+            path (Path | str): Location of the JSON Lines store.
+            root (Path | str | None): Directory the keys are relative to.
+        """
+        self.path = Path(path)
+        self.root = Path(root or Path.cwd()).resolve()
+        self._entries: dict[str, tuple[int, int, str]] | None = None
+        self._pending: dict[str, tuple[int, int, str]] = {}
+        self._lines = 0
+        self._lock = threading.Lock()
+
+    def _key(self, file: Path) -> str:
+        """Returns the index key of a file: its POSIX path relative to `root`, or its absolute path outside of it."""
+        resolved = file.resolve()
+        try:
+            return resolved.relative_to(self.root).as_posix()
+        except ValueError:
+            return resolved.as_posix()
+
+    def _load(self) -> dict[str, tuple[int, int, str]]:
+        """Reads the store into memory on first use, skipping malformed lines.
+
+        Returns:
+            dict[str, tuple[int, int, str]]: The (mtime in ns, size, content hash) of each recorded path.
+        """
+        if self._entries is not None:
+            return self._entries
+        entries: dict[str, tuple[int, int, str]] = {}
+        lines = 0
+        if self.path.exists():
+            with self.path.open(encoding="utf-8") as f:
+                for line in f:
+                    lines += 1
+                    try:
+                        entry = json.loads(line)
+                        entries[entry["p"]] = (
+                            int(entry["m"]),
+                            int(entry["s"]),
+                            str(entry["h"]),
+                        )
+                    except (json.JSONDecodeError, KeyError, TypeError, ValueError):
+                        continue
+        self._entries = entries
+        self._lines = lines
+        return entries
+
+    def is_changed(self, file: Path) -> bool:
+        """Checks whether a file differs from its recorded state.
+
+        Args:
+            file (Path): The file to check.
+
+        Returns:
+            bool: True if the file was never recorded or its content hash differs; False if its stat or its content matches the entry.
+        """
+        key = self._key(file)
+        stat = file.stat()
+        with self._lock:
+            entry = self._load().get(key)
+        if entry is None:
+            return True
+        if entry[:2] == (stat.st_mtime_ns, stat.st_size):
+            return False
+        if stat.st_size != entry[1] or hash_file(file) != entry[2]:
+            return True
+        # Same content under a new mtime: remember it so the next check takes the fast path.
+        with self._lock:
+            self._pending[key] = self._entries[key] = (
+                stat.st_mtime_ns,
+                stat.st_size,
+                entry[2],
+            )
+        return False
+
+    def record(self, file: Path):
+        """Records the current stat and content hash of a file; written to the store by `save`.
+
+        Args:
+            file (Path): The file to record.
+
+        Returns:
+            None
+        """
+        key = self._key(file)
+        stat = file.stat()
+        entry = (stat.st_mtime_ns, stat.st_size, hash_file(file))
+        with self._lock:
+            self._load()[key] = entry
+            self._pending[key] = entry
+
+    def save(self):
+        """Appends the entries recorded or refreshed since the last save, and compacts the store when superseded lines dominate it.
+
+        Returns:
+            None
+        """
+        with self._lock:
+            if not self._pending:
+                return
+            entries = self._load()
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            if needs_compaction(self._lines + len(self._pending), len(entries)):
+                self._rewrite(entries)
+            else:
+                with self.path.open("a", encoding="utf-8") as f:
+                    f.writelines(
+                        self._format(key, entry) for key, entry in self._pending.items()
+                    )
+                self._lines += len(self._pending)
+            self._pending.clear()
+
+    def migrate_legacy(self, legacy_path: Path | str = LEGACY_DOCS_STATE_FILE) -> int:
+        """Imports the modification-time state of earlier versions once, then deletes it.
+
+        The legacy file maps absolute paths to the modification time they had when documented. A file that has not been modified since is recorded with its current content hash, so upgrading does not redocument every file; files already in the index, modified or missing are skipped.
+
+        Args:
+            legacy_path (Path | str): Location of the legacy JSON state (default is "log/docs_state.json").
+
+        Returns:
+            int: The number of files imported.
+        """
+        legacy_path = Path(legacy_path)
+        if not legacy_path.exists():
+            return 0
+        try:
+            with legacy_path.open(encoding="utf-8") as f:
+                state = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            state = {}
+        imported = 0
+        for name, mtime in (state if isinstance(state, dict) else {}).items():
+            file = Path(name)
+            with self._lock:
+                known = self._key(file) in self._load()
+            try:
+                unchanged = file.is_file() and file.stat().st_mtime <= float(mtime)
+            except (TypeError, ValueError):
+                continue
+            if not known and unchanged:
+                self.record(file)
+                imported += 1
+        self.save()
+        legacy_path.unlink(missing_ok=True)
+        return imported
+
+    def _rewrite(self, entries: dict[str, tuple[int, int, str]]):
+        """Replaces the store with one line per live entry, atomically."""
+        rewrite_store(
+            self.path, (self._format(key, entry) for key, entry in entries.items())
+        )
+        self._lines = len(entries)
+
+    @staticmethod
+    def _format(key: str, entry: tuple[int, int, str]) -> str:
+        """Returns the compact JSON line of one entry."""
+        mtime_ns, size, digest = entry
+        record = {"p": key, "m": mtime_ns, "s": size, "h": digest}
+        return json.dumps(record, separators=(",", ":")) + "\n"
+
+
+__all__ = [
+    "DEFAULT_DOCS_STATE_FILE",
+    "LEGACY_DOCS_STATE_FILE",
+    "DocsStateIndex",
+    "hash_file",
+]
@@ -0,0 +1,97 @@
+# Copyright 2025 Andy Vandaric
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+# File: avcmt/modules/docstring_cache.py
+# Description: Docstring cache keyed by a hash of the normalized source of a function or class.
+
+import ast
+import copy
+import hashlib
+from pathlib import Path
+
+from avcmt.modules.commit_cache import CommitMessageCache
+
+DEFAULT_DOCSTRING_CACHE_FILE = Path("log") / "docstring_cache.jsonl"
+
+_DEFINITIONS = (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)
+
+
+def _has_docstring(node: ast.AST) -> bool:
+    """Returns True if the first statement of a definition is a string literal."""
+    first = node.body[0] if getattr(node, "body", None) else None
+    return (
+        isinstance(first, ast.Expr)
+        and isinstance(first.value, ast.Constant)
+        and isinstance(first.value.value, str)
+    )
+
+
+def normalize_node(node: ast.AST) -> str:
+    """Returns a normalized form of a function or class: its AST without position information and without the docstrings of the node and of the definitions nested in it.
+
+    Formatting and comments do not affect the result, and neither does documenting the node or its methods, so a node keeps its key across `docs run` passes until its code changes.
+
+    Args:
+        node (ast.AST): A function or class node.
+
+    Returns:
+        str: The dump of the stripped AST.
+    """
+    stripped = copy.deepcopy(node)
+    for child in ast.walk(stripped):
+        if isinstance(child, _DEFINITIONS) and _has_docstring(child):
+            child.body = child.body[1:] or [ast.Pass()]
+    return ast.dump(stripped)
+
+
+class DocstringCache(CommitMessageCache):
+    """Stores generated docstrings keyed by a hash of the normalized node source, the docstring template and the model.
+
+    The key does not depend on the file or the identifier of the node, so an unchanged function is never sent to the AI again, even when other parts of its module changed, and an identical function elsewhere in the project reuses the same docstring. Live and dry-run modes share the store.
+
+    Args:
+        path (Path | str): Location of the JSON Lines store (default is "log/docstring_cache.jsonl").
+    """
+
+    # One entry per documented node, so the cap is sized for large projects.
+    MAX_ENTRIES = 100000
+
+    def __init__(self, path: Path | str = DEFAULT_DOCSTRING_CACHE_FILE):
+        """Initializes the cache for the given store file; entries are loaded lazily on first access.
+
+        Args:
+            path (Path | str): Location of the JSON Lines store.
+        """
+        super().__init__(path)
+
+    @staticmethod
+    def make_node_key(node: ast.AST, template_source: str, model: str) -> str:
+        """Builds the cache key of a function or class node.
+
+        Args:
+            node (ast.AST): The function or class node.
+            template_source (str): The source of the docstring prompt template.
+            model (str): The model (optionally qualified with its provider) generating the docstring.
+
+        Returns:
+            str: A hexadecimal SHA-256 digest identifying the request.
+        """
+        digest = hashlib.sha256()
+        for part in (model, template_source, normalize_node(node)):
+            digest.update(part.encode("utf-8"))
+            digest.update(b"\0")
+        return digest.hexdigest()
+
+
+__all__ = ["DEFAULT_DOCSTRING_CACHE_FILE", "DocstringCache", "normalize_node"]
@@ -0,0 +1,97 @@
+# Copyright 2025 Andy Vandaric
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+# File: avcmt/modules/edit_plan.py
+# Description: Line-range edit plans applied to a source file in a single linear pass.
+
+import ast
+from dataclasses import dataclass
+
+
+class EditPlanError(Exception):
+    """Raised when the edits of a plan overlap or produce invalid Python source."""
+
+
+@dataclass(frozen=True)
+class LineEdit:
+    """Replaces the lines `start` to `end` (0-based, end exclusive) of a file with `text`; `start == end` inserts before line `start`.
+
+    Args:
+        start (int): Index of the first replaced line.
+        end (int): Index after the last replaced line.
+        text (str): The replacement text, including its line endings.
+    """
+
+    start: int
+    end: int
+    text: str
+
+
+def apply_line_edits(lines: list[str], edits: list[LineEdit]) -> str:
+    """Applies a plan of line edits to the lines of a file in one pass.
+
+    The edits may be given in any order; they refer to line numbers of the original file. Each original line and each replacement is copied once, so the cost is linear in the size of the file regardless of the number of edits.
+
+    Args:
+        lines (list[str]): The lines of the original file, with their line endings.
+        edits (list[LineEdit]): The edits to apply.
+
+    Returns:
+        str: The edited content.
+
+    Raises:
+        EditPlanError: If an edit lies outside the file or two edits touch the same lines (including two insertions at the same place).
+    """
+    ordered = sorted(edits, key=lambda edit: (edit.start, edit.end))
+    pieces = []
+    position = 0
+    for edit in ordered:
+        if edit.start < position or edit.end < edit.start or edit.end > len(lines):
+            raise EditPlanError(
+                f"Edit at lines {edit.start + 1}-{max(edit.end, edit.start + 1)} overlaps another edit or lies outside the file."
+            )
+        pieces.extend(lines[position : edit.start])
+        pieces.append(edit.text)
+        # An insertion claims its position, so a second edit starting there is an overlap.
+        position = edit.end if edit.end > edit.start else edit.start + 1
+        if edit.end == edit.start and edit.start < len(lines):
+            pieces.append(lines[edit.start])
+    pieces.extend(lines[position:])
+    return "".join(pieces)
+
+
+def apply_python_edits(lines: list[str], edits: list[LineEdit]) -> str:
+    """Applies a plan of line edits to a Python file and verifies the result with a single parse.
+
+    Args:
+        lines (list[str]): The lines of the original file, with their line endings.
+        edits (list[LineEdit]): The edits to apply.
+
+    Returns:
+        str: The edited source.
+
+    Raises:
+        EditPlanError: If the edits overlap or the edited source is not valid Python.
+    """
+    content = apply_line_edits(lines, edits)
+    try:
+        ast.parse(content)
+    except SyntaxError as e:
+        raise EditPlanError(
+            f"Edited source does not parse (line {e.lineno}: {e.msg})."
+        ) from e
+    return content
+
+
+__all__ = ["EditPlanError", "LineEdit", "apply_line_edits", "apply_python_edits"]
@@ -0,0 +1,113 @@
+# Copyright 2025 Andy Vandaric
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+# File: avcmt/modules/git_status.py
+# Description: Parses a `git status --porcelain=v2 --branch -z` snapshot into changed files and branch state.
+
+from dataclasses import dataclass, field
+
+# Arguments that produce the snapshot understood by `parse_status_v2`.
+STATUS_COMMAND = [
+    "git",
+    "status",
+    "--porcelain=v2",
+    "--branch",
+    "-z",
+    "--untracked-files=all",
+    "--no-renames",
+]
+DEFAULT_FETCH_TTL = 300
+
+# Number of space-separated fields before the path in ordinary ("1"), renamed ("2") and unmerged ("u") entries.
+_PATH_FIELD_INDEX = {"1": 8, "2": 9, "u": 10}
+
+
+@dataclass
+class StatusSnapshot:
+    """The state of the working tree and the current branch at one point in time.
+
+    Args:
+        changed_files (list[str]): Paths whose working tree or index content differs from HEAD, plus untracked files, in status order.
+        untracked_files (set[str]): The subset of `changed_files` that is untracked.
+        head (str | None): The current branch name, or None when HEAD is detached.
+        oid (str | None): The commit HEAD points to, or None before the first commit.
+        upstream (str | None): The upstream branch (e.g. "origin/main"), if one is configured.
+        ahead (int | None): Commits on HEAD that are not on the upstream; None when the upstream is missing or gone.
+        behind (int | None): Commits on the upstream that are not on HEAD; None when the upstream is missing or gone.
+    """
+
+    changed_files: list[str] = field(default_factory=list)
+    untracked_files: set[str] = field(default_factory=set)
+    head: str | None = None
+    oid: str | None = None
+    upstream: str | None = None
+    ahead: int | None = None
+    behind: int | None = None
+
+
+def _parse_branch_header(snapshot: StatusSnapshot, header: str):
+    """Applies one `# branch.*` header line to the snapshot."""
+    key, _, value = header[2:].partition(" ")
+    if key == "branch.oid":
+        snapshot.oid = None if value == "(initial)" else value
+    elif key == "branch.head":
+        snapshot.head = None if value == "(detached)" else value
+    elif key == "branch.upstream":
+        snapshot.upstream = value
+    elif key == "branch.ab":
+        ahead, _, behind = value.partition(" ")
+        snapshot.ahead = int(ahead.lstrip("+"))
+        snapshot.behind = int(behind.lstrip("-"))
+
+
+def parse_status_v2(output: str) -> StatusSnapshot:
+    """Parses the NUL-delimited output of `STATUS_COMMAND`.
+
+    Args:
+        output (str): The raw output of `git status --porcelain=v2 --branch -z`.
+
+    Returns:
+        StatusSnapshot: The changed files and branch state described by the output.
+    """
+    snapshot = StatusSnapshot()
+    seen: dict[str, None] = {}
+    entries = iter(output.split("\0"))
+    for entry in entries:
+        if not entry:
+            continue
+        kind = entry[0]
+        if kind == "#":
+            _parse_branch_header(snapshot, entry)
+        elif kind == "?":
+            path = entry[2:]
+            snapshot.untracked_files.add(path)
+            seen[path] = None
+        elif kind in _PATH_FIELD_INDEX:
+            path = entry.split(" ", _PATH_FIELD_INDEX[kind])[-1]
+            seen[path] = None
+            if kind == "2":
+                # Renamed entries are followed by the original path as a separate field.
+                seen[next(entries, "")] = None
+        # "!" (ignored) entries are not requested and are skipped.
+    seen.pop("", None)
+    snapshot.changed_files = list(seen)
+    return snapshot
+
+
+__all__ = [
+    "DEFAULT_FETCH_TTL",
+    "STATUS_COMMAND",
+    "StatusSnapshot",
+    "parse_status_v2",
+]
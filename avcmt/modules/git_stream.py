@@ -0,0 +1,218 @@
+# Copyright 2025 Andy Vandaric
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+# File: avcmt/modules/git_stream.py
+# Description: Streams git output incrementally under a byte budget and splits diffs into bounded per-file sections.
+
+import codecs
+import os
+import subprocess
+import tempfile
+from collections import deque
+from collections.abc import Iterable, Iterator
+
+from avcmt.modules.diff_utils import DIFF_HEADER_PREFIX, parse_diff_header_path
+
+DEFAULT_MAX_DIFF_BYTES = 64 * 1024 * 1024
+# Upper bound of a single read; longer lines are delivered in pieces of this size.
+READ_CHUNK_BYTES = 64 * 1024
+
+
+class GitStreamError(Exception):
+    """Custom exception indicating that a streamed git command failed.
+
+    Args:
+        message (str): A descriptive message including git's error output.
+    """
+
+
+class GitOutputStream:
+    """Runs a git command and yields its standard output line by line as it arrives, instead of buffering the whole output in memory.
+
+    Reading stops once `max_bytes` have been consumed; the process is then killed and `truncated` is set. Standard error is spooled to a temporary file so a chatty command can never block on a full pipe.
+
+    Args:
+        command (list[str]): The git command and its arguments.
+        env (dict[str, str] | None): Extra environment variables for the command.
+        max_bytes (int): The maximum number of output bytes to read; 0 reads everything.
+        cwd (str | os.PathLike | None): The directory to run the command in; None uses the current directory.
+    """
+
+    def __init__(
+        self,
+        command: list[str],
+        env: dict[str, str] | None = None,
+        max_bytes: int = 0,
+        cwd: str | os.PathLike | None = None,
+    ):
+        """Initializes the stream; the command is started on first iteration.
+
+        Args:
+            command (list[str]): The git command and its arguments.
+            env (dict[str, str] | None): Extra environment variables for the command.
+            max_bytes (int): The maximum number of output bytes to read; 0 reads everything.
+            cwd (str | os.PathLike | None): The directory to run the command in.
+        """
+        self.command = command
+        self.cwd = cwd
+        self.env = env
+        self.max_bytes = max_bytes
+        self.bytes_read = 0
+        self.truncated = False
+
+    def __iter__(self) -> Iterator[str]:
+        """Yields decoded output lines, including their line endings. Lines are decoded incrementally, so a character split between two pieces of an overlong line is decoded whole.
+
+        Yields:
+            str: The next line (or piece of an overlong line) of output.
+
+        Raises:
+            GitStreamError: If the command exits with an error before its output was fully read.
+        """
+        with tempfile.TemporaryFile() as stderr_file:
+            process = subprocess.Popen(
+                self.command,
+                stdout=subprocess.PIPE,
+                stderr=stderr_file,
+                env={**os.environ, **self.env} if self.env else None,
+                cwd=self.cwd,
+            )
+            decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+            finished = False
+            try:
+                for raw_line in iter(
+                    lambda: process.stdout.readline(READ_CHUNK_BYTES), b""
+                ):
+                    self.bytes_read += len(raw_line)
+                    if self.max_bytes and self.bytes_read > self.max_bytes:
+                        self.truncated = True
+                        break
+                    line = decoder.decode(raw_line)
+                    if line:
+                        yield line
+                else:
+                    finished = True
+                    line = decoder.decode(b"", final=True)
+                    if line:
+                        yield line
+            finally:
+                # Stop git as soon as we stop reading, whether on budget or because the consumer gave up.
+                if not finished and process.poll() is None:
+                    process.kill()
+                process.stdout.close()
+                returncode = process.wait()
+            if returncode and finished:
+                stderr_file.seek(0)
+                message = stderr_file.read().decode("utf-8", errors="replace").strip()
+                raise GitStreamError(
+                    f"Git command '{' '.join(self.command)}' failed: {message}"
+                )
+
+
+class _SectionBuffer:
+    """Collects one file's diff section, switching to head/tail sampling once it exceeds its byte budget, so memory stays bounded by the budget.
+
+    The sampled output is identical to `diff_shaper.sample_section` applied to the complete section.
+    """
+
+    def __init__(self, path: str, max_bytes: int):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.header: list[str] = []
+        self.lines: list[str] = []
+        self.size = 0
+        self.in_body = False
+        self.sampling = False
+        self.head_size = 0
+        self.head_closed = False
+        self.tail: deque[tuple[str, int]] = deque()
+        self.tail_size = 0
+        self.omitted = 0
+
+    def add(self, line: str):
+        """Adds the next line of the section."""
+        line_size = len(line.encode("utf-8"))
+        self.size += line_size
+        if not self.in_body and not line.startswith("@@"):
+            self.header.append(line)
+            return
+        self.in_body = True
+        if not self.sampling:
+            self.lines.append(line)
+            if self.max_bytes and self.size > self.max_bytes:
+                self._start_sampling()
+            return
+        self._push_sampled(line, line_size)
+
+    def _start_sampling(self):
+        """Replays the lines collected so far into the head and the tail window."""
+        lines, self.lines = self.lines, []
+        self.sampling = True
+        for line in lines:
+            self._push_sampled(line, len(line.encode("utf-8")))
+
+    def _push_sampled(self, line: str, line_size: int):
+        """Extends the head while it fits into half the budget, then appends to the tail window, dropping its oldest lines beyond half the budget. The head may still grow after sampling starts, because a large header can trigger sampling before the head is full."""
+        if not self.head_closed and self.head_size + line_size <= self.max_bytes // 2:
+            self.lines.append(line)
+            self.head_size += line_size
+            return
+        self.head_closed = True
+        self.tail.append((line, line_size))
+        self.tail_size += line_size
+        while self.tail and self.tail_size > self.max_bytes // 2:
+            _, dropped_size = self.tail.popleft()
+            self.tail_size -= dropped_size
+            self.omitted += 1
+
+    def text(self) -> str:
+        """Returns the collected (possibly sampled) section."""
+        parts = self.header + self.lines
+        if self.sampling:
+            parts.append(f"... [{self.omitted} diff lines omitted] ...\n")
+            parts.extend(line for line, _ in self.tail)
+        section = "".join(parts)
+        return section if section.endswith("\n") else section + "\n"
+
+
+def iter_file_sections(
+    lines: Iterable[str], max_section_bytes: int = 0
+) -> Iterator[tuple[str, str, bool]]:
+    """Splits streamed diff lines into per-file sections as they arrive.
+
+    Args:
+        lines (Iterable[str]): Lines of a `git diff --no-renames` output.
+        max_section_bytes (int): Byte budget per section; larger sections are sampled from their head and tail while streaming. 0 keeps sections complete.
+
+    Yields:
+        tuple[str, str, bool]: The file path, its diff section, and whether the section was sampled.
+    """
+    current = None
+    for line in lines:
+        if line.startswith(DIFF_HEADER_PREFIX):
+            if current is not None:
+                yield current.path, current.text(), current.sampling
+            current = _SectionBuffer(parse_diff_header_path(line), max_section_bytes)
+        if current is not None:
+            current.add(line)
+    if current is not None:
+        yield current.path, current.text(), current.sampling
+
+
+__all__ = [
+    "DEFAULT_MAX_DIFF_BYTES",
+    "GitOutputStream",
+    "GitStreamError",
+    "iter_file_sections",
+]
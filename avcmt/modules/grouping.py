@@ -0,0 +1,239 @@
+# Copyright 2025 Andy Vandaric
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+# File: avcmt/modules/grouping.py
+# Description: Strategies for grouping changed files into commit groups.
+
+import re
+from collections import defaultdict
+from collections.abc import Callable
+from pathlib import PurePosixPath
+
+ROOT_GROUP = "root"
+DEFAULT_GROUPING = "directory"
+DEFAULT_MIN_GROUP_LINES = 20
+DEFAULT_MAX_GROUP_LINES = 2000
+
+GroupingStrategy = Callable[..., dict[str, list[str]]]
+
+_PART_SUFFIX = re.compile(r" \(part \d+/\d+\)$")
+
+
+def file_weight(stats: tuple[int | None, int | None] | None) -> int:
+    """Returns the weight of one file for balancing: the number of changed lines, or 1 for binary and unknown files.
+
+    Args:
+        stats (tuple | None): The (added, deleted) numstat counts of the file, if known.
+
+    Returns:
+        int: The weight of the file, at least 1.
+    """
+    if not stats or stats[0] is None:
+        return 1
+    return max(1, stats[0] + stats[1])
+
+
+def group_directory(group_name: str) -> str:
+    """Returns the directory a group stands for, without the "(part i/n)" suffix of a split group; the suffix tells the parts apart in logs and keys, but is not part of the commit scope.
+
+    Args:
+        group_name (str): The group name, e.g. "avcmt/modules" or "src/app (part 2/3)".
+
+    Returns:
+        str: The group name without its part suffix.
+    """
+    return _PART_SUFFIX.sub("", group_name)
+
+
+def _parent_group(group_name: str) -> str | None:
+    """Returns the group a directory can be merged into, or None for top-level directories and the root group, which are never merged so that every commit keeps a meaningful scope."""
+    parent = str(PurePosixPath(group_name).parent)
+    return None if group_name == ROOT_GROUP or parent == "." else parent
+
+
+def group_by_directory(files: list[str], **_options) -> dict[str, list[str]]:
+    """Groups files by their immediate parent directory; files at the top level are grouped under "root".
+
+    Args:
+        files (list[str]): The changed file paths.
+        **_options: Ignored; accepted so all strategies share one signature.
+
+    Returns:
+        dict[str, list[str]]: A dictionary mapping directory names to their files, in order of first appearance.
+    """
+    grouped = defaultdict(list)
+    for file_path in files:
+        parent_dir = str(PurePosixPath(file_path.rstrip("/")).parent)
+        grouped[ROOT_GROUP if parent_dir == "." else parent_dir].append(file_path)
+    return dict(grouped)
+
+
+def _merge_small_groups(
+    groups: dict[str, list[str]],
+    weight: Callable[[list[str]], int],
+    min_weight: int,
+    max_weight: int,
+) -> dict[str, list[str]]:
+    """Folds groups lighter than `min_weight` into their parent directory, level by level, as long as the merged group stays within `max_weight`.
+
+    A lone small directory is only folded into a parent that already has its own group; two or more small siblings are folded together even when the parent has no changes of its own.
+
+    Args:
+        groups (dict[str, list[str]]): The directory groups.
+        weight (Callable): Returns the weight of a list of files.
+        min_weight (int): Groups lighter than this are merge candidates.
+        max_weight (int): Merging never produces a group heavier than this.
+
+    Returns:
+        dict[str, list[str]]: The merged groups.
+    """
+    groups = dict(groups)
+    changed = True
+    while changed:
+        changed = False
+        small_by_parent = defaultdict(list)
+        for name, members in groups.items():
+            parent = _parent_group(name)
+            if parent is not None and weight(members) < min_weight:
+                small_by_parent[parent].append(name)
+        # Deepest parents first, so merges bubble up one level at a time.
+        for parent in sorted(small_by_parent, key=lambda p: -p.count("/")):
+            target = list(groups.get(parent, []))
+            target_weight = weight(target)
+            moved = []
+            for name in small_by_parent[parent]:
+                if name not in groups:
+                    continue
+                name_weight = weight(groups[name])
+                if target_weight + name_weight <= max_weight:
+                    target.extend(groups[name])
+                    target_weight += name_weight
+                    moved.append(name)
+            if not moved or (parent not in groups and len(moved) == 1):
+                continue
+            for name in moved:
+                del groups[name]
+            groups[parent] = target
+            changed = True
+    return groups
+
+
+def _split_large_group(
+    name: str, members: list[str], weights: dict[str, int], max_weight: int
+) -> dict[str, list[str]]:
+    """Splits a group heavier than `max_weight` into consecutive parts named "<name> (part i/n)". A single file heavier than the limit gets a part of its own.
+
+    Args:
+        name (str): The name of the group.
+        members (list[str]): The files of the group, in order.
+        weights (dict[str, int]): The weight of each file.
+        max_weight (int): The maximum weight of a part.
+
+    Returns:
+        dict[str, list[str]]: The parts, or the group itself if it fits.
+    """
+    parts: list[list[str]] = []
+    current, current_weight = [], 0
+    for file_path in members:
+        if current and current_weight + weights[file_path] > max_weight:
+            parts.append(current)
+            current, current_weight = [], 0
+        current.append(file_path)
+        current_weight += weights[file_path]
+    if current:
+        parts.append(current)
+    if len(parts) == 1:
+        return {name: members}
+    return {
+        f"{name} (part {i}/{len(parts)})": part for i, part in enumerate(parts, start=1)
+    }
+
+
+def group_by_size(
+    files: list[str],
+    file_stats: dict[str, tuple[int | None, int | None]] | None = None,
+    min_weight: int = DEFAULT_MIN_GROUP_LINES,
+    max_weight: int = DEFAULT_MAX_GROUP_LINES,
+    **_options,
+) -> dict[str, list[str]]:
+    """Groups files by directory, then balances the groups by changed-line count: small sibling directories are folded into their parent (never into the repository root) and groups above `max_weight` are split into parts. Group names stay directory names, so commit scopes remain meaningful.
+
+    Args:
+        files (list[str]): The changed file paths.
+        file_stats (dict | None): Numstat counts per path, as returned by `parse_numstat`.
+        min_weight (int): Groups with fewer changed lines are merged with their siblings (default is 20).
+        max_weight (int): Groups with more changed lines are split; 0 disables splitting (default is 2000).
+        **_options: Ignored; accepted so all strategies share one signature.
+
+    Returns:
+        dict[str, list[str]]: A dictionary mapping group names to their files, ordered by first appearance of their files.
+    """
+    file_stats = file_stats or {}
+    weights = {f: file_weight(file_stats.get(f)) for f in files}
+    max_weight = max_weight or sum(weights.values())
+
+    def weight(members: list[str]) -> int:
+        return sum(weights[f] for f in members)
+
+    merged = _merge_small_groups(
+        group_by_directory(files), weight, min_weight, max_weight
+    )
+    balanced: dict[str, list[str]] = {}
+    position = {f: i for i, f in enumerate(files)}
+    for name, members in sorted(
+        merged.items(), key=lambda item: min(position[f] for f in item[1])
+    ):
+        ordered = sorted(members, key=position.__getitem__)
+        balanced.update(_split_large_group(name, ordered, weights, max_weight))
+    return balanced
+
+
+GROUPING_STRATEGIES: dict[str, GroupingStrategy] = {
+    "directory": group_by_directory,
+    "balanced": group_by_size,
+}
+
+
+def get_grouping_strategy(name: str) -> GroupingStrategy:
+    """Looks up a grouping strategy by name.
+
+    Args:
+        name (str): The strategy name, e.g. "directory" or "balanced".
+
+    Returns:
+        GroupingStrategy: The grouping function.
+
+    Raises:
+        ValueError: If no strategy with that name exists.
+    """
+    try:
+        return GROUPING_STRATEGIES[name]
+    except KeyError:
+        available = ", ".join(sorted(GROUPING_STRATEGIES))
+        raise ValueError(
+            f"Unknown grouping strategy '{name}'. Available: {available}."
+        ) from None
+
+
+__all__ = [
+    "DEFAULT_GROUPING",
+    "DEFAULT_MAX_GROUP_LINES",
+    "DEFAULT_MIN_GROUP_LINES",
+    "GROUPING_STRATEGIES",
+    "file_weight",
+    "get_grouping_strategy",
+    "group_by_directory",
+    "group_by_size",
+    "group_directory",
+]
@@ -0,0 +1,378 @@
+# Copyright 2025 Andy Vandaric
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+# File: avcmt/modules/heuristic_message.py
+# Description: Rule-based conventional commit messages built from the structure of a diff, without any AI call.
+
+import ast
+import re
+from dataclasses import dataclass, field
+from pathlib import Path, PurePosixPath
+
+from avcmt.modules.diff_utils import split_diff_by_file
+from avcmt.modules.grouping import ROOT_GROUP, group_directory
+
+# A version string such as 1.2, 1.2.3 or 1.2.3-rc.1, optionally prefixed with "v".
+VERSION_PATTERN = re.compile(r"\bv?\d+(?:\.\d+)+(?:[-+][0-9A-Za-z.-]+)?\b")
+DOC_SUFFIXES = (".md", ".rst", ".txt", ".adoc")
+# Files whose leading whitespace is syntax, so re-indenting them is a real change.
+INDENT_SENSITIVE_SUFFIXES = (".py", ".pyi", ".pyx", ".yaml", ".yml", ".sass", ".pug")
+INDENT_SENSITIVE_NAMES = ("Makefile", "GNUmakefile")
+# Maximum number of bullet points in a heuristic message body.
+MAX_BULLETS = 10
+# Maximum number of symbols listed per file.
+MAX_SYMBOLS = 5
+
+_HUNK_HEADER = re.compile(r"^@@ -\d+(?:,\d+)? \+(\d+)(?:,\d+)? @@")
+
+
+@dataclass
+class FileChange:
+    """The structure of one file's diff section.
+
+    Args:
+        path (str): The path of the file.
+        status (str): "added", "deleted" or "modified".
+        added (list[str]): The added lines, without their "+" marker.
+        removed (list[str]): The removed lines, without their "-" marker.
+        touched (list[int]): New-side line numbers of added lines and of the places where lines were removed.
+        complete (bool): False if the section was summarized or sampled, so its lines are not the whole change.
+    """
+
+    path: str
+    status: str = "modified"
+    added: list[str] = field(default_factory=list)
+    removed: list[str] = field(default_factory=list)
+    touched: list[int] = field(default_factory=list)
+    complete: bool = True
+
+
+def parse_file_change(path: str, section: str) -> FileChange:
+    """Parses one file's (possibly shaped) diff section.
+
+    Args:
+        path (str): The path of the file.
+        section (str): The diff section of the file.
+
+    Returns:
+        FileChange: The parsed change.
+    """
+    change = FileChange(path=path)
+    header, _, body = section.partition("\n@@")
+    _parse_header(change, header)
+    new_line = 0
+    for line in f"@@{body}".splitlines() if body else []:
+        match = _HUNK_HEADER.match(line)
+        if match:
+            new_line = int(match.group(1))
+        elif line.startswith("+"):
+            change.added.append(line[1:])
+            change.touched.append(new_line)
+            new_line += 1
+        elif line.startswith("-"):
+            change.removed.append(line[1:])
+            change.touched.append(new_line)
+        elif line.startswith(" "):
+            new_line += 1
+        elif line.startswith(("... [", "[")):
+            change.complete = False
+    return change
+
+
+def _parse_header(change: FileChange, header: str):
+    """Sets the status and completeness of a change from the header lines of its diff section."""
+    for line in header.splitlines():
+        if line.startswith("new file mode"):
+            change.status = "added"
+        elif line.startswith("deleted file mode"):
+            change.status = "deleted"
+        elif line.startswith(("Binary files", "[")):
+            change.complete = False
+
+
+def scope_from_group(group_name: str) -> str:
+    """Derives the commit scope from a group name: the last directory component, or "root" for top-level files.
+
+    Args:
+        group_name (str): The group name, e.g. "avcmt/modules" or "src/app (part 2/3)".
+
+    Returns:
+        str: The scope.
+    """
+    name = group_directory(group_name)
+    if not name or name == ROOT_GROUP:
+        return ROOT_GROUP
+    return PurePosixPath(name).name
+
+
+def _significant(lines: list[str], keep_indent: bool = False) -> list[str]:
+    """Returns the lines with all whitespace removed, dropping blank lines; with `keep_indent`, the leading whitespace of each line is kept."""
+    significant = []
+    for line in lines:
+        text = line.lstrip()
+        if text:
+            indent = line[: len(line) - len(text)] if keep_indent else ""
+            significant.append(indent + re.sub(r"\s+", "", text))
+    return significant
+
+
+def _is_whitespace_only(change: FileChange) -> bool:
+    path = PurePosixPath(change.path)
+    keep_indent = (
+        path.suffix in INDENT_SENSITIVE_SUFFIXES or path.name in INDENT_SENSITIVE_NAMES
+    )
+    # A sampled or summarized section may hide real edits between the lines it shows.
+    return (
+        change.complete
+        and change.status == "modified"
+        and bool(change.added or change.removed)
+        and _significant(change.added, keep_indent)
+        == _significant(change.removed, keep_indent)
+    )
+
+
+def _is_version_bump(change: FileChange) -> bool:
+    if not change.complete or change.status != "modified" or not change.added:
+        return False
+    if len(change.added) != len(change.removed):
+        return False
+    return any(VERSION_PATTERN.search(new) for new in change.added) and all(
+        VERSION_PATTERN.sub("<version>", old) == VERSION_PATTERN.sub("<version>", new)
+        for old, new in zip(change.removed, change.added, strict=True)
+    )
+
+
+def _find_renames(changes: list[FileChange]) -> list[tuple[FileChange, FileChange]]:
+    """Pairs deleted files with added files of identical content, which `--no-renames` diffs show as a delete and an add."""
+    added = {
+        tuple(change.added): change
+        for change in changes
+        if change.status == "added" and change.complete and change.added
+    }
+    renames = []
+    for change in changes:
+        if change.status == "deleted" and change.complete and change.removed:
+            target = added.pop(tuple(change.removed), None)
+            if target:
+                renames.append((change, target))
+    return renames
+
+
+def _names(paths: list[str]) -> str:
+    """Joins up to three file names for a subject line, or counts the files."""
+    names = [PurePosixPath(path).name for path in paths]
+    max_names = 3
+    if len(names) > max_names:
+        return f"{len(names)} files"
+    return ", ".join(names)
+
+
+def _bullets(lines: list[str]) -> str:
+    """Formats body lines as bullet points, capped at `MAX_BULLETS`."""
+    shown = lines[:MAX_BULLETS]
+    if len(lines) > MAX_BULLETS:
+        shown.append(f"... and {len(lines) - MAX_BULLETS} more")
+    return "\n".join(f"- {line}" for line in shown)
+
+
+class HeuristicMessageGenerator:
+    """Builds conventional commit messages from the structure of a group diff, without an AI call.
+
+    Trivial changes — pure renames, deleted files, whitespace-only edits and version-string bumps — are recognized exactly and get a precise message. Any other diff gets a generic message: the type follows from the kind of files (docs, tests, new files), the scope from the group name, and the body names the touched functions and classes of Python files, found with `ast` in the working-tree version of the file.
+
+    Args:
+        repo_path (Path | str): The repository the diff paths are relative to.
+    """
+
+    def __init__(self, repo_path: Path | str = "."):
+        """Initializes the generator for a repository.
+
+        Args:
+            repo_path (Path | str): The repository the diff paths are relative to.
+        """
+        self.repo_path = Path(repo_path)
+
+    @staticmethod
+    def parse(diff: str) -> list[FileChange]:
+        """Parses a group diff into its file changes, in diff order."""
+        return [
+            parse_file_change(path, section)
+            for path, section in split_diff_by_file(diff).items()
+        ]
+
+    def trivial_message(self, group_name: str, diff: str) -> str | None:
+        """Returns a message if every file of the diff is a trivial change, otherwise None.
+
+        Args:
+            group_name (str): The name of the group.
+            diff (str): The shaped diff of the group.
+
+        Returns:
+            str | None: The commit message for a trivial diff, or None.
+        """
+        changes = self.parse(diff)
+        renames = _find_renames(changes)
+        renamed = {id(change) for pair in renames for change in pair}
+        rest = [change for change in changes if id(change) not in renamed]
+        deleted = [change for change in rest if change.status == "deleted"]
+        others = [change for change in rest if change.status != "deleted"]
+        scope = scope_from_group(group_name)
+        if not others:
+            return self._removal_message(scope, renames, deleted) if changes else None
+        # Edits are only trivial on their own; mixed with file moves the AI tells the story better.
+        if renames or deleted:
+            return None
+        if all(_is_version_bump(change) for change in others):
+            return self._version_message(scope, others)
+        if not all(_is_whitespace_only(change) for change in others):
+            return None
+        paths = [change.path for change in others]
+        return f"style({scope}): normalize whitespace in {_names(paths)}\n\n" + (
+            _bullets([f"Whitespace-only changes in `{path}`" for path in paths])
+        )
+
+    @staticmethod
+    def _removal_message(
+        scope: str,
+        renames: list[tuple[FileChange, FileChange]],
+        deleted: list[FileChange],
+    ) -> str:
+        """Builds the message of a diff that only renames and deletes files."""
+        body = [f"Rename `{old.path}` to `{new.path}`" for old, new in renames]
+        body += [f"Remove `{change.path}`" for change in deleted]
+        if len(renames) == 1 and not deleted:
+            old, new = renames[0]
+            subject = f"refactor({scope}): rename {_names([old.path])} to {_names([new.path])}"
+        elif renames and not deleted:
+            subject = (
+                f"refactor({scope}): rename {_names([new.path for _, new in renames])}"
+            )
+        elif deleted and not renames:
+            subject = f"chore({scope}): remove {_names([c.path for c in deleted])}"
+        else:
+            subject = f"refactor({scope}): rename {len(renames)} and remove {len(deleted)} file(s)"
+        return f"{subject}\n\n{_bullets(body)}"
+
+    @staticmethod
+    def _version_message(scope: str, changes: list[FileChange]) -> str:
+        """Builds the message of a version bump, naming the new version when it is unambiguous."""
+        versions = {
+            match.group(0)
+            for change in changes
+            for line in change.added
+            for match in VERSION_PATTERN.finditer(line)
+        }
+        target = f" to {versions.pop()}" if len(versions) == 1 else ""
+        body = _bullets([f"Update version in `{change.path}`" for change in changes])
+        return f"chore({scope}): bump version{target}\n\n{body}"
+
+    def _python_symbols(self, change: FileChange) -> list[str]:
+        """Returns the qualified names of the functions and classes the change touches, from the working-tree version of a Python file.
+
+        Args:
+            change (FileChange): The change of a Python file.
+
+        Returns:
+            list[str]: The touched symbols (all top-level definitions for an added file), or an empty list if the file cannot be parsed.
+        """
+        try:
+            tree = ast.parse((self.repo_path / change.path).read_text(encoding="utf-8"))
+        except (OSError, SyntaxError, ValueError):
+            return []
+        definitions = []
+
+        def visit(node: ast.AST, prefix: str):
+            for child in ast.iter_child_nodes(node):
+                if isinstance(
+                    child, ast.FunctionDef | ast.AsyncFunctionDef | ast.ClassDef
+                ):
+                    name = f"{prefix}{child.name}"
+                    definitions.append((child.lineno, child.end_lineno, name))
+                    visit(child, f"{name}.")
+
+        visit(tree, "")
+        if change.status == "added":
+            return [name for _, _, name in definitions if "." not in name]
+        symbols = []
+        for line in change.touched:
+            enclosing = [d for d in definitions if d[0] <= line <= (d[1] or d[0])]
+            if enclosing:
+                # The innermost definition starts last.
+                name = max(enclosing)[2]
+                if name not in symbols:
+                    symbols.append(name)
+        return symbols
+
+    def _describe(self, change: FileChange) -> str:
+        """Returns the body line of one file change."""
+        verb = {"added": "Add", "deleted": "Remove"}.get(change.status, "Update")
+        line = f"{verb} `{change.path}`"
+        if change.status != "deleted" and change.path.endswith(".py"):
+            symbols = self._python_symbols(change)
+            if symbols:
+                listed = ", ".join(f"`{s}`" for s in symbols[:MAX_SYMBOLS])
+                more = (
+                    f" and {len(symbols) - MAX_SYMBOLS} more"
+                    if len(symbols) > MAX_SYMBOLS
+                    else ""
+                )
+                line += f" ({listed}{more})"
+        return line
+
+    @staticmethod
+    def _commit_type(changes: list[FileChange]) -> str:
+        """Chooses the conventional commit type from the kind of files changed."""
+        paths = [PurePosixPath(change.path) for change in changes]
+        if all(path.suffix in DOC_SUFFIXES or "docs" in path.parts for path in paths):
+            return "docs"
+        if all(
+            "tests" in path.parts
+            or path.name.startswith("test_")
+            or path.stem.endswith("_test")
+            for path in paths
+        ):
+            return "test"
+        if all(change.status == "added" for change in changes):
+            return "feat"
+        return "chore"
+
+    def generate(self, group_name: str, diff: str) -> str:
+        """Builds a message for any group diff: the exact message of a trivial diff, otherwise a generic message listing the changed files and touched symbols.
+
+        Args:
+            group_name (str): The name of the group.
+            diff (str): The shaped diff of the group.
+
+        Returns:
+            str: The commit message, or an empty string if the diff has no file sections.
+        """
+        trivial = self.trivial_message(group_name, diff)
+        if trivial:
+            return trivial
+        changes = self.parse(diff)
+        if not changes:
+            return ""
+        scope = scope_from_group(group_name)
+        commit_type = self._commit_type(changes)
+        verb = "add" if commit_type == "feat" else "update"
+        subject = f"{commit_type}({scope}): {verb} {_names([c.path for c in changes])}"
+        return f"{subject}\n\n{_bullets([self._describe(c) for c in changes])}"
+
+
+__all__ = [
+    "FileChange",
+    "HeuristicMessageGenerator",
+    "parse_file_change",
+    "scope_from_group",
+]
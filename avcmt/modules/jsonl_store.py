@@ -0,0 +1,65 @@
+# Copyright 2025 Andy Vandaric
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+# File: avcmt/modules/jsonl_store.py
+# Description: Compaction policy shared by the append-only JSON Lines stores in "log/".
+
+import os
+from collections.abc import Iterable
+from pathlib import Path
+
+# A store is rewritten without superseded lines once they outnumber the live entries by this factor.
+COMPACT_FACTOR = 2
+# Superseded lines tolerated before compaction is considered, so small stores are never rewritten.
+COMPACT_MIN_LINES = 256
+
+
+def needs_compaction(lines: int, live: int) -> bool:
+    """Decides whether a store should be rewritten with its live entries only.
+
+    Args:
+        lines (int): The number of lines the store would have after the pending write.
+        live (int): The number of lines its live entries take.
+
+    Returns:
+        bool: True once the superseded lines dominate the store.
+    """
+    return lines > max(COMPACT_MIN_LINES, COMPACT_FACTOR * live)
+
+
+def rewrite_store(path: Path, lines: Iterable[str], durable: bool = False):
+    """Replaces a store with the given lines atomically: they are written to a temporary file next to it, which then replaces the store.
+
+    No lock is taken across processes. A line that another process appends between reading the store and replacing it is lost, and so is one of two concurrent rewrites. The stores sharing this policy are caches and histories, where a lost line only costs recomputing it, and the run journal, which is written by one run at a time.
+
+    Args:
+        path (Path): The store file.
+        lines (Iterable[str]): The new content, one JSON line each, with line endings.
+        durable (bool): Whether to force the new content to disk before it replaces the store.
+
+    Returns:
+        None
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    # Per process, so two processes compacting the same store never share a temporary file.
+    temp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    with temp_path.open("w", encoding="utf-8") as f:
+        f.writelines(lines)
+        if durable:
+            f.flush()
+            os.fsync(f.fileno())
+    temp_path.replace(path)
+
+
+__all__ = ["COMPACT_FACTOR", "COMPACT_MIN_LINES", "needs_compaction", "rewrite_store"]
@@ -0,0 +1,165 @@
+# Copyright 2025 Andy Vandaric
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+# File: avcmt/modules/latency_history.py
+# Description: Records the latency of AI requests and predicts the latency of future ones.
+
+import json
+import threading
+import time
+from pathlib import Path
+
+from avcmt.modules.jsonl_store import needs_compaction, rewrite_store
+
+DEFAULT_LATENCY_FILE = Path("log") / "ai_latency.jsonl"
+# Assumed latency of one request when no history exists for a model.
+DEFAULT_REQUEST_SECONDS = 5.0
+# Only the most recent samples per model are used, so the estimate follows provider changes.
+MAX_SAMPLES = 200
+
+
+class LatencyHistory:
+    """Stores the prompt size and duration of every AI request, per provider and model, and estimates how long a request of a given size will take.
+
+    Samples are appended as JSON lines like the commit message cache. The estimate is a least-squares fit of seconds against prompt bytes over the most recent samples of the model, which captures both the fixed round-trip cost and the per-byte cost of larger prompts. Older samples are never used, so once they dominate the store it is rewritten with the last `MAX_SAMPLES` samples of each model.
+
+    Args:
+        path (Path | str): Location of the JSON Lines store (default is "log/ai_latency.jsonl").
+    """
+
+    def __init__(self, path: Path | str = DEFAULT_LATENCY_FILE):
+        """Initializes the history for the given store file; samples are loaded lazily on first access.
+
+        Args:
+            path (Path | str): Location of the JSON Lines store.
+        """
+        self.path = Path(path)
+        self._samples: dict[str, list[dict]] | None = None
+        self._lines = 0
+        self._lock = threading.Lock()
+
+    def _load(self) -> dict[str, list[dict]]:
+        """Reads the store into memory on first use, skipping malformed lines.
+
+        Returns:
+            dict[str, list[dict]]: The sample entries per model, oldest first.
+        """
+        if self._samples is not None:
+            return self._samples
+        samples: dict[str, list[dict]] = {}
+        lines = 0
+        if self.path.exists():
+            with self.path.open(encoding="utf-8") as f:
+                for line in f:
+                    lines += 1
+                    try:
+                        entry = json.loads(line)
+                        entry["prompt_bytes"] = int(entry["prompt_bytes"])
+                        entry["seconds"] = float(entry["seconds"])
+                        samples.setdefault(entry["model"], []).append(entry)
+                    except (json.JSONDecodeError, KeyError, TypeError, ValueError):
+                        continue
+        self._samples = samples
+        self._lines = lines
+        return samples
+
+    def _recent(self, model: str) -> list[tuple[int, float]]:
+        """Returns the (prompt bytes, seconds) pairs of the samples used for estimates of a model."""
+        with self._lock:
+            entries = self._load().get(model, [])[-MAX_SAMPLES:]
+        return [(entry["prompt_bytes"], entry["seconds"]) for entry in entries]
+
+    def record(self, model: str, prompt_bytes: int, seconds: float):
+        """Appends the duration of one successful request to the history, compacting the store when unused samples dominate it.
+
+        Args:
+            model (str): The provider-qualified model, e.g. "pollinations/gemini".
+            prompt_bytes (int): The size of the prompt in bytes.
+            seconds (float): The duration of the request.
+
+        Returns:
+            None
+        """
+        entry = {
+            "model": model,
+            "prompt_bytes": prompt_bytes,
+            "seconds": round(seconds, 4),
+            "created": time.time(),
+        }
+        with self._lock:
+            samples = self._load()
+            samples.setdefault(model, []).append(entry)
+            live = sum(min(len(entries), MAX_SAMPLES) for entries in samples.values())
+            if needs_compaction(self._lines + 1, live):
+                self._rewrite(samples)
+                return
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with self.path.open("a", encoding="utf-8") as f:
+                f.write(json.dumps(entry) + "\n")
+            self._lines += 1
+
+    def _rewrite(self, samples: dict[str, list[dict]]):
+        """Drops the samples of each model beyond the last `MAX_SAMPLES` and replaces the store with the remaining ones, atomically."""
+        for model, entries in samples.items():
+            samples[model] = entries[-MAX_SAMPLES:]
+        rewrite_store(
+            self.path,
+            (
+                json.dumps(entry) + "\n"
+                for entries in samples.values()
+                for entry in entries
+            ),
+        )
+        self._lines = sum(len(entries) for entries in samples.values())
+
+    def sample_count(self, model: str) -> int:
+        """Returns the number of samples used for estimates of a model."""
+        return len(self._recent(model))
+
+    def estimate(self, model: str, prompt_bytes: int) -> float:
+        """Estimates the duration of a request from the recent history of the model.
+
+        Args:
+            model (str): The provider-qualified model.
+            prompt_bytes (int): The size of the prompt in bytes.
+
+        Returns:
+            float: The estimated seconds; `DEFAULT_REQUEST_SECONDS` without history, the mean duration when all samples have the same size.
+        """
+        samples = self._recent(model)
+        if not samples:
+            return DEFAULT_REQUEST_SECONDS
+        count = len(samples)
+        mean_bytes = sum(size for size, _ in samples) / count
+        mean_seconds = sum(seconds for _, seconds in samples) / count
+        variance = sum((size - mean_bytes) ** 2 for size, _ in samples)
+        if not variance:
+            return mean_seconds
+        slope = (
+            sum(
+                (size - mean_bytes) * (seconds - mean_seconds)
+                for size, seconds in samples
+            )
+            / variance
+        )
+        slope = max(slope, 0.0)
+        intercept = max(mean_seconds - slope * mean_bytes, 0.0)
+        return intercept + slope * prompt_bytes
+
+
+__all__ = [
+    "DEFAULT_LATENCY_FILE",
+    "DEFAULT_REQUEST_SECONDS",
+    "LatencyHistory",
+]
@@ -0,0 +1,248 @@
+# Copyright 2025 Andy Vandaric
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+# File: avcmt/modules/run_journal.py
+# Description: Crash-safe journal of a commit run, used to resume interrupted runs.
+
+import json
+import os
+import threading
+import time
+from pathlib import Path
+
+from avcmt.modules.jsonl_store import needs_compaction, rewrite_store
+
+DEFAULT_JOURNAL_FILE = Path("log") / "commit_journal.jsonl"
+
+
+class RunJournal:
+    """Records the progress of one `commit run` so that an interrupted run can be resumed: the planned groups with their diff hashes, the generated messages, and which groups were staged and committed.
+
+    Every event is appended as a JSON line and fsynced before the next step starts, so the journal reflects the repository state even after a crash or Ctrl-C. Starting a new run replaces the previous journal. Events that no longer matter for resuming (the message and staging events of committed groups) are dropped once they dominate the journal of a long run, which is then rewritten atomically.
+
+    Args:
+        path (Path | str): Location of the journal file (default is "log/commit_journal.jsonl").
+    """
+
+    def __init__(self, path: Path | str = DEFAULT_JOURNAL_FILE):
+        """Initializes the journal for the given file.
+
+        Args:
+            path (Path | str): Location of the journal file.
+        """
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        # The replayed state and line count of the run started by this process, used for compaction.
+        self._state: dict | None = None
+        self._lines = 0
+
+    def _append(self, event: str, mode: str = "a", **fields):
+        """Writes one event and forces it to disk, compacting the journal of the current run when superseded events dominate it.
+
+        Args:
+            event (str): The event type.
+            mode (str): The file mode; "w" starts a new journal.
+            **fields: The event payload.
+
+        Returns:
+            None
+        """
+        record = {"event": event, "time": time.time(), **fields}
+        with self._lock:
+            if mode == "w":
+                self._state, self._lines = self._empty_state(), 0
+            if self._state is not None:
+                self._apply(self._state, record)
+                if needs_compaction(self._lines + 1, self._live_lines(self._state)):
+                    rewrite_store(self.path, self._compacted(self._state), durable=True)
+                    self._lines = self._live_lines(self._state)
+                    return
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with self.path.open(mode, encoding="utf-8") as f:
+                f.write(json.dumps(record, ensure_ascii=False) + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+            self._lines += 1
+
+    @staticmethod
+    def _empty_state() -> dict:
+        """Returns the replayed state of an empty journal."""
+        return {
+            "head": None,
+            "groups": {},
+            "diff_hashes": {},
+            "messages": {},
+            "staged": {},
+            "committed": {},
+            "finished": False,
+        }
+
+    @staticmethod
+    def _live_lines(state: dict) -> int:
+        """Returns the number of events needed to replay a state, as written by `_compacted`."""
+        pending_messages = sum(
+            1 for group in state["messages"] if group not in state["committed"]
+        )
+        return (
+            1
+            + pending_messages
+            + len(state["staged"])
+            + len(state["committed"])
+            + int(state["finished"])
+        )
+
+    @staticmethod
+    def _compacted(state: dict) -> list[str]:
+        """Returns the smallest journal that replays to the same groups, staging and commits as `state`; messages of committed groups are not needed for resuming and are dropped."""
+
+        def line(event: str, **fields) -> str:
+            record = {"event": event, "time": time.time(), **fields}
+            return json.dumps(record, ensure_ascii=False) + "\n"
+
+        lines = [
+            line(
+                "start",
+                head=state["head"],
+                groups=[
+                    {
+                        "name": name,
+                        "files": files,
+                        "diff_hash": state["diff_hashes"].get(name),
+                    }
+                    for name, files in state["groups"].items()
+                ],
+            )
+        ]
+        lines += [
+            line("message", group=group, diff_hash=diff_hash, message=message)
+            for group, (diff_hash, message) in state["messages"].items()
+            if group not in state["committed"]
+        ]
+        lines += [
+            line("committed", group=group, commit=commit)
+            for group, commit in state["committed"].items()
+        ]
+        # Staged events are kept verbatim; they are only replayed after the commits they do not belong to.
+        lines += [
+            json.dumps(record, ensure_ascii=False) + "\n"
+            for record in state["staged"].values()
+        ]
+        if state["finished"]:
+            lines.append(line("finished"))
+        return lines
+
+    def start(
+        self,
+        groups: dict[str, list[str]],
+        diff_hashes: dict[str, str],
+        head: str | None = None,
+    ):
+        """Starts a new journal with the planned groups, replacing any previous one.
+
+        Args:
+            groups (dict[str, list[str]]): The planned groups and their files, in commit order.
+            diff_hashes (dict[str, str]): The diff hash (message cache key) of each group.
+            head (str | None): The commit HEAD pointed to when the run started.
+
+        Returns:
+            None
+        """
+        self._append(
+            "start",
+            mode="w",
+            head=head,
+            groups=[
+                {"name": name, "files": files, "diff_hash": diff_hashes.get(name)}
+                for name, files in groups.items()
+            ],
+        )
+
+    def record_message(self, group_name: str, diff_hash: str, message: str):
+        """Records the commit message generated for a group."""
+        self._append("message", group=group_name, diff_hash=diff_hash, message=message)
+
+    def record_staged(self, group_name: str, files: list[str], private: bool = False):
+        """Records that a group's files are about to be staged.
+
+        Args:
+            group_name (str): The group being staged.
+            files (list[str]): The files being staged.
+            private (bool): True if staging happens in a private index rather than the user's index.
+
+        Returns:
+            None
+        """
+        self._append("staged", group=group_name, files=files, private=private)
+
+    def record_committed(self, group_name: str, commit: str | None = None):
+        """Records that a group was committed, optionally with the new commit id."""
+        self._append("committed", group=group_name, commit=commit)
+
+    def finish(self):
+        """Marks the run as finished; a finished run has nothing to resume."""
+        self._append("finished")
+
+    def load(self) -> dict | None:
+        """Replays the journal into the state of the recorded run.
+
+        Returns:
+            dict | None: None if there is no journal, otherwise a dictionary with the keys "head", "groups" (name to files, in order), "diff_hashes", "messages" (name to (diff hash, message)), "staged" (name to the staged event of groups staged but not committed), "committed" (name to commit id) and "finished".
+        """
+        if not self.path.exists():
+            return None
+        state = self._empty_state()
+        with self.path.open(encoding="utf-8") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    # A torn last line from a crash mid-write carries no completed step.
+                    continue
+                self._apply(state, record)
+        return state
+
+    @staticmethod
+    def _apply(state: dict, record: dict):
+        """Applies one journal record to the replayed state."""
+        event, group = record.get("event"), record.get("group")
+        if event == "start":
+            state["head"] = record.get("head")
+            for entry in record.get("groups", []):
+                state["groups"][entry["name"]] = entry["files"]
+                state["diff_hashes"][entry["name"]] = entry.get("diff_hash")
+        elif event == "message":
+            state["messages"][group] = (record.get("diff_hash"), record["message"])
+        elif event == "staged":
+            state["staged"][group] = record
+        elif event == "committed":
+            state["staged"].pop(group, None)
+            state["committed"][group] = record.get("commit")
+        elif event == "finished":
+            state["finished"] = True
+
+    def clear(self) -> bool:
+        """Deletes the journal file.
+
+        Returns:
+            bool: True if the file was found and deleted, False otherwise.
+        """
+        with self._lock:
+            self._state, self._lines = None, 0
+            if self.path.exists():
+                self.path.unlink()
+                return True
+        return False
+
+
+__all__ = ["DEFAULT_JOURNAL_FILE", "RunJournal"]
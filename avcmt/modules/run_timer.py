@@ -0,0 +1,130 @@
+# Copyright 2025 Andy Vandaric
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+# File: avcmt/modules/run_timer.py
+# Description: Thread-safe phase timers and counters for reporting where a commit run spends its time.
+
+import json
+import threading
+import time
+from collections import defaultdict
+from collections.abc import Generator
+from contextlib import contextmanager
+from pathlib import Path
+
+
+class PhaseTimer:
+    """Accumulates wall-clock time per phase (optionally per group) and named counters for one run.
+
+    Timers may be entered from several threads at once; phases that run concurrently (e.g. AI requests with `--jobs`) therefore add up to more than the wall time of the run.
+    """
+
+    def __init__(self):
+        """Initializes an empty timer; the wall clock starts immediately."""
+        self._lock = threading.Lock()
+        self._started = time.perf_counter()
+        self._finished: float | None = None
+        self.phases: dict[str, list[float]] = defaultdict(lambda: [0.0, 0])
+        self.groups: dict[str, dict[str, float]] = defaultdict(
+            lambda: defaultdict(float)
+        )
+        self.counters: dict[str, int] = defaultdict(int)
+
+    @contextmanager
+    def phase(self, name: str, group: str | None = None) -> Generator[None]:
+        """Times the enclosed block and adds it to the phase, and to the group if one is given.
+
+        Args:
+            name (str): The phase name, e.g. "scan" or "stage".
+            group (str | None): The commit group the work belongs to, if any.
+
+        Yields:
+            None
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            with self._lock:
+                totals = self.phases[name]
+                totals[0] += elapsed
+                totals[1] += 1
+                if group is not None:
+                    self.groups[group][name] += elapsed
+
+    def count(self, name: str, amount: int = 1):
+        """Adds `amount` to a named counter (e.g. subprocesses started or bytes processed)."""
+        with self._lock:
+            self.counters[name] += amount
+
+    def stop(self):
+        """Stops the wall clock of the run."""
+        self._finished = time.perf_counter()
+
+    @property
+    def wall_seconds(self) -> float:
+        """Returns the wall time of the run so far, or until `stop` was called."""
+        return (self._finished or time.perf_counter()) - self._started
+
+    def to_dict(self) -> dict:
+        """Returns the collected timings as a JSON-serializable dictionary.
+
+        Returns:
+            dict: The wall time, per-phase totals and call counts, per-group phase times and counters.
+        """
+        with self._lock:
+            return {
+                "wall_seconds": round(self.wall_seconds, 4),
+                "phases": {
+                    name: {"seconds": round(seconds, 4), "count": count}
+                    for name, (seconds, count) in self.phases.items()
+                },
+                "groups": {
+                    group: {name: round(seconds, 4) for name, seconds in phases.items()}
+                    for group, phases in self.groups.items()
+                },
+                "counters": dict(self.counters),
+            }
+
+    def format_table(self) -> str:
+        """Renders the per-phase totals and counters as a plain-text table.
+
+        Returns:
+            str: The table, one phase or counter per line.
+        """
+        data = self.to_dict()
+        wall = data["wall_seconds"] or 1e-9
+        lines = [f"{'phase':<16}{'calls':>7}{'seconds':>11}{'% wall':>9}"]
+        for name, totals in sorted(
+            data["phases"].items(), key=lambda item: -item[1]["seconds"]
+        ):
+            lines.append(
+                f"{name:<16}{totals['count']:>7}{totals['seconds']:>11.3f}"
+                f"{100 * totals['seconds'] / wall:>8.1f}%"
+            )
+        lines.append(f"{'wall':<16}{'':>7}{data['wall_seconds']:>11.3f}{100:>8.1f}%")
+        lines.extend(
+            f"{name:<23}{value:>11}" for name, value in sorted(data["counters"].items())
+        )
+        return "\n".join(lines)
+
+    def write_json(self, path: Path | str):
+        """Writes the timings to a JSON file, creating parent directories as needed."""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(self.to_dict(), indent=2), encoding="utf-8")
+
+
+__all__ = ["PhaseTimer"]
@@ -0,0 +1,80 @@
+# Copyright 2025 Andy Vandaric
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+# File: avcmt/modules/scheduling.py
+# Description: Cost estimates and longest-first (LPT) dispatch order for concurrent message generation.
+
+import heapq
+from collections.abc import Iterable
+
+from avcmt.modules.grouping import file_weight
+
+# Fixed cost of one AI request (connection, queueing, output tokens), in prompt-byte equivalents.
+REQUEST_COST = 2000
+# Extra cost per changed line, which drives the length of the generated message.
+LINE_COST = 16
+
+
+def estimate_group_cost(
+    files: Iterable[str],
+    file_stats: dict[str, tuple[int | None, int | None]],
+    prompt_bytes: int,
+) -> int:
+    """Estimates the relative cost of generating one group's message from its numstat line counts and prompt size.
+
+    Args:
+        files (Iterable[str]): The files of the group.
+        file_stats (dict): Numstat counts per path, as returned by `parse_numstat`.
+        prompt_bytes (int): The size of the group's diff as it goes into the prompt.
+
+    Returns:
+        int: The estimated cost, in prompt-byte equivalents.
+    """
+    changed_lines = sum(file_weight(file_stats.get(f)) for f in files)
+    return REQUEST_COST + prompt_bytes + LINE_COST * changed_lines
+
+
+def longest_first(costs: dict[str, float]) -> list[str]:
+    """Returns the group names ordered by decreasing cost; ties keep their original order.
+
+    Args:
+        costs (dict[str, float]): The estimated cost of each group.
+
+    Returns:
+        list[str]: The dispatch order.
+    """
+    return sorted(costs, key=lambda name: -costs[name])
+
+
+def predict_makespan(costs: Iterable[float], workers: int) -> float:
+    """Simulates list scheduling: each job, in the given order, starts on the worker that becomes free first. This is exactly how a thread pool consumes its queue.
+
+    Args:
+        costs (Iterable[float]): The job costs in dispatch order.
+        workers (int): The number of parallel workers.
+
+    Returns:
+        float: The time at which the last job finishes, in the unit of the costs.
+    """
+    loads = [0.0] * max(1, workers)
+    for cost in costs:
+        heapq.heapreplace(loads, loads[0] + cost)
+    return max(loads)
+
+
+__all__ = [
+    "estimate_group_cost",
+    "longest_first",
+    "predict_makespan",
+]
@@ -17,9 +17,24 @@
 
 # --- IMPORT CHANGE ---
 # Import the main OpenAI class, not the entire module.
+from functools import lru_cache
+
 from openai import OpenAI
 
 
+@lru_cache(maxsize=8)
+def _get_client(api_key: str) -> OpenAI:
+    """Returns the OpenAI client for an API key, creating it on first use. The client is shared by all calls in the process, so requests reuse its connection pool instead of starting cold.
+
+    Args:
+        api_key (str): OpenAI API key.
+
+    Returns:
+        OpenAI: The shared client.
+    """
+    return OpenAI(api_key=api_key)
+
+
 class OpenaiProvider:
     """Generates a response string using the OpenAI ChatCompletion API based on the provided prompt and parameters. This method initializes an OpenAI client with the given API key, sends a chat completion request with specified model and additional parameters, and returns the content of the generated message.
 
@@ -40,7 +55,7 @@ class OpenaiProvider:
     ) -> str:
         """Generates a response from the OpenAI ChatCompletion API based on the provided prompt and parameters.
 
-        Creates a client instance with the specified API key, sends a chat completion request using the selected model and additional parameters, and returns the generated message content as a string.
+        Reuses the shared client for the specified API key, sends a chat completion request using the selected model and additional parameters, and returns the generated message content as a string.
 
         Args:
             prompt (str): Prompt input.
@@ -52,9 +67,9 @@ class OpenaiProvider:
             str: Generated response content.
         """
         # --- LOGIC CHANGE ---
-        # 1. Create a client instance with the API key.
+        # 1. Get the shared client instance for the API key.
         try:
-            client = OpenAI(api_key=api_key)
+            client = _get_client(api_key)
         except Exception as e:
             # Add error handling if the client fails to initialize
             raise RuntimeError(f"Failed to initialize OpenAI client: {e}")
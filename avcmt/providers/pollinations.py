@@ -14,9 +14,11 @@
 
 # File: avcmt/providers/pollinations.py
 
+import threading
 import time
 
 import requests
+from requests.adapters import HTTPAdapter
 
 
 class PollinationsProvider:
@@ -39,6 +41,25 @@ class PollinationsProvider:
     API_URL = "https://text.pollinations.ai/openai"
     RETRY_DELAY = 2  # seconds
     TIMEOUT = 60  # seconds
+    POOL_SIZE = 32  # keep-alive connections shared by all threads of the process
+
+    _session: requests.Session | None = None
+    _session_lock = threading.Lock()
+
+    @classmethod
+    def _get_session(cls) -> requests.Session:
+        """Returns the HTTP session shared by all provider instances, so that consecutive and concurrent requests (also across repositories in a batch run) reuse warm keep-alive connections instead of opening a new one each time.
+
+        Returns:
+            requests.Session: The shared session.
+        """
+        with cls._session_lock:
+            if cls._session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=1, pool_maxsize=cls.POOL_SIZE)
+                session.mount("https://", adapter)
+                cls._session = session
+            return cls._session
 
     def generate(self, prompt, api_key, model="gemini", retries=3, **kwargs):
         """Generates a response from Pollinations AI based on the input prompt and specified parameters, handling retries upon failure.
@@ -89,7 +110,7 @@ class PollinationsProvider:
             "Authorization": f"Bearer {api_key}",
             "Content-Type": "application/json",
         }
-        response = requests.post(
+        response = self._get_session().post(
             self.API_URL, json=payload, headers=headers, timeout=self.TIMEOUT
         )
         response.raise_for_status()
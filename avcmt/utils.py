@@ -243,12 +243,12 @@ def get_staged_files() -> list[str]:
     """
     try:
         output = subprocess.run(
-            ["git", "diff", "--name-only", "--cached"],
+            ["git", "diff", "--name-only", "--cached", "-z"],
             capture_output=True,
             text=True,
             check=True,
         ).stdout
-        return [line for line in output.splitlines() if line]
+        return [path for path in output.split("\0") if path]
     except subprocess.CalledProcessError:
         return []
 
@@ -0,0 +1,270 @@
+#!/usr/bin/env python3
+"""Benchmark CommitGenerator on synthetic git repositories with an offline stub provider.
+
+Every scenario builds a fresh repository of the requested shape, runs one commit run
+against it in a separate process and records wall time, git subprocess count, peak RSS
+and prompt bytes. Results are written as JSON so runs can be compared across versions:
+
+    poetry run benchmark --output log/benchmark-1.7.0.json
+    poetry run benchmark --preset large --jobs 4 --latency 0.2
+"""
+
+import argparse
+import json
+import logging
+import multiprocessing
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+import types
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+from importlib import metadata
+from pathlib import Path
+
+from avcmt.modules.commit_cache import CommitMessageCache
+from avcmt.modules.commit_generator import CommitGenerator
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+STUB_PROVIDER = "benchmark"
+
+
+@dataclass
+class Scenario:
+    name: str
+    dirs: int = 10
+    files_per_dir: int = 10
+    changed_lines: int = 20
+    modified_ratio: float = 0.5
+    deleted_ratio: float = 0.05
+    untracked_ratio: float = 0.1
+    binary_files: int = 2
+    seed: int = 0
+
+
+PRESETS = {
+    "small": Scenario("small", dirs=3, files_per_dir=5),
+    "medium": Scenario("medium", dirs=20, files_per_dir=20, changed_lines=40),
+    "large": Scenario(
+        "large", dirs=60, files_per_dir=40, changed_lines=200, binary_files=10
+    ),
+    "huge-diff": Scenario(
+        "huge-diff", dirs=5, files_per_dir=4, changed_lines=20000, modified_ratio=1.0
+    ),
+}
+
+
+class BenchmarkProvider:
+    """Offline stand-in for an AI provider: answers instantly (or after `latency`) with a fixed message."""
+
+    latency = 0.0
+
+    def generate(self, prompt, api_key, model=None, **kwargs):
+        time.sleep(self.latency)
+        return f"chore: update files\n\n- prompt of {len(prompt)} bytes"
+
+
+def register_stub_provider(latency: float):
+    """Makes the stub importable as `avcmt.providers.benchmark`, where `generate_with_ai` looks it up."""
+    module = types.ModuleType(f"avcmt.providers.{STUB_PROVIDER}")
+    BenchmarkProvider.latency = latency
+    module.BenchmarkProvider = BenchmarkProvider
+    sys.modules[module.__name__] = module
+    os.environ.setdefault(f"{STUB_PROVIDER.upper()}_API_KEY", "offline")
+
+
+def git(repo: Path, *args: str):
+    subprocess.run(["git", *args], cwd=repo, check=True, capture_output=True)
+
+
+def source_lines(rng: random.Random, count: int) -> str:
+    return "".join(f"value_{rng.randrange(10**6)} = {i}\n" for i in range(count))
+
+
+def build_repository(repo: Path, scenario: Scenario):
+    """Creates a committed baseline of the scenario's shape, then modifies, deletes and adds files."""
+    rng = random.Random(scenario.seed)
+    git(repo, "init", "-q")
+    git(repo, "config", "user.email", "benchmark@example.com")
+    git(repo, "config", "user.name", "benchmark")
+    git(repo, "config", "commit.gpgsign", "false")
+    (repo / ".gitignore").write_text("log/\n", encoding="utf-8")
+    tracked = []
+    for d in range(scenario.dirs):
+        directory = repo / f"pkg{d:03d}"
+        directory.mkdir()
+        for f in range(scenario.files_per_dir):
+            path = directory / f"module{f:03d}.py"
+            path.write_text(source_lines(rng, 50), encoding="utf-8")
+            tracked.append(path)
+    for b in range(scenario.binary_files):
+        (repo / f"pkg{b % scenario.dirs:03d}" / f"asset{b}.bin").write_bytes(
+            rng.randbytes(4096)
+        )
+    git(repo, "add", "-A")
+    git(repo, "commit", "-q", "-m", "baseline")
+
+    for path in tracked:
+        roll = rng.random()
+        if roll < scenario.deleted_ratio:
+            path.unlink()
+        elif roll < scenario.deleted_ratio + scenario.modified_ratio:
+            with path.open("a", encoding="utf-8") as f:
+                f.write(source_lines(rng, scenario.changed_lines))
+    for i in range(int(len(tracked) * scenario.untracked_ratio)):
+        path = repo / f"pkg{i % scenario.dirs:03d}" / f"new{i:03d}.py"
+        path.write_text(source_lines(rng, scenario.changed_lines), encoding="utf-8")
+    for b in range(scenario.binary_files):
+        (repo / f"pkg{b % scenario.dirs:03d}" / f"asset{b}.bin").write_bytes(
+            rng.randbytes(4096)
+        )
+
+
+def peak_rss_kib() -> int | None:
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and in KiB elsewhere.
+    return peak // 1024 if sys.platform == "darwin" else peak
+
+
+def run_scenario(scenario: Scenario, options: dict) -> dict:
+    """Runs one scenario; meant to execute in a fresh process so peak RSS is its own."""
+    register_stub_provider(options.pop("latency"))
+    logger = logging.getLogger("avcmt.benchmark")
+    logger.addHandler(logging.NullHandler())
+    logger.propagate = False
+    with tempfile.TemporaryDirectory(prefix="avcmt-bench-") as tmp:
+        repo = Path(tmp) / "repo"
+        repo.mkdir()
+        started = time.perf_counter()
+        build_repository(repo, scenario)
+        setup_seconds = time.perf_counter() - started
+        generator = CommitGenerator(
+            provider=STUB_PROVIDER,
+            repo_path=repo,
+            logger=logger,
+            offline=True,
+            message_cache=CommitMessageCache(Path(tmp) / "cache.jsonl"),
+            **options,
+        )
+        started = time.perf_counter()
+        generator.run()
+        wall_seconds = time.perf_counter() - started
+    counters = generator.timer.counters
+    return {
+        "scenario": asdict(scenario),
+        "setup_seconds": round(setup_seconds, 4),
+        "wall_seconds": round(wall_seconds, 4),
+        "git_subprocesses": counters.get("git_subprocesses", 0),
+        "peak_rss_kib": peak_rss_kib(),
+        "prompt_bytes": counters.get("prompt_bytes", 0),
+        "ai_requests": counters.get("ai_requests", 0),
+        "diff_bytes_read": counters.get("diff_bytes_read", 0),
+        "groups": len(generator.successful_groups) + len(generator.failed_groups),
+        "phases": generator.timer.to_dict()["phases"],
+    }
+
+
+def package_version() -> str:
+    try:
+        return metadata.version("avcmt-py")
+    except metadata.PackageNotFoundError:
+        return "unknown"
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--preset",
+        action="append",
+        choices=sorted(PRESETS),
+        help="Scenario preset to run; repeatable (default: small, medium, large).",
+    )
+    parser.add_argument("--dirs", type=int, help="Custom scenario: directories.")
+    parser.add_argument("--files-per-dir", type=int, default=10)
+    parser.add_argument("--changed-lines", type=int, default=20)
+    parser.add_argument("--modified-ratio", type=float, default=0.5)
+    parser.add_argument("--deleted-ratio", type=float, default=0.05)
+    parser.add_argument("--untracked-ratio", type=float, default=0.1)
+    parser.add_argument("--binary-files", type=int, default=2)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=1, help="Runs per scenario.")
+    parser.add_argument("--jobs", type=int, default=1, help="CommitGenerator jobs.")
+    parser.add_argument("--grouping", default="directory")
+    parser.add_argument("--private-index", action="store_true")
+    parser.add_argument("--dry-run", action="store_true")
+    parser.add_argument(
+        "--latency", type=float, default=0.0, help="Simulated AI latency in seconds."
+    )
+    parser.add_argument("--output", default="log/benchmark.json")
+    return parser.parse_args(argv)
+
+
+def scenarios_from_args(args: argparse.Namespace) -> list[Scenario]:
+    if args.dirs:
+        return [
+            Scenario(
+                "custom",
+                dirs=args.dirs,
+                files_per_dir=args.files_per_dir,
+                changed_lines=args.changed_lines,
+                modified_ratio=args.modified_ratio,
+                deleted_ratio=args.deleted_ratio,
+                untracked_ratio=args.untracked_ratio,
+                binary_files=args.binary_files,
+                seed=args.seed,
+            )
+        ]
+    return [PRESETS[name] for name in args.preset or ["small", "medium", "large"]]
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    logger = logging.getLogger("benchmark")
+    options = {
+        "jobs": args.jobs,
+        "grouping": args.grouping,
+        "private_index": args.private_index,
+        "dry_run": args.dry_run,
+        "latency": args.latency,
+    }
+    results = []
+    context = multiprocessing.get_context("spawn")
+    for scenario in scenarios_from_args(args):
+        for run in range(args.repeat):
+            with context.Pool(1) as pool:
+                result = pool.apply(run_scenario, (scenario, dict(options)))
+            result["run"] = run
+            results.append(result)
+            logger.info(
+                f"{scenario.name:<10} run {run}: {result['wall_seconds']:.3f}s, "
+                f"{result['git_subprocesses']} git calls, "
+                f"{result['peak_rss_kib']} KiB peak RSS, "
+                f"{result['prompt_bytes']} prompt bytes, {result['groups']} groups"
+            )
+    report = {
+        "avcmt_version": package_version(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "options": options,
+        "results": results,
+    }
+    output = Path(args.output)
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=2), encoding="utf-8")
+    logger.info(f"✅ Results written to {output}")
+
+
+if __name__ == "__main__":
+    main()
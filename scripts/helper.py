@@ -33,6 +33,10 @@ def main():
     table.add_row("[magenta]format[/]", "Format codebase with Ruff Format and auto-fix")
     table.add_row("[yellow]lintfix[/]", "Run Ruff lint + auto-fix (import order, etc)")
     table.add_row("[cyan]check[/]", "Run all pre-commit hooks on all files")
+    table.add_row(
+        "[blue]benchmark[/]",
+        "Benchmark commit runs on synthetic repos, results as JSON",
+    )
     table.add_row("[white]helper[/]", "Show this list of available commands")
 
     console.print(table)
@@ -42,6 +46,7 @@ def main():
     console.print("  poetry run format")
     console.print("  poetry run lintfix")
     console.print("  poetry run check")
+    console.print("  poetry run benchmark")
     console.print("  poetry run helper\n")
     logger.info("Displayed help commands.")
     console.print("  \n")
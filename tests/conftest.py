@@ -0,0 +1,76 @@
+"""Shared fixtures: throwaway git repositories and an offline AI provider."""
+
+import re
+import subprocess
+import sys
+import types
+from pathlib import Path
+from typing import ClassVar
+
+import pytest
+
+FAKE_PROVIDER = "fake"
+
+
+class FakeProvider:
+    """Offline provider that answers with a message naming the prompt's directory and records every prompt."""
+
+    prompts: ClassVar[list[str]] = []
+    response: ClassVar[str | None] = None
+
+    def generate(self, prompt, api_key, model=None, **kwargs):
+        provider = type(self)
+        provider.prompts.append(prompt)
+        if provider.response is not None:
+            return provider.response
+        match = re.search(r"directory `(.*?)`", prompt)
+        scope = match.group(1) if match else "root"
+        return f"feat({scope}): update {scope}\n\n- change"
+
+
+@pytest.fixture(autouse=True)
+def isolated_cwd(tmp_path, monkeypatch):
+    """Runs every test in its own directory, so default log files never land in the checkout."""
+    monkeypatch.chdir(tmp_path)
+
+
+@pytest.fixture
+def fake_provider(monkeypatch):
+    """Registers `FakeProvider` as `avcmt.providers.fake` and resets its recorded prompts."""
+    module = types.ModuleType(f"avcmt.providers.{FAKE_PROVIDER}")
+    module.FakeProvider = FakeProvider
+    monkeypatch.setitem(sys.modules, module.__name__, module)
+    monkeypatch.setenv(f"{FAKE_PROVIDER.upper()}_API_KEY", "offline")
+    FakeProvider.prompts = []
+    FakeProvider.response = None
+    return FakeProvider
+
+
+def git(repo: Path, *args: str) -> str:
+    """Runs a git command in `repo` and returns its output."""
+    return subprocess.run(
+        ["git", *args], cwd=repo, check=True, capture_output=True, text=True
+    ).stdout
+
+
+def write(path: Path, text: str):
+    """Writes `text` to `path`, creating parent directories."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text, encoding="utf-8")
+
+
+@pytest.fixture
+def repo(tmp_path):
+    """A git repository with one commit containing `a/x.py` and `b/y.py`; `log/` is ignored."""
+    path = tmp_path / "repo"
+    path.mkdir()
+    git(path, "init", "-q")
+    git(path, "config", "user.email", "test@example.com")
+    git(path, "config", "user.name", "test")
+    git(path, "config", "commit.gpgsign", "false")
+    write(path / ".gitignore", "log/\n")
+    write(path / "a" / "x.py", "x = 1\n")
+    write(path / "b" / "y.py", "y = 1\n")
+    git(path, "add", "-A")
+    git(path, "commit", "-q", "-m", "init")
+    return path
@@ -0,0 +1,19 @@
+import json
+
+from scripts import benchmark
+
+
+def test_benchmark_reports_every_run_of_a_custom_scenario(tmp_path):
+    output = tmp_path / "benchmark.json"
+    scenario = ["--dirs", "2", "--files-per-dir", "3", "--repeat", "2", "--dry-run"]
+
+    benchmark.main([*scenario, "--output", str(output)])
+
+    report = json.loads(output.read_text())
+    assert report["options"]["dry_run"] is True
+    assert [result["run"] for result in report["results"]] == [0, 1]
+    for result in report["results"]:
+        assert result["scenario"]["name"] == "custom"
+        assert result["groups"] == result["ai_requests"] > 0
+        assert result["git_subprocesses"] > 0
+        assert result["prompt_bytes"] > 0
@@ -0,0 +1,48 @@
+import pytest
+
+from avcmt.modules.commit_batch import resolve_repositories, run_commit_batch
+from avcmt.modules.commit_generator import CommitError
+
+from .conftest import FAKE_PROVIDER, git, write
+
+
+def _clone(repo, name):
+    clone = repo.parent / name
+    git(repo.parent, "clone", "-q", str(repo), name)
+    git(clone, "config", "user.email", "test@example.com")
+    git(clone, "config", "user.name", "test")
+    return clone
+
+
+def test_repositories_are_read_from_a_list_file(repo, tmp_path):
+    other = _clone(repo, "other")
+    listing = tmp_path / "repos.txt"
+    listing.write_text("# projects\nrepo\n\nother\n./repo\n")
+
+    assert resolve_repositories(str(listing)) == [repo, other]
+
+
+def test_repositories_are_matched_by_glob(repo, tmp_path, monkeypatch):
+    other = _clone(repo, "other")
+    (tmp_path / "not-a-repo").mkdir()
+    monkeypatch.chdir(tmp_path)
+
+    assert resolve_repositories("*") == [other, repo]
+    with pytest.raises(CommitError, match="No repositories found"):
+        resolve_repositories("missing-*")
+
+
+def test_batch_shares_messages_and_reports_failures(repo, tmp_path, fake_provider):
+    other = _clone(repo, "other")
+    for path in (repo, other):
+        write(path / "a" / "x.py", "x = 2\n")
+
+    report = run_commit_batch(
+        [repo, other, tmp_path / "missing"], repo_jobs=1, provider=FAKE_PROVIDER
+    )
+
+    assert len(fake_provider.prompts) == 1
+    assert [result.committed_groups for result in report.results] == [["a"], ["a"], []]
+    assert git(other, "log", "-1", "--format=%s") == "feat(a): update a\n"
+    assert [result.path for result in report.failures] == [tmp_path / "missing"]
+    assert "2 of 3 repositories succeeded" in report.format_summary()
@@ -0,0 +1,34 @@
+import pytest
+
+from avcmt.modules import jsonl_store
+from avcmt.modules.commit_cache import CommitMessageCache
+
+
+@pytest.fixture
+def small_stores(monkeypatch):
+    monkeypatch.setattr(jsonl_store, "COMPACT_MIN_LINES", 4)
+
+
+def _line_count(path):
+    return len(path.read_text(encoding="utf-8").splitlines())
+
+
+def test_rewritten_keys_are_compacted(tmp_path, small_stores):
+    cache = CommitMessageCache(tmp_path / "cache.jsonl")
+    for i in range(20):
+        cache.put("key", f"message {i}")
+
+    assert _line_count(cache.path) <= jsonl_store.COMPACT_MIN_LINES
+    assert CommitMessageCache(cache.path).get("key") == "message 19"
+
+
+def test_store_keeps_the_most_recent_entries(tmp_path, small_stores, monkeypatch):
+    monkeypatch.setattr(CommitMessageCache, "MAX_ENTRIES", 3)
+    cache = CommitMessageCache(tmp_path / "cache.jsonl")
+    for i in range(20):
+        cache.put(f"key {i}", f"message {i}")
+
+    reloaded = CommitMessageCache(cache.path)
+    assert _line_count(cache.path) <= jsonl_store.COMPACT_FACTOR * 3
+    assert reloaded.get("key 19") == "message 19"
+    assert reloaded.get("key 0") is None
@@ -0,0 +1,368 @@
+import os
+import time
+
+import pytest
+
+from avcmt.modules.commit_generator import CommitError, CommitGenerator
+from avcmt.modules.commit_watcher import CommitWatcher
+
+from .conftest import FAKE_PROVIDER, FakeProvider, git, write
+
+
+def _log(repo):
+    return git(repo, "log", "--format=%s").splitlines()
+
+
+def test_concurrent_messages_are_committed_in_group_order(
+    repo, fake_provider, monkeypatch
+):
+    write(repo / "a" / "x.py", "x = 2\n")
+    write(repo / "b" / "y.py", "y = 2\n")
+    generate = FakeProvider.generate
+
+    def answer_first_group_last(provider, prompt, api_key, model=None, **kwargs):
+        if "directory `a`" in prompt:
+            time.sleep(0.5)
+        return generate(provider, prompt, api_key, model, **kwargs)
+
+    monkeypatch.setattr(FakeProvider, "generate", answer_first_group_last)
+    CommitGenerator(provider=FAKE_PROVIDER, repo_path=repo, jobs=2).run()
+
+    assert "directory `b`" in fake_provider.prompts[0]
+    assert _log(repo) == ["feat(b): update b", "feat(a): update a", "init"]
+
+
+@pytest.mark.parametrize(
+    ("key", "value"),
+    [
+        ("diff.noprefix", "true"),
+        ("diff.mnemonicPrefix", "true"),
+        ("diff.external", "true"),
+    ],
+)
+def test_diff_ignores_user_diff_config(repo, fake_provider, key, value):
+    git(repo, "config", key, value)
+    write(repo / "a" / "x.py", "x = 2\n")
+
+    generator = CommitGenerator(provider=FAKE_PROVIDER, repo_path=repo, dry_run=True)
+    generator.run()
+
+    assert not generator.failed_groups
+    assert len(fake_provider.prompts) == 1
+    assert "+x = 2" in fake_provider.prompts[0]
+
+
+def test_group_without_diff_is_reported_as_failed(repo, fake_provider, monkeypatch):
+    write(repo / "a" / "x.py", "x = 2\n")
+    generator = CommitGenerator(provider=FAKE_PROVIDER, repo_path=repo, dry_run=True)
+    monkeypatch.setattr(generator, "_collect_file_diffs", lambda files: {})
+
+    generator.run()
+
+    assert generator.failed_groups == ["a"]
+    assert not fake_provider.prompts
+
+
+def _nested_repo(repo, commit):
+    nested = repo / "c"
+    nested.mkdir()
+    git(nested, "init", "-q")
+    if commit:
+        write(nested / "z.py", "z = 1\n")
+        git(nested, "add", "z.py")
+        git(
+            nested,
+            "-c",
+            "user.name=t",
+            "-c",
+            "user.email=t@example.com",
+            "commit",
+            "-q",
+            "-m",
+            "z",
+        )
+
+
+def test_nested_repository_is_committed_as_a_gitlink(repo, fake_provider):
+    _nested_repo(repo, commit=True)
+
+    generator = CommitGenerator(provider=FAKE_PROVIDER, repo_path=repo)
+    generator.run()
+
+    assert not generator.failed_groups
+    assert "+Subproject commit" in fake_provider.prompts[0]
+    assert git(repo, "ls-files", "-s", "c").startswith("160000 ")
+
+
+def test_nested_repository_without_a_commit_is_skipped(repo, fake_provider):
+    _nested_repo(repo, commit=False)
+    write(repo / "a" / "x.py", "x = 2\n")
+
+    generator = CommitGenerator(provider=FAKE_PROVIDER, repo_path=repo, dry_run=True)
+    generator.run()
+
+    assert generator.successful_groups == ["a"]
+    assert not generator.failed_groups
+
+
+def test_lockfile_changes_with_equal_line_counts_get_different_keys(
+    repo, fake_provider
+):
+    write(repo / "poetry.lock", "a = 1\n")
+    git(repo, "add", "poetry.lock")
+    git(repo, "commit", "-q", "-m", "lock")
+
+    keys = []
+    for content in ("a = 2\n", "a = 3\n"):
+        write(repo / "poetry.lock", content)
+        generator = CommitGenerator(
+            provider=FAKE_PROVIDER, repo_path=repo, dry_run=True
+        )
+        file_diffs = generator._collect_file_diffs(["poetry.lock"])
+        assert "diff omitted" in file_diffs["poetry.lock"]
+        keys.append(generator._cache_key(file_diffs["poetry.lock"]))
+
+    assert keys[0] != keys[1]
+
+
+def test_unchanged_groups_reuse_cached_messages(repo, fake_provider):
+    contents = ["x = 2\n", "x = 2\n", "x = 3\n"]
+    for content in contents:
+        write(repo / "a" / "x.py", content)
+        CommitGenerator(provider=FAKE_PROVIDER, repo_path=repo, dry_run=True).run()
+
+    assert len(fake_provider.prompts) == len(set(contents))
+
+
+def _touch_without_change(path):
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 5_000_000_000))
+
+
+def test_dry_run_does_not_write_the_index(repo, fake_provider):
+    _touch_without_change(repo / "b" / "y.py")
+    write(repo / "a" / "x.py", "x = 2\n")
+    index = repo / ".git" / "index"
+    before = index.read_bytes()
+
+    CommitGenerator(provider=FAKE_PROVIDER, repo_path=repo, dry_run=True).run()
+
+    assert index.read_bytes() == before
+
+
+def test_watch_prefetch_does_not_write_the_index(repo, fake_provider, monkeypatch):
+    monkeypatch.chdir(repo)
+    _touch_without_change(repo / "b" / "y.py")
+    write(repo / "a" / "x.py", "x = 2\n")
+    index = repo / ".git" / "index"
+    before = index.read_bytes()
+
+    CommitWatcher(provider=FAKE_PROVIDER, repo_path=repo).refresh()
+
+    assert len(fake_provider.prompts) == 1
+    assert index.read_bytes() == before
+
+
+def test_split_groups_keep_the_directory_as_prompt_scope(repo, fake_provider):
+    write(repo / "a" / "x.py", "".join(f"x{i} = {i}\n" for i in range(30)))
+    write(repo / "a" / "z.py", "".join(f"z{i} = {i}\n" for i in range(30)))
+
+    generator = CommitGenerator(
+        provider=FAKE_PROVIDER,
+        repo_path=repo,
+        dry_run=True,
+        grouping="balanced",
+        max_group_lines=40,
+    )
+    generator.run()
+
+    parts = ["a (part 1/2)", "a (part 2/2)"]
+    assert generator.successful_groups == parts
+    assert len(fake_provider.prompts) == len(parts)
+    for prompt in fake_provider.prompts:
+        assert "directory `a`" in prompt
+        assert "(part" not in prompt
+
+
+def test_resume_skips_committed_groups_and_reuses_journaled_messages(
+    repo, fake_provider, monkeypatch
+):
+    write(repo / "a" / "x.py", "x = 2\n")
+    write(repo / "b" / "y.py", "y = 2\n")
+    commit_changes = CommitGenerator._commit_changes
+
+    def interrupt_second_commit(generator, message):
+        if message.startswith("feat(b)"):
+            raise KeyboardInterrupt
+        commit_changes(generator, message)
+
+    monkeypatch.setattr(CommitGenerator, "_commit_changes", interrupt_second_commit)
+    with pytest.raises(KeyboardInterrupt):
+        CommitGenerator(provider=FAKE_PROVIDER, repo_path=repo).run()
+    monkeypatch.setattr(CommitGenerator, "_commit_changes", commit_changes)
+    assert _log(repo) == ["feat(a): update a", "init"]
+    prompts = len(fake_provider.prompts)
+
+    CommitGenerator(
+        provider=FAKE_PROVIDER, repo_path=repo, resume=True, force_rebuild=True
+    ).run()
+
+    assert _log(repo) == ["feat(b): update b", "feat(a): update a", "init"]
+    assert len(fake_provider.prompts) == prompts
+    assert not git(repo, "status", "--porcelain")
+
+
+def test_private_index_commit_leaves_the_user_index_in_sync(repo, fake_provider):
+    write(repo / "a" / "x.py", "x = 2\n")
+    write(repo / "b" / "new.py", "n = 1\n")
+
+    CommitGenerator(provider=FAKE_PROVIDER, repo_path=repo, private_index=True).run()
+
+    assert _log(repo) == ["feat(b): update b", "feat(a): update a", "init"]
+    assert not git(repo, "status", "--porcelain")
+    assert not list((repo / ".git").glob("avcmt-*"))
+
+
+@pytest.mark.parametrize("private_index", [False, True])
+def test_run_from_a_subdirectory_commits_the_whole_tree(
+    repo, fake_provider, monkeypatch, private_index
+):
+    write(repo / "a" / "x.py", "x = 2\n")
+    write(repo / "b" / "new.py", "n = 1\n")
+    monkeypatch.chdir(repo / "a")
+
+    CommitGenerator(provider=FAKE_PROVIDER, private_index=private_index).run()
+
+    assert _log(repo) == ["feat(b): update b", "feat(a): update a", "init"]
+    assert not git(repo, "status", "--porcelain")
+
+
+def test_pathspecs_are_relative_to_the_subdirectory(repo, fake_provider):
+    write(repo / "a" / "x.py", "x = 2\n")
+    write(repo / "a" / "new.py", "n = 1\n")
+    write(repo / "b" / "y.py", "y = 2\n")
+
+    CommitGenerator(provider=FAKE_PROVIDER, repo_path=repo / "a", pathspecs=["."]).run()
+
+    assert _log(repo) == ["feat(a): update a", "init"]
+    assert git(repo, "status", "--porcelain") == " M b/y.py\n"
+
+
+def test_file_cut_by_the_read_budget_is_counted_as_summarized(
+    repo, fake_provider, caplog
+):
+    write(repo / "a" / "x.py", "".join(f"x{i} = {i}\n" for i in range(200)))
+    generator = CommitGenerator(
+        provider=FAKE_PROVIDER, repo_path=repo, dry_run=True, max_diff_bytes=500
+    )
+
+    file_diffs = generator._collect_file_diffs(generator._get_changed_files())
+
+    assert "diff read budget exceeded" in file_diffs["a/x.py"]
+    assert "summarized 1 file(s)" in caplog.text
+
+
+def test_unusual_file_names_are_staged_literally(repo, fake_provider):
+    names = ["*", "a/with space.py", "a/new\nline.py", "a/[x].py"]
+    for name in names:
+        write(repo / name, "n = 1\n")
+    write(repo / "b" / "y.py", "y = 2\n")
+
+    CommitGenerator(provider=FAKE_PROVIDER, repo_path=repo).run()
+
+    committed = {}
+    for rev in ("HEAD~2", "HEAD~1", "HEAD"):
+        subject, files = git(
+            repo, "show", "-z", "--name-only", "--format=%s", rev
+        ).split("\0", 1)
+        committed[subject] = sorted(filter(None, files.strip("\n").split("\0")))
+    assert committed == {
+        "feat(root): update root": ["*"],
+        "feat(a): update a": sorted(names[1:]),
+        "feat(b): update b": ["b/y.py"],
+    }
+    assert not git(repo, "status", "--porcelain")
+
+
+def test_prompts_summarize_binary_and_generated_files(repo, fake_provider):
+    write(repo / ".gitattributes", "gen/api.py linguist-generated\n")
+    write(repo / "gen" / "api.py", "".join(f"api{i} = {i}\n" for i in range(50)))
+    (repo / "gen" / "logo.png").write_bytes(b"\x89PNG\0\1\2")
+    write(repo / "gen" / "notes.py", "x = 2\n")
+    git(repo, "add", ".gitattributes")
+    git(repo, "commit", "-q", "-m", "attributes")
+
+    CommitGenerator(provider=FAKE_PROVIDER, repo_path=repo, dry_run=True).run()
+
+    [prompt] = fake_provider.prompts
+    assert "[gen/api.py: generated, +50 -0 lines, diff omitted]" in prompt
+    assert "[gen/logo.png: binary, content changed, diff omitted]" in prompt
+    assert "api1 = 1" not in prompt
+    assert "+x = 2" in prompt
+
+
+def test_oversized_groups_are_summarized_in_parts_and_merged(repo, fake_provider):
+    for name in ("x", "y", "z"):
+        write(
+            repo / "a" / f"{name}.py", "".join(f"{name}{i} = {i}\n" for i in range(100))
+        )
+    max_prompt_bytes = 4000
+
+    CommitGenerator(
+        provider=FAKE_PROVIDER, repo_path=repo, max_prompt_bytes=max_prompt_bytes
+    ).run()
+
+    *parts, merge = fake_provider.prompts
+    assert len(parts) > 1
+    assert all(len(prompt.encode()) <= max_prompt_bytes for prompt in parts)
+    assert all(f"of {len(parts)} of the git diff" in prompt for prompt in parts)
+    assert f"Notes for part {len(parts)} of {len(parts)}" in merge
+    assert _log(repo) == ["feat(a): update a", "init"]
+
+
+def test_largest_group_is_requested_first_and_committed_in_order(
+    repo, fake_provider, monkeypatch
+):
+    write(repo / "a" / "x.py", "x = 2\n")
+    write(repo / "b" / "y.py", "".join(f"y{i} = {i}\n" for i in range(100)))
+    write(repo / "c" / "z.py", "z = 2\n")
+    generator = CommitGenerator(provider=FAKE_PROVIDER, repo_path=repo, jobs=2)
+    dispatched = []
+    monkeypatch.setattr(
+        generator, "_report_schedule", lambda costs, order, *_: dispatched.extend(order)
+    )
+
+    generator.run()
+
+    assert dispatched[0] == "b"
+    assert _log(repo) == [
+        "feat(c): update c",
+        "feat(b): update b",
+        "feat(a): update a",
+        "init",
+    ]
+
+
+@pytest.mark.parametrize("pathspecs", [["a", "c"], [":!b"], ["*.py", ":(exclude)b"]])
+def test_scoped_run_commits_only_changes_inside_the_pathspec(
+    repo, fake_provider, pathspecs
+):
+    write(repo / "a" / "x.py", "x = 2\n")
+    write(repo / "b" / "y.py", "y = 2\n")
+    write(repo / "c" / "new.py", "n = 1\n")
+
+    CommitGenerator(provider=FAKE_PROVIDER, repo_path=repo, pathspecs=pathspecs).run()
+
+    assert sorted(_log(repo)) == ["feat(a): update a", "feat(c): update c", "init"]
+    assert git(repo, "status", "--porcelain") == " M b/y.py\n"
+
+
+def test_scoped_run_refuses_changes_staged_outside_the_pathspec(repo, fake_provider):
+    write(repo / "a" / "x.py", "x = 2\n")
+    write(repo / "b" / "y.py", "y = 2\n")
+    git(repo, "add", "b")
+
+    with pytest.raises(CommitError, match="outside the pathspec"):
+        CommitGenerator(provider=FAKE_PROVIDER, repo_path=repo, pathspecs=["a"]).run()
+
+    assert _log(repo) == ["init"]
@@ -0,0 +1,71 @@
+import os
+import subprocess
+from pathlib import Path
+
+import avcmt
+from avcmt.modules.commit_generator import CommitGenerator
+from avcmt.modules.commit_hook import PrepareCommitMessage, install_hook
+
+from .conftest import FAKE_PROVIDER, git, write
+
+
+def _dry_run(repo):
+    CommitGenerator(provider=FAKE_PROVIDER, repo_path=repo, dry_run=True).run()
+
+
+def test_hook_reuses_message_of_dry_run_for_modified_file(repo, fake_provider):
+    write(repo / "a" / "x.py", "x = 2\n")
+    _dry_run(repo)
+    git(repo, "add", "a")
+
+    message = PrepareCommitMessage(provider=FAKE_PROVIDER, repo_path=repo).generate()
+
+    assert message.startswith("feat(a):")
+    assert len(fake_provider.prompts) == 1
+
+
+def test_hook_reuses_message_of_dry_run_for_modified_and_added_files(
+    repo, fake_provider
+):
+    write(repo / "a" / "x.py", "x = 2\n")
+    write(repo / "a" / "new.py", "n = 1\n")
+    _dry_run(repo)
+    git(repo, "add", "a")
+
+    message = PrepareCommitMessage(provider=FAKE_PROVIDER, repo_path=repo).generate()
+
+    assert message.startswith("feat(a):")
+    assert len(fake_provider.prompts) == 1
+
+
+def test_hook_returns_empty_message_on_cache_miss(repo, fake_provider):
+    write(repo / "a" / "x.py", "x = 2\n")
+    git(repo, "add", "a")
+
+    message = PrepareCommitMessage(provider=FAKE_PROVIDER, repo_path=repo).generate()
+
+    assert not message
+    assert fake_provider.prompts == []
+
+
+def test_installed_hook_uses_the_options_of_the_run(repo, fake_provider, monkeypatch):
+    # Larger than the default per-file budget, so only an unlimited budget matches the run's key.
+    options = {"provider": FAKE_PROVIDER, "model": "m1", "max_file_diff_bytes": 0}
+    write(repo / "a" / "x.py", "".join(f"x{i} = {i}\n" for i in range(1000)))
+    CommitGenerator(repo_path=repo, dry_run=True, **options).run()
+    git(repo, "add", "a")
+    monkeypatch.chdir(repo)
+    install_hook(**options)
+
+    subprocess.run(
+        ["git", "commit", "-q"],
+        cwd=repo,
+        check=True,
+        env={
+            **os.environ,
+            "GIT_EDITOR": "true",
+            "PYTHONPATH": str(Path(avcmt.__file__).parent.parent),
+        },
+    )
+
+    assert git(repo, "log", "-1", "--format=%s") == "feat(a): update a\n"
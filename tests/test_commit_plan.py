@@ -0,0 +1,30 @@
+from avcmt.modules.commit_plan import plan_commit_run
+
+from .conftest import FAKE_PROVIDER, write
+
+
+def test_trivial_groups_need_no_ai_call_with_heuristic(repo, fake_provider):
+    write(repo / "a" / "x.py", "x  =  1\n")
+    write(repo / "b" / "y.py", "y = 2\n")
+
+    plan = plan_commit_run(
+        provider=FAKE_PROVIDER, repo_path=repo, heuristic_for_trivial=True
+    )
+
+    groups = {group.name: group for group in plan.groups}
+    assert groups["a"].heuristic
+    assert (groups["a"].ai_calls, groups["a"].seconds) == (0, 0.0)
+    assert not groups["b"].heuristic
+    assert groups["b"].ai_calls == 1
+    assert plan.ai_calls == 1
+    assert plan.tokens == groups["b"].tokens
+    assert not fake_provider.prompts
+
+
+def test_trivial_groups_are_sent_to_the_ai_without_heuristic(repo, fake_provider):
+    write(repo / "a" / "x.py", "x  =  1\n")
+
+    plan = plan_commit_run(provider=FAKE_PROVIDER, repo_path=repo)
+
+    assert not plan.groups[0].heuristic
+    assert plan.ai_calls == 1
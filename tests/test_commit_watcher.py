@@ -0,0 +1,52 @@
+from typer.testing import CliRunner
+
+from avcmt.cli import commit as commit_cli
+from avcmt.modules import commit_watcher
+from avcmt.modules.commit_generator import CommitGenerator
+from avcmt.modules.commit_watcher import CommitWatcher
+
+from .conftest import FAKE_PROVIDER, write
+
+
+def test_watch_passes_scope_and_read_budget_to_the_prefetch(monkeypatch):
+    received = {}
+    monkeypatch.setattr(commit_cli, "run_commit_watch", received.update)
+
+    result = CliRunner().invoke(
+        commit_cli.app, ["watch", "a", "--max-diff-bytes", "1000"]
+    )
+
+    assert result.exit_code == 0, result.output
+    assert received["pathspecs"] == ["a"]
+    assert received["max_diff_bytes"] == 1000  # noqa: PLR2004
+
+
+def test_prefetched_messages_are_found_by_a_run_with_the_same_options(
+    repo, fake_provider
+):
+    options = {"provider": FAKE_PROVIDER, "pathspecs": ["a"], "max_diff_bytes": 1000}
+    write(repo / "a" / "x.py", "".join(f"x{i} = {i}\n" for i in range(200)))
+    write(repo / "b" / "y.py", "y = 2\n")
+
+    CommitWatcher(repo_path=repo, **options).refresh()
+    prompts = len(fake_provider.prompts)
+    CommitGenerator(repo_path=repo, dry_run=True, **options).run()
+
+    assert prompts == 1
+    assert len(fake_provider.prompts) == prompts
+
+
+def test_changes_are_prefetched_once_they_have_settled(repo, monkeypatch):
+    clock = [0.0]
+    monkeypatch.setattr(commit_watcher.time, "monotonic", lambda: clock[0])
+    watcher = CommitWatcher(repo_path=repo, debounce=5)
+    refreshes = []
+    monkeypatch.setattr(watcher, "refresh", lambda: refreshes.append(clock[0]))
+    state = {"seen": watcher.fingerprint(), "changed_at": None}
+
+    write(repo / "a" / "new.py", "n = 1\n")
+    for elapsed in (0, 1, 3, 1, 1):
+        clock[0] += elapsed
+        watcher._poll(state)
+
+    assert refreshes == [5.0]
@@ -0,0 +1,37 @@
+import pytest
+
+from avcmt.modules.diff_shaper import classify_file, shape_file_diff
+
+SECTION = (
+    "diff --git a/poetry.lock b/poetry.lock\n"
+    "--- a/poetry.lock\n"
+    "+++ b/poetry.lock\n"
+    "@@ -1 +1 @@\n"
+    "-a = 1\n"
+    "+a = 2\n"
+)
+
+
+@pytest.mark.parametrize(
+    ("path", "stats", "attributes", "reason"),
+    [
+        ("src/app.py", (1, 1), {}, None),
+        ("poetry.lock", (1, 1), {}, "lockfile"),
+        ("web/package-lock.json", (1, 1), {}, "lockfile"),
+        ("logo.png", (None, None), {}, "binary"),
+        ("data.bin", (1, 1), {"diff": "unset"}, "binary"),
+        ("static/app.min.js", (1, 1), {}, "generated"),
+        ("api/client_pb2.py", (1, 1), {"linguist-generated": "set"}, "generated"),
+    ],
+)
+def test_noise_files_are_classified(path, stats, attributes, reason):
+    assert classify_file(path, stats, attributes) == reason
+
+
+def test_noise_diffs_are_replaced_by_a_summary_under_their_header():
+    shaped = shape_file_diff("poetry.lock", SECTION, stats=(1, 1))
+
+    assert shaped == (
+        "diff --git a/poetry.lock b/poetry.lock\n"
+        "[poetry.lock: lockfile, +1 -1 lines, diff omitted]\n"
+    )
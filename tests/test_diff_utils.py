@@ -0,0 +1,38 @@
+from avcmt.modules.diff_utils import chunk_diff
+
+
+def _section(path, hunks, lines_per_hunk=5):
+    header = f"diff --git a/{path} b/{path}\n--- a/{path}\n+++ b/{path}\n"
+    body = "".join(
+        f"@@ -{h * 10 + 1} +{h * 10 + 1},{lines_per_hunk} @@\n"
+        + "".join(f"+{path} {h} {i}\n" for i in range(lines_per_hunk))
+        for h in range(hunks)
+    )
+    return header + body
+
+
+def test_small_files_are_packed_whole_into_chunks():
+    sections = [_section(f"f{i}.py", hunks=1) for i in range(6)]
+    size = len(sections[0].encode())
+
+    chunks = chunk_diff("".join(sections), max_bytes=2 * size)
+
+    assert chunks == [
+        sections[0] + sections[1],
+        sections[2] + sections[3],
+        sections[4] + sections[5],
+    ]
+
+
+def test_large_files_are_split_at_hunks_under_their_header():
+    section = _section("big.py", hunks=8)
+    max_bytes = len(section.encode()) // 3
+
+    chunks = chunk_diff(section, max_bytes)
+
+    assert len(chunks) > 1
+    assert all(len(chunk.encode()) <= max_bytes for chunk in chunks)
+    header = "diff --git a/big.py b/big.py\n--- a/big.py\n+++ b/big.py\n"
+    assert all(chunk.startswith(header + "@@") for chunk in chunks)
+    bodies = "".join(chunk.removeprefix(header) for chunk in chunks)
+    assert bodies == section.removeprefix(header)
@@ -0,0 +1,133 @@
+import io
+import threading
+import time
+
+import pytest
+
+from avcmt.modules import doc_generator
+from avcmt.modules.doc_generator import DocGenerator
+from avcmt.modules.docstring_cache import DocstringCache
+from avcmt.modules.edit_plan import EditPlanError
+
+from .conftest import write
+
+SOURCE = "def add(a, b):\n    return a + b\n"
+
+
+def _generator(tmp_path, **options):
+    return DocGenerator(
+        docstring_cache=DocstringCache(tmp_path / "docstring_cache.jsonl"), **options
+    )
+
+
+def test_identical_nodes_in_flight_share_one_request(tmp_path, monkeypatch):
+    generator = _generator(tmp_path, jobs=4)
+    files = [tmp_path / "one.py", tmp_path / "two.py", tmp_path / "three.py"]
+    for file in files:
+        write(file, SOURCE)
+    requests = []
+    lock = threading.Lock()
+
+    def slow_request(identifier, node_source):
+        with lock:
+            requests.append(identifier)
+        time.sleep(0.2)
+        return "Adds two numbers."
+
+    monkeypatch.setattr(generator, "_generate_docstring_via_ai", slow_request)
+    writer = io.StringIO()
+
+    generator._process_files(files, writer, None, False, {}, lambda path: None)
+
+    assert len(requests) == 1
+    assert writer.getvalue().count("Adds two numbers.") == len(files)
+
+
+@pytest.mark.parametrize(
+    ("response", "expected"),
+    [
+        ('{"f": "Doc."}', {"f": "Doc."}),
+        ('Here you go:\n```json\n{"f": "Doc."}\n```', {"f": "Doc."}),
+        ('{"f": "Doc.",}', {}),
+        ('["Doc."]', {}),
+        ("No JSON at all.", {}),
+    ],
+)
+def test_batch_response_parsing(response, expected):
+    assert DocGenerator._parse_batch_response(response) == expected
+
+
+def _batch_tasks(generator, tmp_path):
+    file = tmp_path / "module.py"
+    write(file, SOURCE + "\n\ndef sub(a, b):\n    return a - b\n")
+    return generator._plan_file(file, True, False, {}).tasks
+
+
+def test_invalid_batch_items_are_retried_alone(tmp_path, monkeypatch):
+    generator = _generator(tmp_path, batch_size=2)
+    tasks = _batch_tasks(generator, tmp_path)
+    identifiers = [task.identifier for task in tasks]
+
+    def answer(prompt, **kwargs):
+        return f'{{"{identifiers[0]}": "Batched.", "{identifiers[1]}": 42}}'
+
+    monkeypatch.setattr(doc_generator, "generate_with_ai", answer)
+    retried = []
+    monkeypatch.setattr(
+        generator,
+        "_generate_docstring_via_ai",
+        lambda identifier, source: retried.append(identifier) or "Alone.",
+    )
+
+    generator._generate_batch(tasks)
+
+    assert [task.docstring for task in tasks] == ["Batched.", "Alone."]
+    assert retried == [identifiers[1]]
+
+
+def test_failed_batch_request_retries_every_item(tmp_path, monkeypatch):
+    generator = _generator(tmp_path, batch_size=2)
+    tasks = _batch_tasks(generator, tmp_path)
+
+    def fail(prompt, **kwargs):
+        raise RuntimeError("provider down")
+
+    monkeypatch.setattr(doc_generator, "generate_with_ai", fail)
+    monkeypatch.setattr(
+        generator, "_generate_docstring_via_ai", lambda identifier, source: "Alone."
+    )
+
+    generator._generate_batch(tasks)
+
+    assert [task.docstring for task in tasks] == ["Alone.", "Alone."]
+
+
+def test_edits_that_break_the_file_leave_it_untouched(tmp_path):
+    generator = _generator(tmp_path)
+    file = tmp_path / "module.py"
+    write(file, SOURCE)
+    plan = generator._plan_file(file, False, False, {})
+    plan.tasks[0].docstring = 'Broken """ docstring.'
+
+    with pytest.raises(EditPlanError):
+        generator._finish_file(plan, None, tmp_path / "backup")
+
+    assert file.read_text(encoding="utf-8") == SOURCE
+
+
+def test_only_changed_functions_are_documented_again(tmp_path, monkeypatch):
+    file = tmp_path / "calc.py"
+    write(file, SOURCE + "\n\ndef sub(a, b):\n    return a - b\n")
+    requests = []
+
+    def answer(identifier, node_source):
+        requests.append(identifier)
+        return "Computes a result."
+
+    generator = _generator(tmp_path)
+    monkeypatch.setattr(generator, "_generate_docstring_via_ai", answer)
+    generator._process_files([file], io.StringIO(), None, False, {}, lambda path: None)
+    write(file, SOURCE + "\n\n# Subtracts.\ndef sub(a, b):\n    return b - a\n")
+    generator._process_files([file], io.StringIO(), None, False, {}, lambda path: None)
+
+    assert sorted(requests) == ["calc.add", "calc.sub", "calc.sub"]
@@ -0,0 +1,30 @@
+import json
+
+from avcmt.modules.docs_state import DocsStateIndex
+
+from .conftest import write
+
+
+def test_legacy_state_is_imported_once_and_deleted(tmp_path):
+    documented, edited = tmp_path / "a.py", tmp_path / "b.py"
+    write(documented, "a = 1\n")
+    write(edited, "b = 1\n")
+    legacy = tmp_path / "docs_state.json"
+    legacy.write_text(
+        json.dumps(
+            {
+                str(documented.resolve()): documented.stat().st_mtime,
+                str(edited.resolve()): edited.stat().st_mtime - 10,
+            }
+        )
+    )
+    store = tmp_path / "docs_state.jsonl"
+
+    imported = DocsStateIndex(store, root=tmp_path).migrate_legacy(legacy)
+
+    assert imported == 1
+    assert not legacy.exists()
+    reloaded = DocsStateIndex(store, root=tmp_path)
+    assert not reloaded.is_changed(documented)
+    assert reloaded.is_changed(edited)
+    assert reloaded.migrate_legacy(legacy) == 0
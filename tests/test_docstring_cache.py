@@ -0,0 +1,43 @@
+import ast
+
+import pytest
+
+from avcmt.modules.docstring_cache import DocstringCache
+
+SOURCE = """
+class Calculator:
+    def add(self, a, b):
+        return a + b
+"""
+
+
+def _key(source, template="template", model="model"):
+    node = ast.parse(source).body[0]
+    return DocstringCache.make_node_key(node, template, model)
+
+
+@pytest.mark.parametrize(
+    "source",
+    [
+        # Formatting and comments.
+        "class Calculator:\n\n    def add(self, a, b):  # sum\n        return (a + b)\n",
+        # A docstring on the node and on a nested definition.
+        'class Calculator:\n    """Calc."""\n\n'
+        '    def add(self, a, b):\n        """Adds."""\n        return a + b\n',
+    ],
+)
+def test_key_ignores_formatting_comments_and_docstrings(source):
+    assert _key(source) == _key(SOURCE)
+
+
+@pytest.mark.parametrize(
+    ("source", "options"),
+    [
+        (SOURCE.replace("a + b", "b + a"), {}),
+        (SOURCE.replace("add", "plus"), {}),
+        (SOURCE, {"template": "other template"}),
+        (SOURCE, {"model": "other model"}),
+    ],
+)
+def test_key_changes_with_code_template_or_model(source, options):
+    assert _key(source, **options) != _key(SOURCE)
@@ -0,0 +1,35 @@
+import pytest
+
+from avcmt.modules.edit_plan import (
+    EditPlanError,
+    LineEdit,
+    apply_line_edits,
+    apply_python_edits,
+)
+
+LINES = ["a = 1\n", "b = 2\n", "c = 3\n"]
+
+
+def test_edits_apply_in_one_pass_regardless_of_order():
+    edits = [LineEdit(2, 3, "c = 30\n"), LineEdit(0, 0, "# header\n")]
+
+    assert apply_line_edits(LINES, edits) == "# header\na = 1\nb = 2\nc = 30\n"
+
+
+@pytest.mark.parametrize(
+    "edits",
+    [
+        [LineEdit(0, 2, "x = 0\n"), LineEdit(1, 2, "y = 0\n")],
+        [LineEdit(1, 1, "x = 0\n"), LineEdit(1, 1, "y = 0\n")],
+        [LineEdit(2, 4, "x = 0\n")],
+    ],
+)
+def test_overlapping_or_outside_edits_are_rejected(edits):
+    with pytest.raises(EditPlanError):
+        apply_line_edits(LINES, edits)
+
+
+def test_python_edits_are_verified_by_parsing():
+    assert apply_python_edits(LINES, [LineEdit(1, 2, "b = 20\n")]).count("b = 20") == 1
+    with pytest.raises(EditPlanError, match="does not parse"):
+        apply_python_edits(LINES, [LineEdit(1, 2, "b = (\n")])
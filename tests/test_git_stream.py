@@ -0,0 +1,39 @@
+import sys
+
+import pytest
+
+from avcmt.modules import git_stream
+from avcmt.modules.diff_shaper import sample_section
+from avcmt.modules.git_stream import GitOutputStream, iter_file_sections
+
+SECTION = (
+    "diff --git a/a/x.py b/a/x.py\n"
+    f"index {'1' * 40}..{'2' * 40} 100644\n"
+    "--- a/a/x.py\n"
+    "+++ b/a/x.py\n"
+    "@@ -1 +1,30 @@\n"
+    "-x = 1\n"
+    + "".join(f"+x{i} = {i}\n" for i in range(30))
+    + "@@ -40,2 +69,2 @@\n-y = 1\n+y = 2\n"
+)
+
+
+def test_characters_split_between_reads_are_decoded_whole(monkeypatch):
+    monkeypatch.setattr(git_stream, "READ_CHUNK_BYTES", 5)
+    text = "ab" + "é" * 10 + "\nnäive\n"
+    script = f"import sys; sys.stdout.buffer.write({text.encode()!r})"
+
+    lines = list(GitOutputStream([sys.executable, "-c", script]))
+
+    assert "".join(lines) == text
+
+
+@pytest.mark.parametrize("max_bytes", [64, 100, 200, 400, 10000])
+def test_streamed_sampling_matches_sampling_the_whole_section(max_bytes):
+    lines = SECTION.splitlines(keepends=True)
+
+    [(path, section, sampled)] = iter_file_sections(lines, max_bytes)
+
+    assert path == "a/x.py"
+    assert section == sample_section(SECTION, max_bytes)
+    assert sampled == (section != SECTION)
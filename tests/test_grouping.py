@@ -0,0 +1,50 @@
+import pytest
+
+from avcmt.modules.grouping import (
+    get_grouping_strategy,
+    group_by_size,
+    group_directory,
+)
+
+
+def _group(lines: dict[str, int], **options):
+    stats = {path: (added, 0) for path, added in lines.items()}
+    return group_by_size(list(lines), file_stats=stats, **options)
+
+
+def test_small_sibling_directories_are_folded_into_their_parent():
+    groups = _group({"src/a/x.py": 5, "src/b/y.py": 5, "docs/z.md": 50})
+
+    assert groups == {"src": ["src/a/x.py", "src/b/y.py"], "docs": ["docs/z.md"]}
+
+
+@pytest.mark.parametrize(
+    "lines",
+    [
+        # A lone small directory keeps its scope when the parent has no changes.
+        {"src/a/x.py": 5},
+        # Top-level directories are never folded into the root group.
+        {"a/x.py": 1, "b/y.py": 1, "setup.py": 1},
+        # Folding never produces a group above the maximum.
+        {"src/a/x.py": 15, "src/b/y.py": 15, "src/c.py": 30},
+    ],
+)
+def test_groups_keep_their_directory_when_folding_does_not_apply(lines):
+    groups = _group(lines, max_weight=40)
+
+    assert groups == {p.rpartition("/")[0] or "root": [p] for p in lines}
+
+
+def test_heavy_groups_are_split_into_numbered_parts():
+    groups = _group({"a/x.py": 10, "a/y.py": 10, "a/z.py": 10}, max_weight=20)
+
+    assert groups == {
+        "a (part 1/2)": ["a/x.py", "a/y.py"],
+        "a (part 2/2)": ["a/z.py"],
+    }
+    assert {group_directory(name) for name in groups} == {"a"}
+
+
+def test_unknown_grouping_strategy_is_rejected():
+    with pytest.raises(ValueError, match="Available: balanced, directory"):
+        get_grouping_strategy("random")
@@ -0,0 +1,40 @@
+from avcmt.modules.heuristic_message import HeuristicMessageGenerator
+
+HEADER = "diff --git a/pkg/setup.cfg b/pkg/setup.cfg\n--- a/pkg/setup.cfg\n+++ b/pkg/setup.cfg\n"
+VERSION_BUMP = "@@ -1,1 +1,1 @@\n-version = 1.2.3\n+version = 1.2.4\n"
+WHITESPACE = "@@ -5,1 +5,1 @@\n-x  = 1\n+x = 1\n"
+SAMPLED = "... [40 diff lines omitted] ...\n"
+PY_HEADER = "diff --git a/pkg/app.py b/pkg/app.py\n--- a/pkg/app.py\n+++ b/pkg/app.py\n"
+JS_HEADER = "diff --git a/pkg/app.js b/pkg/app.js\n--- a/pkg/app.js\n+++ b/pkg/app.js\n"
+TRAILING = "@@ -2,1 +2,1 @@\n-    start()  \n+    start( )\n"
+
+
+def test_complete_trivial_sections_get_a_heuristic_message(tmp_path):
+    heuristic = HeuristicMessageGenerator(tmp_path)
+
+    assert heuristic.trivial_message("pkg", HEADER + VERSION_BUMP).startswith(
+        "chore(pkg): bump version to 1.2.4"
+    )
+    assert heuristic.trivial_message("pkg", HEADER + WHITESPACE).startswith(
+        "style(pkg):"
+    )
+
+
+def test_sampled_sections_are_never_trivial(tmp_path):
+    heuristic = HeuristicMessageGenerator(tmp_path)
+
+    assert heuristic.trivial_message("pkg", HEADER + VERSION_BUMP + SAMPLED) is None
+    assert heuristic.trivial_message("pkg", HEADER + WHITESPACE + SAMPLED) is None
+
+
+def test_reindented_python_blocks_are_not_trivial(tmp_path):
+    heuristic = HeuristicMessageGenerator(tmp_path)
+    reindented = "@@ -1,3 +1,3 @@\n if ready:\n-    start()\n-    wait()\n+    start()\n+wait()\n"
+
+    assert heuristic.trivial_message("pkg", PY_HEADER + reindented) is None
+    assert heuristic.trivial_message("pkg", JS_HEADER + reindented).startswith(
+        "style(pkg):"
+    )
+    assert heuristic.trivial_message("pkg", PY_HEADER + TRAILING).startswith(
+        "style(pkg):"
+    )
@@ -0,0 +1,17 @@
+from avcmt.modules import jsonl_store, latency_history
+from avcmt.modules.latency_history import LatencyHistory
+
+
+def test_store_keeps_only_the_samples_used_for_estimates(tmp_path, monkeypatch):
+    monkeypatch.setattr(jsonl_store, "COMPACT_MIN_LINES", 4)
+    monkeypatch.setattr(latency_history, "MAX_SAMPLES", 3)
+    history = LatencyHistory(tmp_path / "latency.jsonl")
+    for i in range(20):
+        history.record("fake/model", 100, float(i))
+
+    lines = history.path.read_text(encoding="utf-8").splitlines()
+    assert len(lines) <= jsonl_store.COMPACT_FACTOR * 3
+    reloaded = LatencyHistory(history.path)
+    assert reloaded.sample_count("fake/model") == latency_history.MAX_SAMPLES
+    assert reloaded.estimate("fake/model", 100) == history.estimate("fake/model", 100)
+    assert history.estimate("fake/model", 100) == sum((17.0, 18.0, 19.0)) / 3
@@ -0,0 +1,24 @@
+from avcmt.modules import jsonl_store
+from avcmt.modules.run_journal import RunJournal
+
+
+def test_long_run_is_compacted_without_losing_resume_state(tmp_path, monkeypatch):
+    monkeypatch.setattr(jsonl_store, "COMPACT_MIN_LINES", 4)
+    journal = RunJournal(tmp_path / "journal.jsonl")
+    groups = {f"g{i}": [f"g{i}/f.py"] for i in range(10)}
+    journal.start(groups, {name: f"hash-{name}" for name in groups}, head="abc")
+    for name, files in groups.items():
+        journal.record_message(name, f"hash-{name}", f"feat({name}): change")
+        journal.record_staged(name, files)
+        if name != "g9":
+            journal.record_committed(name, f"commit-{name}")
+
+    lines = journal.path.read_text(encoding="utf-8").splitlines()
+    state = journal.load()
+    assert len(lines) < 1 + 3 * len(groups)
+    assert list(state["groups"]) == list(groups)
+    assert state["head"] == "abc"
+    assert state["committed"] == {f"g{i}": f"commit-g{i}" for i in range(9)}
+    assert list(state["staged"]) == ["g9"]
+    assert state["messages"]["g9"] == ("hash-g9", "feat(g9): change")
+    assert not state["finished"]
@@ -0,0 +1,29 @@
+from avcmt.modules.scheduling import (
+    estimate_group_cost,
+    longest_first,
+    predict_makespan,
+)
+
+
+def test_groups_are_dispatched_by_decreasing_cost_keeping_ties_in_order():
+    costs = {"a": 1, "b": 4, "c": 1, "d": 4}
+
+    assert longest_first(costs) == ["b", "d", "a", "c"]
+
+
+def test_longest_first_shortens_the_predicted_makespan():
+    costs = {"small": 1, "medium": 1, "large": 4}
+
+    in_order = predict_makespan(costs.values(), workers=2)
+    largest_first = predict_makespan([costs[g] for g in longest_first(costs)], 2)
+
+    assert (in_order, largest_first) == (5, 4)
+
+
+def test_cost_grows_with_changed_lines_and_prompt_size():
+    stats = {"a.py": (10, 5), "b.png": (None, None)}
+
+    base = estimate_group_cost(["b.png"], stats, prompt_bytes=100)
+
+    assert estimate_group_cost(["a.py"], stats, prompt_bytes=100) > base
+    assert estimate_group_cost(["b.png"], stats, prompt_bytes=200) > base